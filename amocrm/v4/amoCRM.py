@@ -1,27 +1,44 @@
 from __future__ import annotations
 
-from typing import Any, Tuple, Union, Optional, Final
+from typing import TYPE_CHECKING, Any, Iterator, Tuple, Union, Optional, Final
 
+from pydantic import BaseModel
 from pydantic.error_wrappers import ValidationError
-from pydantic.typing import NoneType
 
 from amocrm.v4.models.amoCRM_M import AmoRequestPatchContact, AmoRequestPostContact, AmoResponceGet, AmoResponcePostError, \
-                            Contacts, DataContacts, DataLeads, Embedded, Leads, Links, RequestAuth, ResponceAuthNotValid, \
+                            Contacts, DataContacts, DataLeads, Leads, RequestAuth, ResponceAuthNotValid, \
                             ResponceAuthValid, AmoCRMInit, ModeSaveTokenEnum, AmoResponcePost, AmoCRMFuncResponce, \
-                            AmoRequestPostLeads, AmoRequestPatchLeads, AmoResponcePatch, AmoResponcePatchError, AmoCRMInit
+                            AmoRequestPostLeads, AmoRequestPatchLeads, AmoResponcePatch, AmoResponcePatchError, AmoCRMInit, \
+                            RateLimiterStatistic, AmoResponceBatch, CacheEntry, CacheStatistic, AmoResponceCustomFields, \
+                            CustomFieldSchema, RequestEvent, ResponceEvent, AmoLeadsContacts, AmoResponcePostComplex
 
+from amocrm.v4.models.amoCRM_record_M import RecordFactory
+
+from amocrm.v4.amoCRM_cache import ResponceCache
 from amocrm.v4.amoCRM_filter import FilterAmoCRM
-from amocrm.v4.amoCRM_utils import batch, save_tokens_to_file
+from amocrm.v4.amoCRM_limiter import RateLimiter, get_rate_limiter
+from amocrm.v4.amoCRM_metrics import MetricsCollector, RequestHook, get_body_size, get_url_action
+from amocrm.v4.amoCRM_parse import construct_model, dump_model, dumps, loads
+from amocrm.v4.amoCRM_retry import get_retry_delay, is_retry_allowed
+from amocrm.v4.amoCRM_token import TokenManager
+from amocrm.v4.amoCRM_utils import add_filter_with, batch, get_embedded_items, get_lead_contacts, save_tokens_to_file, set_url_page
 from amocrm.v4.errors.amoCRM_E import AuthError
 
 import os
 import json
+import time
 import loguru
 import requests
+import threading
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from requests import Response, Request
-from pandas import DataFrame, concat
+from requests.adapters import HTTPAdapter
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class AmoCRMConst:
@@ -31,6 +48,7 @@ class AmoCRMConst:
         CONTACTS: Final[str] = 'contacts' # Контакты
         CUSTOM_FIELDS: Final[str] = "custom_fields" # Касомные поля
         LEADS_CUSTOM_FIELDS: Final[str] = "leads/custom_fields" # Кастомные поля сделок
+        CONTACTS_CUSTOM_FIELDS: Final[str] = "contacts/custom_fields" # Кастомные поля контактов
         
     class TYPE_AUTH:
         AUTHORIZATION_CODE: Final[str] = 'authorization_code'
@@ -44,18 +62,21 @@ class AmoCRMConst:
         REFRESH: Final[str] = 'refresh_token'
 
 
-class AmoCRM(AmoCRMConst):
-    """ Class Api connector to servise https://amocrm.com (AmoCRM).
-
-        Usage:
-        >>> from amocr.v4.amoCRM import AmoCRM
-        >>> amocrm = AmoCRM(settings) # settings is AmoCRMInit in pydantic model
-        >>> is_success, responce_msg, get_responce = amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10&")
+class AmoCRMBase(AmoCRMConst):
+    """ Base of AmoCRM connectors: settings, tokens, hooks and parsing of responces. Requests are sent by subclasses:
+    AmoCRM (requests, threads) and AsyncAmoCRM (httpx, asyncio). Subclass creates http session in '_create_session'
+    and checks auth in 'init_cheker'.
     """
     
     def __init__(self, init_settings: AmoCRMInit, logger: loguru.logger = loguru.logger, *args, **kwargs):
+        # Session must exist before tokens are set, bearer header lives on it
+        self._session_lock = threading.Lock()
+        self._session = self._create_session(init_settings)
+        self._token_manager = TokenManager(expires_at=init_settings.token_expires_at, refresh_leeway=init_settings.token_refresh_leeway)
+        
         self.connect_email = init_settings.connect_email
         self.connect_domain = init_settings.connect_domain
+        self._base_url = init_settings.base_url.rstrip('/') if init_settings.base_url else f"https://{self.connect_domain}.amocrm.ru"
         
         self.connect_id = init_settings.connect_id
         self.connect_secret_key = init_settings.connect_secret_key
@@ -77,31 +98,145 @@ class AmoCRM(AmoCRMConst):
         
         self._new_access_token = None
         self._new_refresh_token = None
+        self._new_expires_in = None
+        
+        self._settings = init_settings
+        self._mode_save_token = init_settings.mode_save_token
+        
+        self._func_update_token = kwargs.get("func_update_token")
         
-        self.__settings = init_settings
-        self.__mode_save_token = init_settings.mode_save_token
+        self._retry_policy = init_settings.retry_policy
+        self._validate_responces = init_settings.validate_responces
         
-        self.__func_update_token = kwargs.get("func_update_token")
+        # Limiter is shared by all connectors of one account, if other limiter is not set
+        self._rate_limiter: Optional[RateLimiter] = kwargs.get("rate_limiter")
+        if self._rate_limiter is None and init_settings.rate_limit:
+            self._rate_limiter = get_rate_limiter(self.connect_domain, rate=init_settings.rate_limit, burst=init_settings.rate_burst)
+        
+        # Cache of GET responces, it is not used if it is not set
+        self._cache: Optional[ResponceCache] = kwargs.get("cache")
+        
+        # Schema of custom fields by action: (time of expiry, fields)
+        self._custom_fields_ttl = init_settings.custom_fields_ttl
+        self._custom_fields_schema: dict[str, Tuple[float, list[CustomFieldSchema]]] = {}
+        
+        # Hooks of requests, they are not called if they are not set. Metrics collector is hook too
+        self._metrics: Optional[MetricsCollector] = kwargs.get("metrics")
+        self._hooks: list[RequestHook] = list(kwargs.get("hooks") or [])
+        if self._metrics is not None: self._hooks.append(self._metrics)
         
         self.init_cheker(*args, **kwargs)
+
+    def get_rate_limiter_statistic(self) -> Optional[RateLimiterStatistic]:
+        " Get statistic of waiting on rate limiter. None if limiter is not used. "
+        return self._rate_limiter.get_statistic() if self._rate_limiter else None
+
+    def get_cache_statistic(self) -> Optional[CacheStatistic]:
+        " Get statistic of cache of GET responces. None if cache is not used. "
+        return self._cache.get_statistic() if self._cache else None
+
+    def get_metrics(self) -> Optional[MetricsCollector]:
+        " Get metrics collector of requests. None if collector is not used. "
+        return self._metrics
+
+    def add_hook(self, hook: RequestHook) -> None:
+        " Add hook of requests. See RequestHook. "
+        self._hooks.append(hook)
+
+    @property
+    def base_url(self) -> str:
+        " Url of account. Ex: https://example.amocrm.ru "
+        return self._base_url
+
+    @property
+    def validate_responces(self) -> bool:
+        " Responces are validated, if parameter 'validate' is not set ('validate_responces' of settings). "
+        return self._validate_responces
+
+    def get_url(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4') -> str:
+        " Get url of request to api. Ex: https://example.amocrm.ru/api/v4/leads?limit=250 "
+        return f"{self._base_url}/api/{version_api}/{action}?{filters}"
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self._token_manager.access_token
+
+    @access_token.setter
+    def access_token(self, value: Optional[str]) -> None:
+        " Set access token and update bearer header of shared session. "
+        with self._session_lock:
+            self._token_manager.access_token = value
+            if value: self._session.headers["Authorization"] = f"Bearer {value}"
+            else: self._session.headers.pop("Authorization", None)
+
+    @property
+    def refresh_token(self) -> Optional[str]:
+        return self._token_manager.refresh_token
+
+    @refresh_token.setter
+    def refresh_token(self, value: Optional[str]) -> None:
+        self._token_manager.refresh_token = value
+
+    def _set_tokens(self, answer: ResponceAuthValid) -> None:
+        " Set new tokens with time of expiry and save them. "
+        self._token_manager.set_tokens(answer.access_token, answer.refresh_token, expires_in=answer.expires_in)
+        self.access_token = answer.access_token
+        self._save_tokens(is_update_tokens=True)
+
+    def _call_before_request(self, method: str, url: str, attempt: int, throttle_wait: float, kwargs: dict[str, Any]) -> None:
+        " Call hooks before attempt of request. "
+        event = RequestEvent(method=method, url=url, action=get_url_action(url), attempt=attempt, throttle_wait=throttle_wait,
+                             bytes_sent=get_body_size(kwargs))
+        for hook in self._hooks: hook.before_request(event)
+
+    def _call_after_request(self, method: str, url: str, attempt: int, elapsed: float, kwargs: dict[str, Any], responce: Any = None,
+                            error: Optional[Exception] = None, retry_delay: Optional[float] = None) -> None:
+        " Call hooks after attempt of request with responce (requests or httpx) or with error of connection. "
+        event = ResponceEvent(
+            method=method, url=url, action=get_url_action(url), attempt=attempt,
+            status_code=responce.status_code if responce is not None else None, error=repr(error) if error else None,
+            elapsed=elapsed, bytes_sent=get_body_size(kwargs), bytes_received=len(responce.content) if responce is not None else 0,
+            retry_delay=retry_delay
+        )
+        for hook in self._hooks: hook.after_request(event)
+
+    @contextmanager
+    def _measure_stage(self, stage: str, action: str) -> Iterator[None]:
+        " Measure time of stage of processing of data for hooks. Stages: parse, dataframe. "
+        if not self._hooks:
+            yield
+            return
         
-    def init_cheker(self, *args, **kwargs):
-        if self.__mode_save_token.mode == ModeSaveTokenEnum.LOCAL_FILE:
-            self.__func_update_token = save_tokens_to_file
+        start = time.perf_counter()
+        try: yield
+        finally:
+            seconds = time.perf_counter() - start
+            for hook in self._hooks: hook.on_timing(stage, action, seconds)
+
+    def _count_request(self) -> None:
+        " Increase count of sent requests. "
+        with self._session_lock:
+            self._count_send_request += 1
+        
+    def _load_tokens(self) -> None:
+        " Load saved tokens from local file, if this mode save tokens is set. "
+        if self._mode_save_token.mode == ModeSaveTokenEnum.LOCAL_FILE:
+            self._func_update_token = save_tokens_to_file
             
-            if os.path.exists(self.__mode_save_token.path_to_file):
-                with open(self.__mode_save_token.path_to_file) as file:
+            if os.path.exists(self._mode_save_token.path_to_file):
+                with open(self._mode_save_token.path_to_file) as file:
                     dict_with_tokens = json.loads(file.read())
                     self.access_token = dict_with_tokens.get("access_token", self.access_token)
                     self.refresh_token = dict_with_tokens.get("refresh_token", self.refresh_token)
+                    self._token_manager.expires_at = dict_with_tokens.get("expires_at", self._token_manager.expires_at)
 
+    def _save_tokens(self, *args, **kwargs) -> bool:
+        " Save current tokens with function update token. "
+        if self._func_update_token is None: return False
+        if self._mode_save_token.mode == ModeSaveTokenEnum.LOCAL_FILE: kwargs["path_to_save_file"] = self._mode_save_token.path_to_file
+        return self._func_update_token(access_token=self.access_token, refresh_token=self.refresh_token, 
+                                        expires_at=self._token_manager.expires_at, *args, **kwargs)
 
-        if self.__settings.check_auth_in_init and not self.__check_auth(self.access_token, self.refresh_token): 
-            self.__check_work_token(self.attempts_conn, *args, **kwargs)
-
-        if self.__settings.check_auth_in_init and self._is_need_update_token:
-            raise AuthError("Failed to log in with the specified values! Check your tokens.")
-        
     def __str__(self):
         return f"""-------- AMOCRM connector --------
             Email: {self.connect_email} 
@@ -112,16 +247,315 @@ class AmoCRM(AmoCRMConst):
             --------  Private --------
 
             Count send request: {self._count_send_request}
+            Rate limiter: {self._rate_limiter}
+            Rate limiter statistic: {self.get_rate_limiter_statistic()}
             Is need update token: {self._is_need_update_token}
             Set access token: {bool(self.access_token)}
             Set refresh token: {bool(self.refresh_token)}
-            Check auth in init: {self.__settings.check_auth_in_init}
-            Mode save tokens: {self.__mode_save_token}
+            Token manager: {self._token_manager}
+            Check auth in init: {self._settings.check_auth_in_init}
+            Mode save tokens: {self._mode_save_token}
             
             Debug mode active?: {self._debug} 
             Auth work?: {"Not tested" if self._is_need_update_token is None else not self._is_need_update_token}
             """
     
+    def _check_responce_status_code(self, responce: Response, is_print_info: bool = True) -> Tuple[bool, str, int]:
+        if responce.status_code == 200:
+            return (True, '', responce.status_code)
+        elif responce.status_code == 204:
+            is_print_info and self._logger.info('Responce don\'t have data. status code -> 204')
+            return (False, 'Responce don\'t have data. status code -> 204', responce.status_code)
+        elif responce.status_code == 401:
+            is_print_info and self._logger.error('Unauthorized request, check your token!')
+            return (False, 'Unauthorized request, check your token!', responce.status_code)
+        elif responce.status_code == 404:
+            is_print_info and self._logger.error('Incorrect request, check the correctness of the specified email!')
+            return (False, 'Incorrect request, check the correctness of the specified email!', responce.status_code)
+        else:
+            is_print_info and self._logger.error(f'Incorrect request! code -> {responce.status_code}')
+            return (False, 'Incorrect request!', responce.status_code)
+
+    def _parse_responce_get(self, responce: Response, validate: Optional[bool] = None) -> AmoResponceGet:
+        """ Parse responce of GET request. Without validation json is decoded by fast parser (orjson, if installed)
+        and models are built by 'construct_model', values keep types of json (links are str).
+
+        Args:
+            responce (Response): Success responce.
+            validate (Optional[bool], optional): Validate responce. None -> 'validate_responces' of settings. Defaults to None.
+        """
+        if validate is None: validate = self._validate_responces
+        
+        with self._measure_stage('parse', get_url_action(str(responce.url)) if self._hooks else ''):
+            if validate: return AmoResponceGet.parse_obj(responce.json())
+            return construct_model(AmoResponceGet, loads(responce.content))
+
+    def _create_batch_result(self, index: int, send_data: list[dict], responce: Optional[Response], responce_model: type[BaseModel], 
+                             error_model: type[BaseModel], detail: str='') -> AmoResponceBatch:
+        """ Parse responce of batch to {responce_model} or {error_model}. Model is chosen by status code, responce is parsed once.
+        Items of success responce are linked with sent items by 'request_id' ('request_items' of result).
+
+        Args:
+            index (int): Number of batch.
+            send_data (list[dict]): Sent items of batch.
+            responce (Optional[Response]): Responce of batch. None if request is not sent.
+            responce_model (type[BaseModel]): Model of success responce.
+            error_model (type[BaseModel]): Model of error responce.
+            detail (str, optional): Message of error, if request is not sent. Defaults to ''.
+
+        Returns:
+            AmoResponceBatch: Result of batch.
+        """
+        request_ids = [item.get('request_id') for item in send_data]
+        ids = [item['id'] for item in send_data if 'id' in item]
+        if responce is None:
+            return AmoResponceBatch(index=index, request_ids=request_ids, ids=ids, failed_ids=ids, is_success=False, detail=detail, data=None)
+        
+        isAllowed, message, _ = self._check_responce_status_code(responce)
+        try: responce_data = (responce_model if isAllowed else error_model).parse_obj(loads(responce.content))
+        except (ValidationError, ValueError, TypeError): responce_data = None
+        
+        if isAllowed and isinstance(responce_data, responce_model):
+            items = responce_data.__root__ if isinstance(responce_data, AmoResponcePostComplex) else get_embedded_items(responce_data.embedded)
+            received_ids = {item.id for item in items}
+            failed_ids = [id for id in ids if id not in received_ids]
+            request_items = {}
+            for item in items:
+                # Item of 'leads/complex' has list of request_id
+                item_request_ids = getattr(item, 'request_id', None)
+                for request_id in item_request_ids if isinstance(item_request_ids, list) else [item_request_ids]:
+                    if request_id is not None: request_items[request_id] = item
+            failed_request_ids = [request_id for item, request_id in zip(send_data, request_ids) 
+                                  if 'id' not in item and request_id is not None and request_id not in request_items]
+            
+            if failed_ids: detail = f"Items are not in responce! ids -> {failed_ids}"
+            elif failed_request_ids: detail = f"Items are not in responce! request_ids -> {failed_request_ids}"
+            else: detail = "Success"
+            return AmoResponceBatch(index=index, request_ids=request_ids, ids=ids, failed_ids=failed_ids, failed_request_ids=failed_request_ids,
+                                    request_items=request_items, is_success=True, detail=detail, data=responce_data)
+        return AmoResponceBatch(index=index, request_ids=request_ids, ids=ids, failed_ids=ids, is_success=False, 
+                                detail=f"{message} | {responce.text}", data=responce_data)
+
+    def _create_batches_func_responce(self, batches: list[AmoResponceBatch]) -> AmoCRMFuncResponce:
+        """ Create function responce from results of batches. Failed batches are set to field 'errors'.
+        Status is False only if all batches are failed.
+        """
+        responce_data = [batch_result.data for batch_result in batches]
+        errors = [batch_result for batch_result in batches 
+                  if not batch_result.is_success or batch_result.failed_ids or batch_result.failed_request_ids]
+        
+        if errors and len(errors) == len(batches):
+            return AmoCRMFuncResponce(status=False, detail=errors[0].detail, data=responce_data, errors=errors)
+        if errors:
+            return AmoCRMFuncResponce(status=True, detail=f"Some part of the data was not sent! Failed batches -> {len(errors)}", 
+                                      data=responce_data, errors=errors)
+        return AmoCRMFuncResponce(status=True, data=responce_data)
+
+    def _merge_patch_batches(self, batches: list[AmoResponceBatch]) -> AmoCRMFuncResponce:
+        """ Merge success responces of PATCH batches to one AmoResponcePatch. Batches with failed ids are set to field 'errors'.
+        Status is False only if all batches are failed.
+        """
+        success_datas: list[AmoResponcePatch] = [batch_result.data for batch_result in batches if batch_result.is_success]
+        errors = [batch_result for batch_result in batches if not batch_result.is_success or batch_result.failed_ids]
+        failed_ids = [id for batch_result in errors for id in batch_result.failed_ids]
+        
+        if not success_datas:
+            return AmoCRMFuncResponce(status=False, detail=f"Data was not sent! {errors[0].detail}", data=errors[0].data, errors=errors)
+        
+        embedded = success_datas[0].embedded
+        field_name = next(iter(embedded.__fields__))
+        items = [item for responce_data in success_datas for item in get_embedded_items(responce_data.embedded)]
+        responce_data = success_datas[0].copy(update={'embedded': embedded.copy(update={field_name: items})})
+        
+        if errors:
+            return AmoCRMFuncResponce(status=True, detail=f"Some part of the data was not sent! Count failed ids -> {len(failed_ids)}", 
+                                      data=responce_data, errors=errors)
+        return AmoCRMFuncResponce(status=True, data=responce_data)
+    
+    def _create_by_ids_responce(self, action: AmoCRM.ACTION, ids: list[int], chunks: list[Tuple[Optional[str], list[AmoResponceGet]]],
+                                as_df: bool = False, compact: bool = False) -> AmoCRMFuncResponce:
+        """ Create responce of 'get_by_ids' from pages of chunks of ids. Entities are in order of {ids}, not found ids are in 'errors'.
+
+        Args:
+            action (AmoCRM.ACTION): Action of entities.
+            ids (list[int]): Requested ids without repeats.
+            chunks (list[Tuple[Optional[str], list[AmoResponceGet]]]): Error (None if success) and pages of each chunk.
+        """
+        error = next((f"{error} Chunk -> {number}" for number, (error, _) in enumerate(chunks) if error is not None), None)
+        pages = [page for _, chunk_pages in chunks for page in chunk_pages]
+        entities = {entity.id: entity for page in pages for entity in get_embedded_items(page.embedded)}
+        missing_ids = [id for id in ids if id not in entities]
+
+        if as_df:
+            from pandas import DataFrame, concat
+            
+            with self._measure_stage('dataframe', action):
+                frames = [data_df for data_df in map(self.parse_data_and_create_df, pages) if isinstance(data_df, DataFrame)]
+                data_df = concat(frames, ignore_index=True) if frames else DataFrame()
+                # Rows in order of ids
+                if not data_df.empty: data_df = data_df.iloc[data_df['id'].map({id: number for number, id in enumerate(ids)}).argsort(kind='stable')]
+            data = data_df.reset_index(drop=True)
+        else:
+            factory = RecordFactory() if compact else None
+            data = [factory.create(entities[id]) if factory else entities[id] for id in ids if id in entities]
+
+        if error is not None: return AmoCRMFuncResponce(status=False, detail=error, data=data, errors=missing_ids)
+        
+        if self._debug: self._logger.info(f"By ids | {action} | Chunks -> {len(chunks)} | Entities -> {len(entities)} | Not found -> {len(missing_ids)}")
+        detail = f"Ids are not found -> {', '.join(map(str, missing_ids[:20]))}{', ...' if len(missing_ids) > 20 else ''}" if missing_ids else "Success"
+        return AmoCRMFuncResponce(status=True, detail=detail, data=data, errors=missing_ids)
+
+    # PARSE
+
+    def add_custom_fields_columns(self, data_df: DataFrame, schema: Optional[list[CustomFieldSchema]] = None) -> DataFrame:
+        """ Add wide columns of custom fields to Dataframe from 'get_data_df'. If schema is None, types of fields are got from data. """
+        from amocrm.v4.amoCRM_df import add_custom_fields_columns
+        
+        return add_custom_fields_columns(data_df, schema)
+
+    def parse_data_and_create_df(self, data: AmoResponceGet, all_custom_fields: bool = False) -> Optional[DataFrame]:
+
+        """ Parse data from get function and create df. With {all_custom_fields} fields PHONE and EMAIL of contacts
+        are kept in 'custom_fields_values', they are needed for wide columns.
+        
+        ::Return::
+            ~ Dataframe | None
+        """
+        from amocrm.v4.amoCRM_df import parse_data_and_create_df
+        
+        return parse_data_and_create_df(data, self._logger, all_custom_fields)
+
+
+class AmoCRM(AmoCRMBase):
+    """ Class Api connector to servise https://amocrm.com (AmoCRM).
+
+        Usage:
+        >>> from amocr.v4.amoCRM import AmoCRM
+        >>> amocrm = AmoCRM(settings) # settings is AmoCRMInit in pydantic model
+        >>> is_success, responce_msg, get_responce = amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10&")
+
+        >>> # Close pooled http session on exit
+        >>> with AmoCRM(settings) as amocrm:
+        >>>     amocrm.get(AmoCRM.ACTION.LEADS)
+    """
+    
+    def __enter__(self) -> AmoCRM:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        " Close pooled http session. Connector cannot send requests after it. "
+        self._session.close()
+
+    def _create_session(self, init_settings: AmoCRMInit) -> requests.Session:
+        """ Create http session with keep-alive connection pool. Session is shared by all connector methods.
+
+        Args:
+            init_settings (AmoCRMInit): Init settings with pool size.
+
+        Returns:
+            requests.Session: Session with mounted pooled adapter.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=init_settings.pool_connections, pool_maxsize=init_settings.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _prepare_url(self, url: str) -> str:
+        " Url as it is sent by session: requests (with urllib3 2) percent-encodes brackets of query. "
+        return self._session.prepare_request(Request("GET", url)).url
+
+    def _send_request(self, method: str, url: str, **kwargs) -> Response:
+        """ Send request through shared session. All requests of connector go through this method.
+        Access token is refreshed before request, if it is expiring. If responce code is 401, token is refreshed
+        and request is sent again once. Requests with own header Authorization are sent as is.
+
+        Args:
+            method (str): Http method. Ex: GET, POST, PATCH.
+            url (str): Full url of request.
+            **kwargs: Other arguments for requests.Session.request.
+
+        Returns:
+            Response: Responce from amocrm.
+        """
+        is_session_auth = "Authorization" not in (kwargs.get("headers") or {})
+        if is_session_auth and self.refresh_token and self._token_manager.is_expired():
+            self.refresh_tokens(failed_access_token=self.access_token)
+        
+        used_access_token = self.access_token
+        responce = self.__send_request_with_retry(method, url, **kwargs)
+        
+        if responce.status_code == 401 and is_session_auth and self.refresh_token:
+            if self.refresh_tokens(failed_access_token=used_access_token):
+                responce = self.__send_request_with_retry(method, url, **kwargs)
+        
+        return responce
+
+    def __send_request_with_retry(self, method: str, url: str, **kwargs) -> Response:
+        """ Send request through shared session.
+        Request is sent again by retry policy on error of connection or on retryable status code.
+
+        Args:
+            method (str): Http method. Ex: GET, POST, PATCH.
+            url (str): Full url of request.
+            **kwargs: Other arguments for requests.Session.request.
+
+        Returns:
+            Response: Responce from amocrm.
+        """
+        kwargs.setdefault("timeout", self._retry_policy.timeout)
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            throttle_wait = self._rate_limiter.acquire() if self._rate_limiter else 0.0
+            if self._hooks: self._call_before_request(method, url, attempt, throttle_wait, kwargs)
+            
+            start = time.perf_counter()
+            try:
+                responce = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                elapsed = time.perf_counter() - start
+                self._count_request()
+                # Connect timeout means that request did not reach server
+                is_retry = is_retry_allowed(self._retry_policy, method, attempt, is_sent=not isinstance(e, requests.ConnectTimeout))
+                delay = get_retry_delay(self._retry_policy, attempt) if is_retry else None
+                if self._hooks: self._call_after_request(method, url, attempt, elapsed, kwargs, error=e, retry_delay=delay)
+                if not is_retry: raise
+                self._logger.warning(f"{method} | Error of connection -> {e} | Retry in {delay:.2f} sec, attempt -> {attempt}")
+            else:
+                elapsed = time.perf_counter() - start
+                self._count_request()
+                is_retry = is_retry_allowed(self._retry_policy, method, attempt, status_code=responce.status_code)
+                delay = get_retry_delay(self._retry_policy, attempt, retry_after=responce.headers.get("Retry-After")) if is_retry else None
+                if self._hooks: self._call_after_request(method, url, attempt, elapsed, kwargs, responce=responce, retry_delay=delay)
+                if not is_retry: return responce
+                self._logger.warning(f"{method} | Code -> {responce.status_code} | Retry in {delay:.2f} sec, attempt -> {attempt}")
+            
+            time.sleep(delay)
+
+    def init_cheker(self, *args, **kwargs):
+        self._load_tokens()
+        
+        if self._settings.check_auth_in_init and self._token_manager.is_valid():
+            # Time of expiry is known and token is not expired, check of account is not needed
+            self._is_need_update_token = False
+            return
+        
+        if self._settings.check_auth_in_init and self.refresh_token and self._token_manager.is_expired():
+            if not self.refresh_tokens():
+                raise AuthError("Failed to refresh expired token! Check your tokens.")
+            return
+
+        if self._settings.check_auth_in_init and not self.__check_auth(self.access_token, self.refresh_token): 
+            self.__check_work_token(self.attempts_conn, *args, **kwargs)
+
+        if self._settings.check_auth_in_init and self._is_need_update_token:
+            raise AuthError("Failed to log in with the specified values! Check your tokens.")
+        
     # CHECKER
 
     def __check_auth(self, access_token: str, refresh_token: str) -> bool:
@@ -161,6 +595,7 @@ class AmoCRM(AmoCRMConst):
         self._logger.info(msg_logger)
         self._new_access_token = answer.access_token
         self._new_refresh_token = answer.refresh_token
+        self._new_expires_in = answer.expires_in
         self._is_need_update_token = True
         return False
 
@@ -178,26 +613,9 @@ class AmoCRM(AmoCRMConst):
                 message_responce[str]: responce message from amo_crm
                 code_responce[int]: responce code
         """
-        url = f"https://{self.connect_domain}.amocrm.ru/api/{version_api}/{action}"
-        responce: Response = requests.get(url, headers={ "Authorization" : f"Bearer {access_token}"})
-        self._count_send_request += 1
-        return self.__check_responce_status_code(responce)
-
-    def __check_responce_status_code(self, responce: Response, is_print_info: bool = True) -> Tuple[bool, str, int]:
-        if responce.status_code == 200:
-            return (True, '', responce.status_code)
-        elif responce.status_code == 204:
-            is_print_info and self._logger.info('Responce don\'t have data. status code -> 204')
-            return (False, 'Responce don\'t have data. status code -> 204', responce.status_code)
-        elif responce.status_code == 401:
-            is_print_info and self._logger.error('Unauthorized request, check your token!')
-            return (False, 'Unauthorized request, check your token!', responce.status_code)
-        elif responce.status_code == 404:
-            is_print_info and self._logger.error('Incorrect request, check the correctness of the specified email!')
-            return (False, 'Incorrect request, check the correctness of the specified email!', responce.status_code)
-        else:
-            is_print_info and self._logger.error(f'Incorrect request! code -> {responce.status_code}')
-            return (False, 'Incorrect request!', responce.status_code)
+        url = f"{self._base_url}/api/{version_api}/{action}"
+        responce: Response = self._send_request("GET", url, headers={ "Authorization" : f"Bearer {access_token}"})
+        return self._check_responce_status_code(responce)
 
     def __check_work_token(self, attempts: int=5, *args, **kwargs) -> bool:
         """Check work token on connect to AmoCRM.
@@ -215,17 +633,47 @@ class AmoCRM(AmoCRMConst):
         
         if attempts <= 0: return False
         if not self._is_need_update_token: 
+            self._token_manager.set_tokens(self._new_access_token, self._new_refresh_token, expires_in=self._new_expires_in)
             self.access_token = self._new_access_token
-            self.refresh_token = self._new_refresh_token
             
             if kwargs.get('is_update_tokens', False):
-                if self.__mode_save_token.mode == ModeSaveTokenEnum.LOCAL_FILE: kwargs["path_to_save_file"] = self.__mode_save_token.path_to_file
-                return self.__func_update_token(access_token=self.access_token, refresh_token=self.refresh_token, *args, **kwargs)
+                return self._save_tokens(*args, **kwargs)
             return True
         
         self.__check_auth(self._new_access_token, self._new_refresh_token)
         return self.__check_work_token(attempts - 1, is_update_tokens=True, *args, **kwargs)
 
+    def refresh_tokens(self, failed_access_token: Optional[str] = None) -> bool:
+        """ Get new tokens using refresh token. Only one thread refreshes tokens at the same time.
+
+        Args:
+            failed_access_token (Optional[str], optional): Access token, which did not work. If token was already changed 
+                by other thread, it is not refreshed again. Defaults to None.
+
+        Returns:
+            bool: Is success refresh.
+        """
+        with self._token_manager.lock:
+            if failed_access_token is not None and self.access_token != failed_access_token: return True
+            
+            body = RequestAuth(
+                client_id=self.connect_id,
+                client_secret=self.connect_secret_key,
+                grant_type=AmoCRM.TYPE_AUTH.REFRESH_CODE,
+                refresh_token=self.refresh_token,
+                redirect_uri=self.redirect_uri
+            )
+            answer = self.oauth2(self.AUTH_METHODS.ACEESS_TOKEN, body=body)
+            if isinstance(answer, ResponceAuthNotValid):
+                self._is_need_update_token = True
+                self._logger.error(f'Token has not been refreshed! Responce message - "{answer.detail}" | Excaption code - "{answer.status}"')
+                return False
+            
+            self._logger.info("Responce new token using refresh token!")
+            self._set_tokens(answer)
+            self._is_need_update_token = False
+            return True
+
     # AUTH
 
     def oauth2(self, action: AmoCRM.AUTH_METHODS, body: RequestAuth=None) -> Union[ResponceAuthValid, ResponceAuthNotValid]:
@@ -244,10 +692,10 @@ class AmoCRM(AmoCRMConst):
         (cls) ResponceAuthNotValid { title: 'Некорректный тип доступа', type: 'https://...', status: 400, detail: 'Передано некорректное значение' }
         """
         
-        url = f"https://{self.connect_domain}.amocrm.ru/oauth2/{action}"
-        headers = { "Content-Type" : "application/json" }
-        responce = requests.post(url, data=body.json(), headers=headers)
-        self._count_send_request += 1
+        url = f"{self._base_url}/oauth2/{action}"
+        # Bearer header of session is not needed for auth request
+        headers = { "Content-Type" : "application/json", "Authorization": None }
+        responce = self._send_request("POST", url, data=body.json(), headers=headers)
         
         try: data = ResponceAuthValid(**responce.json())
         except ValidationError: data = ResponceAuthNotValid(**responce.json())
@@ -268,25 +716,228 @@ class AmoCRM(AmoCRMConst):
         >>> amocrm = AmoCRM(**data)
         >>> amocrm.get(amocrm.ACTION.LEADS)
         AmoCRMFuncResponce(status=False, detail='Incorrect request!', data=None)
+        
+        >>> # Trusted data, responce is not validated. Default is set by 'validate_responces' in AmoCRMInit
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get(amocrm.ACTION.LEADS, validate=False)
+        AmoCRMFuncResponce(status=True, detail='', data=AmoResponceGet({'_page' : 1, '_links' : {'self': {'href': '', ...}}))
         """
         
         url = kwargs.get('url', None)
-        if not url: url = f"https://{self.connect_domain}.amocrm.ru/api/{version_api}/{action}?{filters}"
+        if not url: url = self.get_url(action, filters, version_api)
         if self._debug: self._logger.info(f"Send url -> {url}")
         
-        responce = requests.get(url, headers={ "Authorization" : f"Bearer {self.access_token}"})
-        self._count_send_request += 1
+        responce = self._send_get_request(url)
         
-        isAllowed, message, _ = self.__check_responce_status_code(responce)
+        isAllowed, message, _ = self._check_responce_status_code(responce)
 
         if not isAllowed: return AmoCRMFuncResponce(status=False, detail=message, data=None)
         
-        data = AmoResponceGet.parse_obj(responce.json())
+        data = self._parse_responce_get(responce, validate=kwargs.get('validate'))
 
         return AmoCRMFuncResponce(status=True, data=data)
     
-    def get_data_df(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', *args, **kwargs) -> AmoCRMFuncResponce:
-        """ Get data from action url on Dataframe format. Use 'get' function class.
+    def iter_get_responces(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', get_all_data: bool=True, 
+                           *args, **kwargs) -> Iterator[AmoCRMFuncResponce]:
+        """ Iterate over responces of 'get' function. Pages are requested in loop by link 'links.next.href'.
+        Iteration ends after last page or after first not success responce (it is yielded too).
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM.
+            filters (str, optional): Filters of request. Defaults to ''.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            get_all_data (bool, optional): Go to next pages. If False, only first page is yielded. Defaults to True.
+
+        Yields:
+            Iterator[AmoCRMFuncResponce]: Responce of 'get' function for each page.
+        """
+        while True:
+            get_responce = self.get(action=action, filters=filters, version_api=version_api, *args, **kwargs)
+            if get_responce.status and not isinstance(get_responce.data, AmoResponceGet):
+                get_responce = AmoCRMFuncResponce(status=False, detail='Type data is not AmoResponceGet!', data=None)
+            
+            yield get_responce
+            
+            if not get_responce.status or not get_all_data or not get_responce.data.links.next: return
+            kwargs['url'] = str(get_responce.data.links.next.href)
+
+    def iter_pages(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', *args, **kwargs) -> Iterator[AmoResponceGet]:
+        """ Iterate over all pages from action url, from first page to last page. Only one page is kept in memory.
+        # Example
+        >>> amocrm = AmoCRM(**data)
+        >>> for page in amocrm.iter_pages(amocrm.ACTION.LEADS, filters="limit=250"):
+        >>>     page
+        (cls) AmoResponceGet {page: 1, links: {...}, embedded: {leads: [...]}}
+        """
+        for get_responce in self.iter_get_responces(action, filters=filters, version_api=version_api, *args, **kwargs):
+            if not get_responce.status: return
+            yield get_responce.data
+
+    def iter_entities(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', *args, **kwargs) -> Iterator[Union[Leads, Contacts]]:
+        """ Iterate over all entities (Leads or Contacts) from action url, from first page to last page.
+        # Example
+        >>> amocrm = AmoCRM(**data)
+        >>> for lead in amocrm.iter_entities(amocrm.ACTION.LEADS, filters="limit=250"):
+        >>>     lead
+        (cls) Leads {id: 12653276, name: 'Name', price: 0, ... }
+        """
+        for page in self.iter_pages(action, filters=filters, version_api=version_api, *args, **kwargs):
+            if isinstance(page.embedded, DataContacts): yield from page.embedded.contacts
+            elif isinstance(page.embedded, DataLeads): yield from page.embedded.leads
+
+    def iter_get_responces_parallel(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', max_workers: int=5, 
+                                    *args, **kwargs) -> Iterator[AmoCRMFuncResponce]:
+        """ Iterate over responces of all pages, pages are requested by number ('page=N') in thread pool.
+        Last page is found by probing (exponential steps, then binary search), probed pages are not requested twice.
+        Responces are yielded in order of pages. Iteration ends after last page or after first not success responce.
+        At most 2 * {max_workers} pages are requested ahead of yielded page, so memory does not grow with count of pages.
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM.
+            filters (str, optional): Filters of request. Defaults to ''.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            max_workers (int, optional): Max count of requests at the same time. Defaults to 5.
+
+        Yields:
+            Iterator[AmoCRMFuncResponce]: Responce of 'get' function for each page.
+        """
+        first_responce = next(self.iter_get_responces(action, filters=filters, version_api=version_api, get_all_data=False, *args, **kwargs))
+        yield first_responce
+        if not first_responce.status or not first_responce.data.links.next: return
+        
+        url = str(first_responce.data.links.self.href)
+        pages: dict[int, AmoResponceGet] = {}
+        validate = kwargs.get('validate')
+        last_page = self.__find_last_page(url, first_responce.data.page, pages, validate)
+        if last_page is None:
+            yield AmoCRMFuncResponce(status=False, detail='Incorrect request! Last page is not found.', data=None)
+            return
+        
+        numbers = iter(range(first_responce.data.page + 1, last_page + 1))
+        # Window of requested pages: (number, future), future is None for probed page
+        futures: deque[Tuple[int, Optional[Future]]] = deque()
+        page = first_responce.data
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def fill_window() -> None:
+                for number in numbers:
+                    futures.append((number, None if number in pages else executor.submit(self.get_page, set_url_page(url, number), validate)))
+                    if len(futures) >= 2 * max_workers: return
+            
+            try:
+                fill_window()
+                while futures:
+                    number, future = futures.popleft()
+                    page = pages.pop(number) if future is None else future.result()[1]
+                    if page is None:
+                        yield AmoCRMFuncResponce(status=False, detail=f'Incorrect request! Page {number} is not received.', data=None)
+                        return
+                    fill_window()
+                    yield AmoCRMFuncResponce(status=True, data=page)
+            finally:
+                # Iteration is stopped: requests of window, which are not sent yet, are not needed
+                for _, future in futures: future is not None and future.cancel()
+        
+        # New data could be added after probing, rest of pages is got by link
+        if page.links.next:
+            kwargs['url'] = str(page.links.next.href)
+            yield from self.iter_get_responces(action, filters=filters, version_api=version_api, *args, **kwargs)
+
+    def __find_last_page(self, url: str, first_page: int, pages: dict[int, AmoResponceGet], validate: Optional[bool] = None) -> Optional[int]:
+        """ Find number of last page by probing. Received pages are saved to {pages}.
+
+        Args:
+            url (str): Url of first page.
+            first_page (int): Number of first page, this page has link to next page.
+            pages (dict[int, AmoResponceGet]): Dict for save probed pages.
+            validate (Optional[bool], optional): Validate pages. None -> 'validate_responces' of settings. Defaults to None.
+
+        Returns:
+            Optional[int]: Number of last page. None if request is not success.
+        """
+        low, high, step = first_page, None, 1
+        
+        while True:
+            number = low + step if high is None else (low + high) // 2
+            if high is not None and number == low: return low
+            
+            code, page = self.get_page(set_url_page(url, number), validate)
+            if page is not None:
+                pages[number] = page
+                if not page.links.next: return number
+                low = number
+                if high is None: step *= 2
+            elif code == 204: high = number
+            else: return None
+
+    def get_page(self, url: str, validate: Optional[bool] = None, use_cache: bool = True) -> Tuple[int, Optional[AmoResponceGet]]:
+        """ Get one page by url. Return code responce and page, page is None if request is not success.
+        Empty page (204) is end of pagination, it is not printed as error.
+
+        Args:
+            url (str): Full url of page. Ex: url of 'get_url' or link of other page.
+            validate (Optional[bool], optional): Validate page. None -> 'validate_responces' of settings. Defaults to None.
+            use_cache (bool, optional): Use cache of GET responces, if it is set. Defaults to True.
+        """
+        if self._debug: self._logger.info(f"Send url -> {url}")
+        responce = self._send_get_request(url, use_cache=use_cache)
+        
+        # Empty page (204) is normal end of pagination, it is not printed
+        isAllowed, _, code = self._check_responce_status_code(responce, is_print_info=responce.status_code != 204)
+        if not isAllowed: return code, None
+        
+        return code, self._parse_responce_get(responce, validate)
+
+    def get_page_content(self, url: str, use_cache: bool = True) -> Tuple[int, Optional[bytes]]:
+        """ Get content of one page by url without parse. Ex: pages are parsed in other processes ('ExportPipeline').
+        Return code responce and content, content is None if request is not success. See 'get_page'.
+        """
+        if self._debug: self._logger.info(f"Send url -> {url}")
+        responce = self._send_get_request(url, use_cache=use_cache)
+        
+        isAllowed, _, code = self._check_responce_status_code(responce, is_print_info=responce.status_code != 204)
+        return code, responce.content if isAllowed else None
+
+    def _send_get_request(self, url: str, use_cache: bool = True) -> Response:
+        """ Send GET request through cache, if it is set. Fresh responce is returned from cache without request,
+        stale responce is revalidated by server (304 -> responce from cache).
+
+        Args:
+            url (str): Full url of request.
+            use_cache (bool, optional): Use cache. If False, responce is requested and is not saved. Defaults to True.
+        """
+        if self._cache is None or not use_cache: return self._send_request("GET", url)
+        
+        entry, is_fresh = self._cache.lookup(url)
+        if is_fresh: return self._create_cached_responce(entry)
+        
+        headers = self._cache.get_conditional_headers(entry)
+        responce = self._send_request("GET", url, headers=headers) if headers else self._send_request("GET", url)
+        
+        if responce.status_code == 304 and entry is not None: return self._create_cached_responce(self._cache.revalidate(entry))
+        if responce.status_code == 200: self._cache.store(url, responce.content, responce.headers)
+        else: self._cache.miss()
+        return responce
+
+    def _create_cached_responce(self, entry: CacheEntry) -> Response:
+        " Create responce from cache entry. "
+        responce = Response()
+        responce.status_code = 200
+        responce.url = entry.url
+        responce._content = entry.content
+        responce.headers["Content-Type"] = "application/hal+json"
+        return responce
+
+    def __select_iter_get_responces(self, action: AmoCRM.ACTION, filters: str, version_api: str, get_all_data: bool, max_workers: int, 
+                                    *args, **kwargs) -> Iterator[AmoCRMFuncResponce]:
+        " Choose iterator over pages: pages by link one by one or pages by number in thread pool. "
+        if get_all_data and max_workers > 1:
+            return self.iter_get_responces_parallel(action, filters=filters, version_api=version_api, max_workers=max_workers, *args, **kwargs)
+        return self.iter_get_responces(action, filters=filters, version_api=version_api, get_all_data=get_all_data, *args, **kwargs)
+
+    def get_data_df(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', get_all_data: bool=False, 
+                    max_workers: int=1, wide_custom_fields: bool=False, with_contacts: bool=False, *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Get data from action url on Dataframe format. Use 'iter_get_responces' function class.
         # Example
         >>> # Data is correct
         >>> amocrm = AmoCRM(**data)
@@ -298,32 +949,66 @@ class AmoCRM(AmoCRMConst):
         >>> amocrm.get_data_df(amocrm.ACTION.LEADS)
         AmoCRMFuncResponce(status=False, detail='Incorrect request!', data=Datafame())
         
-        >>> # Get all data from amocrm (Using recursion)
-        >>> # Receives data from the first page to the last page
+        >>> # Get all data from amocrm
+        >>> # Receives data from the first page to the last page, frames of pages are concatenated once at the end
         >>> amocrm = AmoCRM(**data)
         >>> amocrm.get_data_df(amocrm.ACTION.LEADS, get_all_data=True)
         AmoCRMFuncResponce(status=True, detail='', data=Dataframe(*Data in dataframe*))
+        
+        >>> # Get all data, pages are requested by number in thread pool with {max_workers} threads
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_data_df(amocrm.ACTION.LEADS, get_all_data=True, max_workers=5)
+        AmoCRMFuncResponce(status=True, detail='', data=Dataframe(*Data in dataframe*))
+        
+        >>> # Custom fields in wide columns (one column per field, dtypes by type of field), schema of fields is cached
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_data_df(amocrm.ACTION.LEADS, get_all_data=True, wide_custom_fields=True)
+        AmoCRMFuncResponce(status=True, detail='', data=Dataframe(columns=[id, name, ..., cf_1245, cf_PHONE, ...]))
+        
+        >>> # Leads with all contacts: one row per lead and contact, each contact is requested once by 'get_by_ids'
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_data_df(amocrm.ACTION.LEADS, get_all_data=True, with_contacts=True)
+        AmoCRMFuncResponce(status=True, detail='', data=Dataframe(columns=[id, name, ..., contact_id, contact_is_main, contact_name, ...]))
         """
-        get_responce = self.get(action=action, filters=filters, version_api=version_api, *args, **kwargs)
+        from pandas import DataFrame, concat
+        
+        if with_contacts:
+            if action != AmoCRM.ACTION.LEADS: return AmoCRMFuncResponce(status=False, detail="Contacts are expanded only for leads!", data=DataFrame())
+            filters = add_filter_with(filters, 'contacts')
+        
+        frames: list[DataFrame] = []
+        lead_contacts: list[Tuple[int, int, Optional[bool]]] = []
         
-        if not get_responce.status: return AmoCRMFuncResponce(status=False, detail=get_responce.detail, data=DataFrame())
-        if not isinstance(get_responce.data, AmoResponceGet): 
-            return AmoCRMFuncResponce(status=False, detail='Type data is not AmoResponceGet!', data=DataFrame())
+        for get_responce in self.__select_iter_get_responces(action, filters, version_api, get_all_data, max_workers, *args, **kwargs):
+            if not get_responce.status:
+                data_df = concat(frames, ignore_index=True) if frames else DataFrame()
+                return AmoCRMFuncResponce(status=False, detail=get_responce.detail, data=data_df)
+            
+            if with_contacts: lead_contacts.extend(get_lead_contacts(get_embedded_items(get_responce.data.embedded)))
+            with self._measure_stage('dataframe', action):
+                data_df = self.parse_data_and_create_df(get_responce.data, all_custom_fields=wide_custom_fields)
+            if isinstance(data_df, DataFrame): frames.append(data_df)
         
-        data_df = self.parse_data_and_create_df(get_responce.data)
+        with self._measure_stage('dataframe', action):
+            data_df = concat(frames, ignore_index=True) if frames else DataFrame()
+        if wide_custom_fields:
+            schema = self.get_custom_fields(action, version_api=version_api).data
+            with self._measure_stage('dataframe', action): data_df = self.add_custom_fields_columns(data_df, schema)
         
-        if isinstance(data_df, DataFrame) and kwargs.get('get_all_data', False):
-            if self._debug: self._logger.warning("Вход в рекурсивный запрос!")
-            kwargs['url'] = get_responce.data.links.next.href
-            data_df = concat([
-                data_df, self.get_data_df(action, version_api=version_api, **kwargs).data
-            ]).sort_index()
-            if self._debug: self._logger.warning("Выход из рекурсивного запроса!")
+        if with_contacts:
+            from amocrm.v4.amoCRM_df import join_lead_contacts
+            
+            contacts_responce = self.get_by_ids(AmoCRM.ACTION.CONTACTS, [contact_id for _, contact_id, _ in lead_contacts], version_api=version_api,
+                                                max_workers=max_workers, as_df=True, validate=kwargs.get('validate'))
+            with self._measure_stage('dataframe', action): data_df = join_lead_contacts(data_df, lead_contacts, contacts_responce.data)
+            return AmoCRMFuncResponce(status=contacts_responce.status, detail=contacts_responce.detail, data=data_df, 
+                                      errors=contacts_responce.errors)
         
         return AmoCRMFuncResponce(status=True, data=data_df)
 
-    def get_data(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', *args, **kwargs) -> AmoCRMFuncResponce:
-        """ Get only data from action url on list format. Use 'get' function class.
+    def get_data(self, action: AmoCRM.ACTION, filters: str='', version_api: str='v4', get_all_data: bool=False, 
+                 max_workers: int=1, compact: bool=False, with_contacts: bool=False, *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Get only data from action url on list format. Use 'iter_get_responces' function class.
         # Example
         >>> # Data is correct
         >>> amocrm = AmoCRM(**data)
@@ -334,28 +1019,210 @@ class AmoCRM(AmoCRMConst):
         >>> amocrm = AmoCRM(**data)
         >>> amocrm.get_data(amocrm.ACTION.LEADS)
         AmoCRMFuncResponce(status=False, detail='Incorrect request!', data=None)
-        """
-        get_responce = self.get(action=action, filters=filters, version_api=version_api, *args, **kwargs)
         
-        if not get_responce.status: return  AmoCRMFuncResponce(status=False, detail=get_responce.detail, data=None)
-        if not isinstance(get_responce.data, AmoResponceGet):
-            return AmoCRMFuncResponce(status=False, detail='Type data is not AmoResponceGet!', data=None)
+        >>> # Get all data from amocrm, from the first page to the last page
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_data(amocrm.ACTION.LEADS, get_all_data=True)
+        AmoCRMFuncResponce(status=True, detail='', data=[(cls) Leads {id: 12653276, name: 'Name', price: 0, ... }, ...])
         
-        data = None
+        >>> # Get all data, pages are requested by number in thread pool with {max_workers} threads
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_data(amocrm.ACTION.LEADS, get_all_data=True, max_workers=5)
+        
+        >>> # Get all data as compact records (slots, flat links), for big result sets
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_data(amocrm.ACTION.LEADS, get_all_data=True, compact=True)
+        AmoCRMFuncResponce(status=True, detail='', data=[LeadRecord(id=12653276, name='Name', price=0, ...), ...])
+        
+        >>> # Leads with all contacts (normalized), each contact is requested once by 'get_by_ids', not found contacts are in errors
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_data(amocrm.ACTION.LEADS, get_all_data=True, with_contacts=True).data
+        AmoLeadsContacts(leads=[(cls) Leads {id: 12653276, ... }, ...], contacts=[(cls) Contacts {id: 2251, ... }, ...], lead_contacts=[(12653276, 2251, True), ...])
+        """
+        data = []
         err_msg = ""
+        factory = RecordFactory() if compact else None
+        lead_contacts: list[Tuple[int, int, Optional[bool]]] = []
+        
+        if with_contacts:
+            if action != AmoCRM.ACTION.LEADS: return AmoCRMFuncResponce(status=False, detail="Contacts are expanded only for leads!", data=None)
+            filters = add_filter_with(filters, 'contacts')
+        
+        for get_responce in self.__select_iter_get_responces(action, filters, version_api, get_all_data, max_workers, *args, **kwargs):
+            if not get_responce.status: 
+                return AmoCRMFuncResponce(status=False, detail=get_responce.detail, data=data or None)
+            
+            if isinstance(get_responce.data.embedded, DataContacts): entities = get_responce.data.embedded.contacts
+            elif isinstance(get_responce.data.embedded, DataLeads): entities = get_responce.data.embedded.leads
+            else:
+                err_msg = "Data is not allow! Access type = [Contacts, Leads]"
+                continue
+            
+            if with_contacts: lead_contacts.extend(get_lead_contacts(entities))
+            data.extend(map(factory.create, entities) if factory else entities)
         
-        if isinstance(get_responce.data.embedded, DataContacts): data = get_responce.data.embedded.contacts 
-        elif isinstance(get_responce.data.embedded, DataLeads): data = get_responce.data.embedded.leads
-        else: err_msg = "Data is not allow! Access type = [Contacts, Leads]"
+        if with_contacts:
+            contacts_responce = self.get_by_ids(AmoCRM.ACTION.CONTACTS, [contact_id for _, contact_id, _ in lead_contacts], version_api=version_api,
+                                                max_workers=max_workers, compact=compact, validate=kwargs.get('validate'))
+            data = AmoLeadsContacts.construct(leads=data, contacts=contacts_responce.data, lead_contacts=lead_contacts)
+            return AmoCRMFuncResponce(status=contacts_responce.status, detail=contacts_responce.detail, data=data, errors=contacts_responce.errors)
         
         return AmoCRMFuncResponce(status=True, detail=err_msg, data=data)
 
-        # POST
+    def get_data_sharded(self, action: AmoCRM.ACTION, datetime_from: int, datetime_to: int, count_shards: int=5, max_workers: int=5,
+                         probe: bool=False, field: str='created_at', version_api: str='v4', compact: bool=False,
+                         validate: Optional[bool]=None) -> AmoCRMFuncResponce:
+        """ Get all data of range [datetime_from, datetime_to] by {field}. Range is split to {count_shards} windows without gaps
+        and overlaps ('FilterAmoCRM.split_range'), pages of windows are requested in parallel. Data is merged in order
+        of windows, entities with equal id are added once.
+
+        With {probe} windows have equal count of entities, density of entities is found by 'get_shard_points'.
+        Window by 'updated_at' is not stable: entity changed during export can move to other window.
+        # Example
+        >>> amocrm = AmoCRM(**data)
+        >>> datetime_from, datetime_to = FilterAmoCRM(FilterAmoCRM.ACTIONS.LAST_5_AGE).get_datetime_for_filter(None, FilterAmoCRM.TABLE.LEADS)
+        >>> amocrm.get_data_sharded(amocrm.ACTION.LEADS, datetime_from, datetime_to, count_shards=8, max_workers=4, probe=True)
+        AmoCRMFuncResponce(status=True, detail='', data=[(cls) Leads {id: 12653276, name: 'Name', price: 0, ... }, ...])
+        """
+        points = None
+        if probe:
+            points_responce = self.get_shard_points(action, datetime_from, datetime_to, count_points=count_shards * 4, field=field,
+                                                    version_api=version_api, max_workers=max_workers, validate=validate)
+            if not points_responce.status: return AmoCRMFuncResponce(status=False, detail=points_responce.detail, data=None)
+            points = points_responce.data
+
+        windows = FilterAmoCRM.split_range(datetime_from, datetime_to, count_shards, points)
+        urls = [self.get_url(action, FilterAmoCRM.create_window_filter(window, field), version_api) for window in windows]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            shards = list(executor.map(lambda url: self._get_pages_by_link(url, validate), urls))
+
+        data, ids = [], set()
+        factory = RecordFactory() if compact else None
+        for window, (error, pages) in zip(windows, shards):
+            for entity in (entity for page in pages for entity in get_embedded_items(page.embedded)):
+                if entity.id in ids: continue
+                ids.add(entity.id)
+                data.append(factory.create(entity) if factory else entity)
+            if error is not None: return AmoCRMFuncResponce(status=False, detail=f"{error} Window -> {window}", data=data or None)
+
+        if self._debug: self._logger.info(f"Sharded | {action} | Windows -> {len(windows)} | Entities -> {len(data)}")
+        return AmoCRMFuncResponce(status=True, data=data)
+
+    def _get_pages_by_link(self, url: str, validate: Optional[bool] = None) -> Tuple[Optional[str], list[AmoResponceGet]]:
+        " Get all pages from {url} by link. Return error (None if success) and received pages. Empty result (204) is success. "
+        pages = []
+        while url:
+            code, page = self.get_page(url, validate)
+            if page is None: return (None if code == 204 else f"Incorrect request! code -> {code}"), pages
+            pages.append(page)
+            url = str(page.links.next.href) if page.links.next else None
+        return None, pages
+
+    def get_by_ids(self, action: AmoCRM.ACTION, ids: list[int], version_api: str='v4', max_workers: int=5, as_df: bool=False,
+                   compact: bool=False, max_url_length: int=2000, validate: Optional[bool]=None) -> AmoCRMFuncResponce:
+        """ Get entities by ids. Ids are packed to filters by 'filter[id][]' ('FilterAmoCRM.create_id_filters'), filter has
+        at most 250 ids (one page) and url is not longer than {max_url_length}: url is returned in links of page, links longer
+        than 2083 chars are not valid for models (HttpUrl). Filters are requested in parallel.
+        Entities are returned in order of {ids} (repeated id -> one entity), not found ids are in 'errors'.
+        # Example
+        >>> amocrm = AmoCRM(**data)
+        >>> amocrm.get_by_ids(amocrm.ACTION.LEADS, [12653276, 12653280, 1])
+        AmoCRMFuncResponce(status=True, detail='Ids are not found -> 1', data=[(cls) Leads {id: 12653276, ... }, ...], errors=[1])
+
+        >>> # Entities in Dataframe, as in 'get_data_df'
+        >>> amocrm.get_by_ids(amocrm.ACTION.LEADS, ids, as_df=True, max_workers=8)
+        AmoCRMFuncResponce(status=True, detail='Success', data=Dataframe(*Data in dataframe*), errors=[])
+        """
+        ids = list(dict.fromkeys(int(id) for id in ids))
+        url = self.get_url(action, version_api=version_api)
+        # Place for '&page=N', if entities are on several pages
+        filters = FilterAmoCRM.create_id_filters(ids, max_length=max_url_length - len(url) - len('&page=100'),
+                                                 quoted='%5B' in self._prepare_url(f"{url}{FilterAmoCRM.TYPE.ID.value}=1"))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chunks = list(executor.map(lambda filter_: self._get_pages_by_link(url + filter_, validate), filters))
+
+        return self._create_by_ids_responce(action, ids, chunks, as_df=as_df, compact=compact)
+
+    def get_shard_points(self, action: AmoCRM.ACTION, datetime_from: int, datetime_to: int, count_points: int=20, field: str='created_at',
+                         version_api: str='v4', max_workers: int=5, validate: Optional[bool]=None) -> AmoCRMFuncResponce:
+        """ Probe density of entities in range by {field}. Entities are ordered by {field}, pages at equal steps are requested
+        and {field} of first entity of page is point, so points split range to parts with equal count of entities.
+        Last page is found by probing, as in 'iter_get_responces_parallel'.
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            datetime_from (int): Timestamp of start of range.
+            datetime_to (int): Timestamp of end of range.
+            count_points (int, optional): Max count of points (requested pages). Defaults to 20.
+            field (str, optional): Field of range: 'created_at' or 'updated_at'. Defaults to 'created_at'.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            max_workers (int, optional): Max count of requests at the same time. Defaults to 5.
+            validate (Optional[bool], optional): Validate pages. None -> 'validate_responces' of settings. Defaults to None.
+
+        Returns:
+            AmoCRMFuncResponce: data is sorted list of timestamps (points) for 'FilterAmoCRM.split_range'.
+        """
+        order = FilterAmoCRM.TYPE.ORDER_CREATE_AT if field == 'created_at' else FilterAmoCRM.TYPE.ORDER_UPDATE_AT
+        filters = f"{FilterAmoCRM.create_window_filter((datetime_from, datetime_to), field)}&{order.value}=asc"
+        url = self.get_url(action, filters, version_api)
+
+        code, first_page = self.get_page(url, validate, use_cache=False)
+        if first_page is None:
+            if code == 204: return AmoCRMFuncResponce(status=True, data=[])
+            return AmoCRMFuncResponce(status=False, detail=f"Incorrect request! code -> {code}", data=None)
+        # All entities of range are on one page, each entity is point
+        if not first_page.links.next:
+            return AmoCRMFuncResponce(status=True, data=sorted(getattr(entity, field) for entity in get_embedded_items(first_page.embedded)))
+
+        pages: dict[int, AmoResponceGet] = {first_page.page: first_page}
+        last_page = self.__find_last_page(url, first_page.page, pages, validate)
+        if last_page is None: return AmoCRMFuncResponce(status=False, detail='Incorrect request! Last page is not found.', data=None)
+
+        numbers = sorted({first_page.page + (last_page - first_page.page + 1) * number // count_points for number in range(count_points)})
+        missing = [number for number in numbers if number not in pages]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for number, (code, page) in zip(missing, executor.map(lambda number: self.get_page(set_url_page(url, number), validate), missing)):
+                if page is None: return AmoCRMFuncResponce(status=False, detail=f"Incorrect request! Page {number} is not received.", data=None)
+                pages[number] = page
+
+        return AmoCRMFuncResponce(status=True, data=sorted(getattr(get_embedded_items(pages[number].embedded)[0], field) for number in numbers))
+
+    def get_custom_fields(self, action: AmoCRM.ACTION, version_api: str='v4', refresh: bool=False) -> AmoCRMFuncResponce:
+        """ Get schema of custom fields of action (all pages). Schema is cached for 'custom_fields_ttl' seconds of settings.
+
+        Args:
+            action (AmoCRM.ACTION): Action of entities. Ex: LEADS, CONTACTS.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            refresh (bool, optional): Request schema, even if it is cached. Defaults to False.
+
+        Returns:
+            AmoCRMFuncResponce: data is list[CustomFieldSchema].
+        """
+        cached = self._custom_fields_schema.get(action)
+        if cached is not None and not refresh and time.time() < cached[0]: return AmoCRMFuncResponce(status=True, data=cached[1])
+        
+        fields: list[CustomFieldSchema] = []
+        url = f"{self._base_url}/api/{version_api}/{action}/custom_fields?limit=250"
+        
+        while url:
+            responce = self._send_get_request(url)
+            isAllowed, message, code = self._check_responce_status_code(responce, is_print_info=responce.status_code != 204)
+            if code == 204: break
+            if not isAllowed: return AmoCRMFuncResponce(status=False, detail=message, data=None)
+            
+            page = AmoResponceCustomFields.parse_obj(responce.json())
+            fields.extend(page.embedded.custom_fields)
+            url = str(page.links.next.href) if page.links.next else None
+        
+        self._custom_fields_schema[action] = (time.time() + self._custom_fields_ttl, fields)
+        return AmoCRMFuncResponce(status=True, data=fields)
 
     # POST
 
     def post(self, action: AmoCRM.ACTION, data: list[Union[AmoRequestPostLeads, AmoRequestPostContact]], version_api: str='v4', 
-            max_count: int=50, *args, **kwargs) -> AmoCRMFuncResponce:
+            max_count: int=50, max_workers: int=1, *args, **kwargs) -> AmoCRMFuncResponce:
         """ Post data to amocrm.
 
         Args:
@@ -363,9 +1230,12 @@ class AmoCRM(AmoCRMConst):
             data (list[Union[AmoRequestPostLeads, AmoRequestPostContact]]): Sent data.
             version_api (str, optional): Version api amocrm. Defaults to 'v4'.
             max_count (int, optional): Max count product send on batch. Defaults to 50.
+            max_workers (int, optional): Max count of batches sent at the same time. Defaults to 1.
 
         Returns:
-            AmoCRMFuncResponce: Request function
+            AmoCRMFuncResponce: Request function. Data is responces of batches in order of data, items of responces are linked 
+                with items of data by 'request_id' (index of item in data, if it is not set). Failed batches and batches with
+                items, which are not in responce, are in 'errors'. Responce of LEADS_COMPLEX is AmoResponcePostComplex.
             
         Example:
             >>> # Data is correct
@@ -379,62 +1249,82 @@ class AmoCRM(AmoCRMConst):
             >>> data = []
             >>> amocrm.post(amocrm.ACTION.LEADS, data=data)
             AmoCRMFuncResponce(status=False, detail='Data is empty!', data=None)
+            
+            >>> # Complex post, batches are sent in 5 threads
+            >>> amocrm = AmoCRM(**data)
+            >>> amocrm.post(amocrm.ACTION.LEADS_COMPLEX, data=data, max_count=50, max_workers=5)
+            AmoCRMFuncResponce(status=True, detail='Some part of the data was not sent! Failed batches -> 1', data=[...], 
+                               errors=[AmoResponceBatch(index=3, request_ids=['150', ...], is_success=False, ...)])
         """
 
         url = kwargs.get('url', None)
-        if not url: url = f"https://{self.connect_domain}.amocrm.ru/api/{version_api}/{action}"
+        if not url: url = f"{self._base_url}/api/{version_api}/{action}"
 
         if data == []:  return AmoCRMFuncResponce(status=False, detail='Data is empty!', data=None)
         if self._debug: return AmoCRMFuncResponce(status=False, detail='AMOCRM | Debug mode is On!', data=None)
         
-        responce_data = []
-        data = list(map(lambda it: it.dict(skip_defaults=True), data))
-        if self._debug: self._logger.info(f"POST | Send url -> {url}")
+        data = [dump_model(item) for item in data]
+        # request_id links items of responce with items of data
+        for index, item in enumerate(data):
+            if not item.get('request_id'): item['request_id'] = str(index)
+        
+        if action == AmoCRM.ACTION.LEADS_COMPLEX: send_datas, responce_model = list(batch(data, max_count)), AmoResponcePostComplex
+        else: send_datas, responce_model = [data], AmoResponcePost
+        batches = self._send_batches("POST", url, send_datas, responce_model, AmoResponcePostError, max_workers=max_workers)
+        
+        if self._cache is not None: self._cache.invalidate(action)
+        
+        return self._create_batches_func_responce(batches)
 
-        if action == AmoCRM.ACTION.LEADS_COMPLEX:
-            if self._debug: self._logger.warning("Вход в рекурсивный запрос! POST")
+    def _send_batches(self, method: str, url: str, send_datas: list[list[dict]], responce_model: type[BaseModel], 
+                      error_model: type[BaseModel], max_workers: int=1) -> list[AmoResponceBatch]:
+        """ Send batches of data. With {max_workers} > 1 batches are sent in thread pool.
+        Batch is encoded to json bytes by fast encoder (orjson, if installed) in thread of batch.
 
-            for send_data in batch(data, max_count):
-                if send_data == []: break
+        Args:
+            method (str): Http method. Ex: POST, PATCH.
+            url (str): Full url of request.
+            send_datas (list[list[dict]]): Batches of data.
+            responce_model (type[BaseModel]): Model of success responce.
+            error_model (type[BaseModel]): Model of error responce.
+            max_workers (int, optional): Max count of requests at the same time. Defaults to 1.
 
-                responce = requests.post(url, json=send_data, headers={ "Authorization" : f"Bearer {self.access_token}", 
-                                                                        "Content-Type": "application/json"})
+        Returns:
+            list[AmoResponceBatch]: Results of batches, in order of {send_datas}.
+        """
+        if self._debug: self._logger.info(f"{method} | Send url -> {url} | Count batches -> {len(send_datas)}")
         
-                try: responce_data.append(AmoResponcePost(**responce.json()))
-                except ValidationError: responce_data.append(AmoResponcePostError(**responce.json()))
-    
-                self._count_send_request += 1
-
-            if self._debug: self._logger.warning("Выход из рекурсивного запроса! POST")
-        else:
-            responce = requests.post(url, json=data, headers={ "Authorization" : f"Bearer {self.access_token}", 
-                                                                        "Content-Type": "application/json"})
-
-            try: responce_data.append(AmoResponcePost(**responce.json()))
-            except ValidationError: responce_data.append(AmoResponcePostError(**responce.json()))
+        def send_batch(index: int) -> AmoResponceBatch:
+            try:
+                body = dumps(send_datas[index])
+                responce = self._send_request(method, url, data=body, headers={ "Content-Type": "application/json" })
+            except requests.RequestException as e:
+                return self._create_batch_result(index, send_datas[index], None, responce_model, error_model, 
+                                                 detail=f"Error of connection -> {e}")
+            return self._create_batch_result(index, send_datas[index], responce, responce_model, error_model)
         
-        for item_data in responce_data:
-            if isinstance(item_data, AmoResponcePostError): 
-                return AmoCRMFuncResponce(status=False, detail="Some part of the data was not sent!", data=responce_data)
-
-        isAllowed, message, _ = self.__check_responce_status_code(responce)
-        if not isAllowed: return AmoCRMFuncResponce(status=False, detail=f"{message} | {responce.json()}", data=None)
-
-        return AmoCRMFuncResponce(status=True, data=responce_data)
+        if max_workers <= 1 or len(send_datas) <= 1:
+            return [send_batch(index) for index in range(len(send_datas))]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(send_batch, range(len(send_datas))))
 
     # PATCH
 
     def patch(self, action: AmoCRM.ACTION, data: list[Union[AmoRequestPatchLeads, AmoRequestPatchContact]], version_api: str='v4', 
-            *args, **kwargs) -> AmoCRMFuncResponce:
+            max_count: int=250, max_workers: int=1, *args, **kwargs) -> AmoCRMFuncResponce:
         """ Patch data to amocrm.
 
         Args:
             action (AmoCRM.ACTION): Where to send data.
             data (list[Union[AmoRequestPatchLeads, AmoRequestPatchContact]]): Sent data
             version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            max_count (int, optional): Max count items send on batch. Defaults to 250.
+            max_workers (int, optional): Max count of batches sent at the same time. Defaults to 1.
 
         Returns:
-            AmoCRMFuncResponce: Request function
+            AmoCRMFuncResponce: Request function. Data is AmoResponcePatch merged from responces of all batches.
+                Batches with not updated ids are in 'errors', field 'failed_ids' of batch has these ids.
             
         Example:
             >>> # Data is correct
@@ -448,129 +1338,25 @@ class AmoCRM(AmoCRMConst):
             >>> data = []
             >>> amocrm.patch(amocrm.ACTION.LEADS, data=data)
             AmoCRMFuncResponce(status=False, detail='Data is empty!', data=None)
+            
+            >>> # Big update, batches are sent in 5 threads
+            >>> amocrm = AmoCRM(**data)
+            >>> amocrm.patch(amocrm.ACTION.LEADS, data=data, max_count=250, max_workers=5)
+            AmoCRMFuncResponce(status=True, detail='Some part of the data was not sent! Count failed ids -> 250', 
+                               data=AmoResponcePatch(...), errors=[AmoResponceBatch(index=2, failed_ids=[12653276, ...], ...)])
         """
         
         url = kwargs.get('url', None)
-        if not url: url = f"https://{self.connect_domain}.amocrm.ru/api/{version_api}/{action}"
+        if not url: url = f"{self._base_url}/api/{version_api}/{action}"
 
         if data == []:  return AmoCRMFuncResponce(status=False, detail='Data is empty!', data=None)
         if self._debug: return AmoCRMFuncResponce(status=False, detail='AMOCRM | Debug mode is On!', data=None)
 
-        data = list(map(lambda it: it.dict(skip_defaults=True), data))
+        data = [dump_model(item) for item in data]
         
-        if self._debug: self._logger.info(f"PATCH | Send url -> {url}")
-        responce = requests.patch(url, json=data, headers={ "Authorization" : f"Bearer {self.access_token}" })
-        self._count_send_request += 1
-
-        try: responce_data = AmoResponcePatch(**responce.json())
-        except ValidationError: responce_data = AmoResponcePatchError(**responce.json())
-
-        if isinstance(responce_data, AmoResponcePatchError): 
-            return AmoCRMFuncResponce(status=False, detail="Some part of the data was not sent!", data=responce_data)
-
-        return AmoCRMFuncResponce(status=True, data=responce_data)
-    
-    # PARSE
-
-    def __create_one_dimensional_df_on_leads(self, data: DataLeads) -> DataFrame:
-        """ Create new Dataframe from data leads (AmoCrmResponce models).
-        Return:
-            - Dataframe()
-        """
-        # non_one_dimensional_fields = ['custom_fields_values', 'links', 'embedded']
-        leads_dict: list[dict[str, Union[str, dict]]] = data.dict().get('leads', [])
-        
-        for index, lead in enumerate(data.leads):
-            
-            if isinstance(lead.custom_fields_values, list):
-                fields_list = []
-                for field in lead.custom_fields_values:
-                    if not field.values[0].enum_id:
-                        field.values[0].enum_id = None
-                    fields_list.append(field.dict())
-                leads_dict[index]['custom_fields_values'] = fields_list
-            
-            if isinstance(lead.links, Links):
-                leads_dict[index]['link'] = lead.links.self.href
-                del leads_dict[index]['links']
-
-            if isinstance(lead.embedded, Embedded):
-                tags_list: list[dict[str, Union[str,int]]] = []
-                for tag in lead.embedded.tags:
-                    tags_list.append({'id': tag.id, 'name': tag.name })
-                leads_dict[index]['embedded_tags'] = tags_list
-                                
-                companies_list: list[dict[str, Union[str,int]]] = []
-                for company in lead.embedded.companies:
-                    companies_list.append({"id": company.id, "link": company.links.self.href.__str__()})
-                else: leads_dict[index]['embedded_companies'] = companies_list
-                
-                contact_list: list[dict[str, Union[str,int]]] = []
-                if lead.embedded.contacts:
-                    for contact in lead.embedded.contacts:
-                        contact_list.append(contact.id)
-                    leads_dict[index]['contact_id'] = None if len(contact_list) == 0 else contact_list[0]
-        
-                del leads_dict[index]['embedded']
-
-        return DataFrame(data=leads_dict)
-
-    def __create_one_dimensional_df_on_contacts(self, data: DataContacts) -> DataFrame:
-        """ Create new Dataframe from data contacts (AmoCrmResponce models).
-        Return:
-            - Dataframe()
-        """
-        # non_one_dimensional_fields = ['custom_fields_values', 'links', 'embedded']
-        contacts_dict: list[dict[str, Union[str, dict]]] = data.dict().get('contacts', [])
-        
-        for index, contact in enumerate(data.contacts):
-            email = None
-            phone = None
-            fields_list = []
-            
-            if isinstance(contact.custom_fields_values, list):
-                for field in contact.custom_fields_values:
-                    if field.field_code == 'EMAIL': email = field.values[0].value
-                    elif field.field_code == 'PHONE': phone = field.values[0].value
-                    else: fields_list.append(field.dict())
-            elif isinstance(contact.custom_fields_values, NoneType):
-                fields_list.append({'values': []})
-            
-            if isinstance(contact.links, Links):
-                contacts_dict[index]['link'] = contact.links.self.href
-                del contacts_dict[index]['links']
-
-            tags_list = []
-            companies_list = []
-            if isinstance(contact.embedded, Embedded):
-                for tag in contact.embedded.tags:
-
-                    tags_list.append({"id": tag.id, "name": tag.name})
-                for company in contact.embedded.companies:
-
-                    companies_list.append({"id": company.id, "link": company.links.self.href.__str__()})
-                del contacts_dict[index]['embedded']
-                
-            contacts_dict[index]['email'] = email
-            contacts_dict[index]['phone'] = phone
-            contacts_dict[index]['custom_fields_values'] = fields_list
-            contacts_dict[index]['embedded_tags'] = tags_list
-            contacts_dict[index]['embedded_companies'] = companies_list
-            
-        return DataFrame(data=contacts_dict)
-
-    def parse_data_and_create_df(self, data: AmoResponceGet) -> Optional[DataFrame]:
-
-        """ Parse data from get function and create df.
-        
-        ::Return::
-            ~ Dataframe | None
-        """
+        batches = self._send_batches("PATCH", url, list(batch(data, max_count)), AmoResponcePatch, AmoResponcePatchError, 
+                                     max_workers=max_workers)
         
-        if isinstance(data.embedded, DataLeads):
-            return self.__create_one_dimensional_df_on_leads(data.embedded)
-        elif isinstance(data.embedded, DataContacts):
-            return self.__create_one_dimensional_df_on_contacts(data.embedded)
+        if self._cache is not None: self._cache.invalidate(action)
         
-        self._logger.error(f"Data is not allowed type. type -> {type(data.embedded)}")
-        return None
+        return self._merge_patch_batches(batches)
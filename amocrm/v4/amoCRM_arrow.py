@@ -0,0 +1,218 @@
+" File with export of AmoCRM leads and contacts to Arrow table and Parquet file, page by page "
+
+from __future__ import annotations
+from typing import Any, Iterator, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from amocrm.v4.models.amoCRM_M import AmoCRMFuncResponce, AmoResponceGet, Contacts, CustomField, DataContacts, DataLeads, Leads
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_utils import get_embedded_items
+
+import os
+import loguru
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def get_arrow_type(type_: Any) -> pa.DataType:
+    """ Get Arrow type of type of model field. Models are structs, lists are lists, Union of types is string.
+    Ex: int -> int64, list[Tags] -> list<struct<id: int64, name: string>>
+    """
+    origin = get_origin(type_)
+    if origin is list: return pa.list_(get_arrow_type(get_args(type_)[0]))
+    if origin is Union:
+        types = [arg for arg in get_args(type_) if arg is not type(None)]
+        return get_arrow_type(types[0]) if len(types) == 1 else pa.string()
+    if isinstance(type_, type) and issubclass(type_, BaseModel): return pa.struct(get_arrow_fields(type_))
+    if type_ is bool: return pa.bool_()
+    if type_ is int: return pa.int64()
+    if type_ is float: return pa.float64()
+    return pa.string()
+
+
+def get_arrow_fields(model: type[BaseModel]) -> list[pa.Field]:
+    " Get Arrow fields of model fields, Optional fields are nullable. "
+    return [pa.field(name, get_arrow_type(field.outer_type_), nullable=not field.required) for name, field in model.__fields__.items()]
+
+
+def create_arrow_schema(model: type[Union[Leads, Contacts]]) -> pa.Schema:
+    """ Create Arrow schema of model of entity. Nested fields 'links' and 'embedded' are replaced by flat columns
+    as in Dataframe and records: link, tags, companies (id, link) and contact_ids (leads only).
+    """
+    fields = [field for field in get_arrow_fields(model) if field.name not in ('links', 'embedded')]
+    fields += [
+        pa.field('link', pa.string(), nullable=False),
+        pa.field('tags', pa.list_(pa.struct([pa.field('id', pa.int64(), nullable=False), pa.field('name', pa.string(), nullable=False)]))),
+        pa.field('companies', pa.list_(pa.struct([pa.field('id', pa.int64(), nullable=False), pa.field('link', pa.string(), nullable=False)])))
+    ]
+    if model is Leads: fields.append(pa.field('contact_ids', pa.list_(pa.int64())))
+    return pa.schema(fields)
+
+
+LEADS_SCHEMA = create_arrow_schema(Leads)
+CONTACTS_SCHEMA = create_arrow_schema(Contacts)
+
+
+def _create_custom_fields(fields: Optional[list[CustomField]]) -> Optional[list[dict[str, Any]]]:
+    if fields is None: return None
+    return [{
+        'field_id': field.field_id, 'field_name': field.field_name, 'field_code': field.field_code, 'field_type': field.field_type,
+        'values': [{'enum_id': value.enum_id, 'enum_code': value.enum_code, 'value': None if value.value is None else str(value.value)}
+                   for value in field.values]
+    } for field in fields]
+
+
+def create_record_batch(data: AmoResponceGet) -> Optional[pa.RecordBatch]:
+    """ Create Arrow record batch from page of leads or contacts. Columns are filled in one pass over entities.
+
+    ::Return::
+        ~ RecordBatch | None (type of data is not allowed)
+    """
+    if isinstance(data.embedded, DataLeads): schema = LEADS_SCHEMA
+    elif isinstance(data.embedded, DataContacts): schema = CONTACTS_SCHEMA
+    else: return None
+
+    entities: list[Union[Leads, Contacts]] = get_embedded_items(data.embedded)
+    columns: dict[str, list] = {name: [] for name in schema.names}
+    plain_columns = [(name, columns[name].append) for name in schema.names
+                     if name not in ('custom_fields_values', 'link', 'tags', 'companies', 'contact_ids')]
+    custom_fields_values, link, tags, companies = (columns['custom_fields_values'].append, columns['link'].append,
+                                                   columns['tags'].append, columns['companies'].append)
+    contact_ids = columns['contact_ids'].append if 'contact_ids' in columns else None
+
+    for entity in entities:
+        values = entity.__dict__
+        for name, append in plain_columns: append(values[name])
+
+        custom_fields_values(_create_custom_fields(entity.custom_fields_values))
+        link(str(entity.links.self.href))
+        tags([{'id': tag.id, 'name': tag.name} for tag in entity.embedded.tags])
+        companies([{'id': company.id, 'link': str(company.links.self.href)} for company in entity.embedded.companies])
+        if contact_ids: contact_ids([contact.id for contact in entity.embedded.contacts or []])
+
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+class ArrowExport:
+    """ Export of leads and contacts to Arrow table or Parquet file. Pages are converted to record batches one by one
+    with fixed schema (LEADS_SCHEMA, CONTACTS_SCHEMA), so Parquet export keeps in memory only one row group,
+    not all data of account. Arrow table is returned without copy to pandas.
+
+        Usage:
+        >>> export = ArrowExport(amocrm)
+        >>> export.to_parquet("leads.parquet", AmoCRM.ACTION.LEADS, max_workers=5)
+        AmoCRMFuncResponce(status=True, detail='', data=125430)
+
+        >>> table = export.to_table(AmoCRM.ACTION.CONTACTS).data
+        >>> table.column('updated_at')
+    """
+
+    def __init__(self, amocrm: AmoCRM, logger: loguru.Logger = loguru.logger):
+        self._amocrm = amocrm
+        self._logger = logger
+
+    def iter_batches(self, action: AmoCRM.ACTION, filters: str = 'limit=250', version_api: str = 'v4', max_workers: int = 1,
+                     *args, **kwargs) -> Iterator[AmoCRMFuncResponce]:
+        """ Iterate over record batches of pages. Iteration ends after last page or after first not success responce
+        (it is yielded too). With {max_workers} > 1 at most 2 * {max_workers} pages are requested ahead of yielded batch
+        (see 'iter_get_responces_parallel'), so memory does not grow with count of pages.
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            filters (str, optional): Filters of request. Defaults to 'limit=250'.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            max_workers (int, optional): Pages are requested by number in thread pool, if > 1. Defaults to 1.
+
+        Yields:
+            Iterator[AmoCRMFuncResponce]: data is RecordBatch of page.
+        """
+        if max_workers > 1:
+            responces = self._amocrm.iter_get_responces_parallel(action, filters=filters, version_api=version_api,
+                                                                 max_workers=max_workers, *args, **kwargs)
+        else: responces = self._amocrm.iter_get_responces(action, filters=filters, version_api=version_api, *args, **kwargs)
+
+        for responce in responces:
+            if not responce.status:
+                yield AmoCRMFuncResponce(status=False, detail=responce.detail, data=None)
+                return
+
+            record_batch = create_record_batch(responce.data)
+            if record_batch is None:
+                yield AmoCRMFuncResponce(status=False, detail=f"Data is not allowed type. type -> {type(responce.data.embedded)}", data=None)
+                return
+            yield AmoCRMFuncResponce(status=True, data=record_batch)
+
+    def to_table(self, action: AmoCRM.ACTION, filters: str = 'limit=250', version_api: str = 'v4', max_workers: int = 1,
+                 *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Get all pages of action in Arrow table, one chunk per page. To get Dataframe use table.to_pandas().
+
+        Returns:
+            AmoCRMFuncResponce: data is Table (received pages, if request is not success).
+        """
+        schema = LEADS_SCHEMA if action == AmoCRM.ACTION.LEADS else CONTACTS_SCHEMA
+        batches: list[pa.RecordBatch] = []
+
+        for responce in self.iter_batches(action, filters, version_api, max_workers, *args, **kwargs):
+            if not responce.status:
+                return AmoCRMFuncResponce(status=False, detail=responce.detail, data=pa.Table.from_batches(batches, schema=schema))
+            batches.append(responce.data)
+
+        return AmoCRMFuncResponce(status=True, data=pa.Table.from_batches(batches, schema=schema))
+
+    def to_parquet(self, path_to_file: str, action: AmoCRM.ACTION, filters: str = 'limit=250', version_api: str = 'v4',
+                   max_workers: int = 1, row_group_size: int = 10000, compression: str = 'snappy', *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Write all pages of action to Parquet file. Pages are collected to row groups of at least {row_group_size} rows
+        (whole pages), only one row group (and window of requested pages, if {max_workers} > 1) is kept in memory.
+        File is written to temporary file and replaces {path_to_file} after last page, so file is not broken, if request
+        is not success. Temporary file is removed after not success request and after error.
+
+        Args:
+            path_to_file (str): Path to Parquet file.
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            filters (str, optional): Filters of request. Defaults to 'limit=250'.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            max_workers (int, optional): Pages are requested by number in thread pool, if > 1. Defaults to 1.
+            row_group_size (int, optional): Count of rows in row group. Defaults to 10000.
+            compression (str, optional): Compression of Parquet file. Defaults to 'snappy'.
+
+        Returns:
+            AmoCRMFuncResponce: data is count of written rows.
+        """
+        schema = LEADS_SCHEMA if action == AmoCRM.ACTION.LEADS else CONTACTS_SCHEMA
+        path_to_tmp_file = f"{path_to_file}.tmp"
+        batches: list[pa.RecordBatch] = []
+        count_buffered = count = 0
+        detail: Optional[str] = None
+
+        try:
+            with pq.ParquetWriter(path_to_tmp_file, schema, compression=compression) as writer:
+                for responce in self.iter_batches(action, filters, version_api, max_workers, *args, **kwargs):
+                    if not responce.status:
+                        detail = responce.detail
+                        break
+
+                    batches.append(responce.data)
+                    count_buffered += responce.data.num_rows
+                    if count_buffered >= row_group_size:
+                        writer.write_table(pa.Table.from_batches(batches, schema=schema), row_group_size=count_buffered)
+                        count += count_buffered
+                        batches, count_buffered = [], 0
+
+                if detail is None and batches:
+                    writer.write_table(pa.Table.from_batches(batches, schema=schema), row_group_size=count_buffered)
+                    count += count_buffered
+        except BaseException:
+            # Partial file is not left on disk, {path_to_file} is not changed
+            if os.path.exists(path_to_tmp_file): os.remove(path_to_tmp_file)
+            raise
+
+        if detail is not None:
+            os.remove(path_to_tmp_file)
+            return AmoCRMFuncResponce(status=False, detail=detail, data=0)
+
+        os.replace(path_to_tmp_file, path_to_file)
+        self._logger.info(f"Export | {action} | Written rows -> {count} | file -> {path_to_file}")
+        return AmoCRMFuncResponce(status=True, data=count)
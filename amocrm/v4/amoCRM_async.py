@@ -0,0 +1,545 @@
+" Asyncio counterpart of AmoCRM connector "
+
+from __future__ import annotations
+
+from typing import AsyncIterator, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from pydantic.error_wrappers import ValidationError
+
+from amocrm.v4.models.amoCRM_M import AmoRequestPatchContact, AmoRequestPostContact, AmoResponceGet, AmoResponcePostError, \
+                            DataContacts, DataLeads, RequestAuth, ResponceAuthNotValid, ResponceAuthValid, AmoCRMInit, \
+                            AmoResponcePost, AmoCRMFuncResponce, AmoRequestPostLeads, AmoRequestPatchLeads, \
+                            AmoResponcePatch, AmoResponcePatchError, AmoResponceBatch, CacheEntry, \
+                            AmoResponceCustomFields, CustomFieldSchema, AmoLeadsContacts, Contacts, Leads, AmoResponcePostComplex
+
+from amocrm.v4.models.amoCRM_record_M import RecordFactory
+
+from amocrm.v4.amoCRM import AmoCRMBase
+from amocrm.v4.amoCRM_filter import FilterAmoCRM
+from amocrm.v4.amoCRM_parse import dump_model, dumps
+from amocrm.v4.amoCRM_retry import get_retry_delay, is_retry_allowed
+from amocrm.v4.amoCRM_utils import add_filter_with, batch, get_embedded_items, get_lead_contacts, set_url_page
+from amocrm.v4.errors.amoCRM_E import AuthError
+
+import time
+import asyncio
+import httpx
+
+
+class AsyncAmoCRM(AmoCRMBase):
+    """ Asyncio api connector to servise https://amocrm.com (AmoCRM). Use same settings and responce models as AmoCRM.
+
+        Usage:
+        >>> from amocrm.v4.amoCRM_async import AsyncAmoCRM
+        >>> async with AsyncAmoCRM(settings) as amocrm: # settings is AmoCRMInit in pydantic model
+        >>>     responce = await amocrm.get_data_df(AsyncAmoCRM.ACTION.LEADS, get_all_data=True, max_concurrency=5)
+
+        >>> # Iterate over pages by link, one page is kept in memory
+        >>> async for lead in amocrm.iter_entities(AsyncAmoCRM.ACTION.LEADS, filters="limit=250"):
+        >>>     lead
+
+    Sharded export ('get_data_sharded', 'get_shard_points') is only in AmoCRM.
+    """
+
+    def __init__(self, init_settings: AmoCRMInit, *args, **kwargs):
+        self._check_auth_in_init = init_settings.check_auth_in_init
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        super().__init__(init_settings, *args, **kwargs)
+
+    def init_cheker(self, *args, **kwargs):
+        " Only load saved tokens. Auth is checked on enter to context manager or on call 'check_auth'. "
+        self._load_tokens()
+
+    async def __aenter__(self) -> AsyncAmoCRM:
+        # Token with known time of expiry is not checked
+        if self._check_auth_in_init and not self._token_manager.is_valid() and not await self.check_auth():
+            raise AuthError("Failed to log in with the specified values! Check your tokens.")
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        " Close pooled http client. Connector cannot send requests after it. "
+        await self._session.aclose()
+
+    def _create_session(self, init_settings: AmoCRMInit) -> httpx.AsyncClient:
+        """ Create async http client with keep-alive connection pool. Client is shared by all connector methods.
+
+        Args:
+            init_settings (AmoCRMInit): Init settings with pool size.
+
+        Returns:
+            httpx.AsyncClient: Client with limited connection pool.
+        """
+        limits = httpx.Limits(max_connections=init_settings.pool_maxsize, max_keepalive_connections=init_settings.pool_maxsize)
+        return httpx.AsyncClient(limits=limits)
+
+    def _prepare_url(self, url: str) -> str:
+        " Url as it is sent by client: httpx sends brackets of query as is. "
+        return str(self._session.build_request("GET", url).url)
+
+    async def _send_request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """ Send request through shared client. All requests of connector go through this method.
+        Access token is refreshed before request, if it is expiring. If responce code is 401, token is refreshed
+        and request is sent again once. Requests with own header Authorization are sent as is.
+
+        Args:
+            method (str): Http method. Ex: GET, POST, PATCH.
+            url (str): Full url of request.
+            **kwargs: Other arguments for httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response: Responce from amocrm.
+        """
+        is_session_auth = "Authorization" not in (kwargs.get("headers") or {})
+        if is_session_auth and self.refresh_token and self._token_manager.is_expired():
+            await self.refresh_tokens(failed_access_token=self.access_token)
+
+        used_access_token = self.access_token
+        responce = await self.__send_request_with_retry(method, url, **kwargs)
+
+        if responce.status_code == 401 and is_session_auth and self.refresh_token:
+            if await self.refresh_tokens(failed_access_token=used_access_token):
+                responce = await self.__send_request_with_retry(method, url, **kwargs)
+
+        return responce
+
+    async def __send_request_with_retry(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """ Send request through shared client.
+        Request is sent again by retry policy on error of connection or on retryable status code.
+
+        Args:
+            method (str): Http method. Ex: GET, POST, PATCH.
+            url (str): Full url of request.
+            **kwargs: Other arguments for httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response: Responce from amocrm.
+        """
+        kwargs.setdefault("timeout", self._retry_policy.timeout)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            throttle_wait = await self._rate_limiter.acquire_async() if self._rate_limiter else 0.0
+            if self._hooks: self._call_before_request(method, url, attempt, throttle_wait, kwargs)
+
+            start = time.perf_counter()
+            try:
+                responce = await self._session.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                elapsed = time.perf_counter() - start
+                self._count_request()
+                # Error of connect means that request did not reach server
+                is_sent = not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                is_retry = is_retry_allowed(self._retry_policy, method, attempt, is_sent=is_sent)
+                delay = get_retry_delay(self._retry_policy, attempt) if is_retry else None
+                if self._hooks: self._call_after_request(method, url, attempt, elapsed, kwargs, error=e, retry_delay=delay)
+                if not is_retry: raise
+                self._logger.warning(f"{method} | Error of connection -> {e!r} | Retry in {delay:.2f} sec, attempt -> {attempt}")
+            else:
+                elapsed = time.perf_counter() - start
+                self._count_request()
+                is_retry = is_retry_allowed(self._retry_policy, method, attempt, status_code=responce.status_code)
+                delay = get_retry_delay(self._retry_policy, attempt, retry_after=responce.headers.get("Retry-After")) if is_retry else None
+                if self._hooks: self._call_after_request(method, url, attempt, elapsed, kwargs, responce=responce, retry_delay=delay)
+                if not is_retry: return responce
+                self._logger.warning(f"{method} | Code -> {responce.status_code} | Retry in {delay:.2f} sec, attempt -> {attempt}")
+
+            await asyncio.sleep(delay)
+
+    # CHECKER
+
+    async def check_auth(self) -> bool:
+        """ Check auth to amocrm api. If token does not work, get new token using refresh token or init code.
+
+        Returns:
+            bool: Is auth work.
+        """
+        if self.refresh_token and self._token_manager.is_expired(): return await self.refresh_tokens()
+
+        url = f"{self._base_url}/api/v4/account"
+        responce = await self.__send_request_with_retry("GET", url)
+        isSuccess, err_msg, code = self._check_responce_status_code(responce)
+
+        if isSuccess:
+            self._is_need_update_token = False
+            return True
+
+        body = RequestAuth(
+            client_id=self.connect_id,
+            client_secret=self.connect_secret_key,
+            redirect_uri=self.redirect_uri
+        )
+
+        if not self.refresh_token and not self.access_token:
+            body.grant_type = AsyncAmoCRM.TYPE_AUTH.AUTHORIZATION_CODE
+            body.code = self.init_code
+        elif code == 401:
+            body.grant_type = AsyncAmoCRM.TYPE_AUTH.REFRESH_CODE
+            body.refresh_token = self.refresh_token
+        else:
+            self._logger.error(f"Auth check failed! status_check -> {(isSuccess, err_msg, code)}")
+            return False
+
+        answer = await self.oauth2(self.AUTH_METHODS.ACEESS_TOKEN, body=body)
+        if isinstance(answer, ResponceAuthNotValid):
+            self._is_need_update_token = True
+            self._logger.error(f'Token has not been received! Responce message - "{answer.detail}" | Excaption code - "{answer.status}"')
+            return False
+
+        self._set_tokens(answer)
+        self._is_need_update_token = False
+        return True
+
+    async def refresh_tokens(self, failed_access_token: Optional[str] = None) -> bool:
+        " Get new tokens using refresh token. Only one task refreshes tokens at the same time. See AmoCRM.refresh_tokens. "
+        if self._refresh_lock is None: self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            if failed_access_token is not None and self.access_token != failed_access_token: return True
+
+            body = RequestAuth(
+                client_id=self.connect_id,
+                client_secret=self.connect_secret_key,
+                grant_type=AsyncAmoCRM.TYPE_AUTH.REFRESH_CODE,
+                refresh_token=self.refresh_token,
+                redirect_uri=self.redirect_uri
+            )
+            answer = await self.oauth2(self.AUTH_METHODS.ACEESS_TOKEN, body=body)
+            if isinstance(answer, ResponceAuthNotValid):
+                self._is_need_update_token = True
+                self._logger.error(f'Token has not been refreshed! Responce message - "{answer.detail}" | Excaption code - "{answer.status}"')
+                return False
+
+            self._logger.info("Responce new token using refresh token!")
+            self._set_tokens(answer)
+            self._is_need_update_token = False
+            return True
+
+    # AUTH
+
+    async def oauth2(self, action: AsyncAmoCRM.AUTH_METHODS, body: RequestAuth=None) -> Union[ResponceAuthValid, ResponceAuthNotValid]:
+        " Get new token use oauth2 method. See AmoCRM.oauth2. "
+
+        url = f"{self._base_url}/oauth2/{action}"
+        request = self._session.build_request("POST", url, content=body.json(), headers={ "Content-Type" : "application/json" })
+        # Bearer header of client is not needed for auth request
+        request.headers.pop("Authorization", None)
+
+        throttle_wait = await self._rate_limiter.acquire_async() if self._rate_limiter else 0.0
+        if self._hooks: self._call_before_request("POST", url, 1, throttle_wait, {"content": request.content})
+        start = time.perf_counter()
+        responce = await self._session.send(request)
+        elapsed = time.perf_counter() - start
+        self._count_request()
+        if self._hooks: self._call_after_request("POST", url, 1, elapsed, {"content": request.content}, responce=responce)
+
+        try: data = ResponceAuthValid(**responce.json())
+        except ValidationError: data = ResponceAuthNotValid(**responce.json())
+
+        return data
+
+    # GET
+
+    async def get(self, action: AsyncAmoCRM.ACTION, filters: str='', version_api: str='v4', *args, **kwargs) -> AmoCRMFuncResponce:
+        " Get data from action url on dict format. See AmoCRM.get. "
+
+        url = kwargs.get('url', None)
+        if not url: url = self.get_url(action, filters, version_api)
+        if self._debug: self._logger.info(f"Send url -> {url}")
+
+        responce = await self._send_get_request(url)
+
+        isAllowed, message, _ = self._check_responce_status_code(responce)
+
+        if not isAllowed: return AmoCRMFuncResponce(status=False, detail=message, data=None)
+
+        data = self._parse_responce_get(responce, validate=kwargs.get('validate'))
+
+        return AmoCRMFuncResponce(status=True, data=data)
+
+    async def iter_get_responces(self, action: AsyncAmoCRM.ACTION, filters: str='', version_api: str='v4', get_all_data: bool=True,
+                                 *args, **kwargs) -> AsyncIterator[AmoCRMFuncResponce]:
+        " Iterate over responces of 'get' function, pages are requested one by one by link. See AmoCRM.iter_get_responces. "
+        while True:
+            get_responce = await self.get(action=action, filters=filters, version_api=version_api, *args, **kwargs)
+            if get_responce.status and not isinstance(get_responce.data, AmoResponceGet):
+                get_responce = AmoCRMFuncResponce(status=False, detail='Type data is not AmoResponceGet!', data=None)
+
+            yield get_responce
+
+            if not get_responce.status or not get_all_data or not get_responce.data.links.next: return
+            kwargs['url'] = str(get_responce.data.links.next.href)
+
+    async def iter_pages(self, action: AsyncAmoCRM.ACTION, filters: str='', version_api: str='v4', *args, **kwargs) -> AsyncIterator[AmoResponceGet]:
+        " Iterate over all pages from action url, only one page is kept in memory. See AmoCRM.iter_pages. "
+        async for get_responce in self.iter_get_responces(action, filters=filters, version_api=version_api, *args, **kwargs):
+            if not get_responce.status: return
+            yield get_responce.data
+
+    async def iter_entities(self, action: AsyncAmoCRM.ACTION, filters: str='', version_api: str='v4', *args, **kwargs) -> AsyncIterator[Union[Leads, Contacts]]:
+        " Iterate over all entities (Leads or Contacts) from action url. See AmoCRM.iter_entities. "
+        async for page in self.iter_pages(action, filters=filters, version_api=version_api, *args, **kwargs):
+            for entity in get_embedded_items(page.embedded): yield entity
+
+    async def get_pages(self, action: AsyncAmoCRM.ACTION, filters: str='', version_api: str='v4', get_all_data: bool=False,
+                        max_concurrency: int=5, *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Get pages from action url. With 'get_all_data' pages after first are requested by number concurrently,
+        no more than {max_concurrency} requests at the same time.
+
+        Args:
+            action (AsyncAmoCRM.ACTION): Action AmoCRM.
+            filters (str, optional): Filters of request. Defaults to ''.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            get_all_data (bool, optional): Get all pages from first to last. Defaults to False.
+            max_concurrency (int, optional): Max count of requests at the same time. Defaults to 5.
+
+        Returns:
+            AmoCRMFuncResponce: data is list[AmoResponceGet] ordered by page.
+        """
+        first_responce = await self.get(action=action, filters=filters, version_api=version_api, *args, **kwargs)
+        if not first_responce.status: return AmoCRMFuncResponce(status=False, detail=first_responce.detail, data=[])
+
+        pages: list[AmoResponceGet] = [first_responce.data]
+        if not get_all_data or not first_responce.data.links.next: return AmoCRMFuncResponce(status=True, data=pages)
+
+        url = str(first_responce.data.links.self.href)
+        next_page = first_responce.data.page + 1
+
+        while True:
+            # Requests are sent by waves with size {max_concurrency}, wave ends when page is empty or last
+            numbers = range(next_page, next_page + max_concurrency)
+            responces = await asyncio.gather(*(self.get_page(set_url_page(url, number), kwargs.get('validate')) for number in numbers))
+
+            for code, page in responces:
+                if code == 204: return AmoCRMFuncResponce(status=True, data=pages)
+                if page is None: return AmoCRMFuncResponce(status=False, detail=f'Incorrect request! code -> {code}', data=pages)
+
+                pages.append(page)
+                if not page.links.next: return AmoCRMFuncResponce(status=True, data=pages)
+
+            next_page += max_concurrency
+
+    async def get_page(self, url: str, validate: Optional[bool] = None, use_cache: bool = True) -> Tuple[int, Optional[AmoResponceGet]]:
+        " Get one page by url. Return code responce and page, page is None if request is not success. See AmoCRM.get_page. "
+        if self._debug: self._logger.info(f"Send url -> {url}")
+        responce = await self._send_get_request(url, use_cache=use_cache)
+
+        # Empty page (204) is normal end of pagination, it is not printed
+        isAllowed, _, code = self._check_responce_status_code(responce, is_print_info=responce.status_code != 204)
+        if not isAllowed: return code, None
+
+        return code, self._parse_responce_get(responce, validate)
+
+    async def _send_get_request(self, url: str, use_cache: bool = True) -> httpx.Response:
+        " Send GET request through cache, if it is set. See AmoCRM._send_get_request. "
+        if self._cache is None or not use_cache: return await self._send_request("GET", url)
+
+        entry, is_fresh = self._cache.lookup(url)
+        if is_fresh: return self._create_cached_responce(entry)
+
+        headers = self._cache.get_conditional_headers(entry)
+        responce = await self._send_request("GET", url, headers=headers) if headers else await self._send_request("GET", url)
+
+        if responce.status_code == 304 and entry is not None: return self._create_cached_responce(self._cache.revalidate(entry))
+        if responce.status_code == 200: self._cache.store(url, responce.content, responce.headers)
+        else: self._cache.miss()
+        return responce
+
+    def _create_cached_responce(self, entry: CacheEntry) -> httpx.Response:
+        " Create responce from cache entry. "
+        return httpx.Response(200, content=entry.content, headers={"Content-Type": "application/hal+json"},
+                              request=httpx.Request("GET", entry.url))
+
+    async def _get_pages_by_link(self, url: str, validate: Optional[bool] = None) -> Tuple[Optional[str], list[AmoResponceGet]]:
+        " Get all pages from {url} by link. See AmoCRM._get_pages_by_link. "
+        pages = []
+        while url:
+            code, page = await self.get_page(url, validate)
+            if page is None: return (None if code == 204 else f"Incorrect request! code -> {code}"), pages
+            pages.append(page)
+            url = str(page.links.next.href) if page.links.next else None
+        return None, pages
+
+    async def get_by_ids(self, action: AsyncAmoCRM.ACTION, ids: list[int], version_api: str='v4', max_concurrency: int=5, as_df: bool=False,
+                         compact: bool=False, max_url_length: int=2000, validate: Optional[bool]=None) -> AmoCRMFuncResponce:
+        """ Get entities by ids. See AmoCRM.get_by_ids.
+        Chunks of ids are requested concurrently, no more than {max_concurrency} at the same time.
+        """
+        ids = list(dict.fromkeys(int(id) for id in ids))
+        url = self.get_url(action, version_api=version_api)
+        # Place for '&page=N', if entities are on several pages
+        filters = FilterAmoCRM.create_id_filters(ids, max_length=max_url_length - len(url) - len('&page=100'),
+                                                 quoted='%5B' in self._prepare_url(f"{url}{FilterAmoCRM.TYPE.ID.value}=1"))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def get_chunk(filter_: str) -> Tuple[Optional[str], list[AmoResponceGet]]:
+            async with semaphore: return await self._get_pages_by_link(url + filter_, validate)
+
+        chunks = list(await asyncio.gather(*(get_chunk(filter_) for filter_ in filters)))
+        return self._create_by_ids_responce(action, ids, chunks, as_df=as_df, compact=compact)
+
+    async def get_data_df(self, action: AsyncAmoCRM.ACTION, filters: str='', version_api: str='v4', wide_custom_fields: bool=False,
+                          with_contacts: bool=False, *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Get data from action url on Dataframe format. See AmoCRM.get_data_df.
+        With 'get_all_data' pages are requested concurrently, limit is set by 'max_concurrency' (default 5).
+        """
+        from pandas import DataFrame, concat
+
+        if with_contacts:
+            if action != AsyncAmoCRM.ACTION.LEADS: return AmoCRMFuncResponce(status=False, detail="Contacts are expanded only for leads!", data=DataFrame())
+            filters = add_filter_with(filters, 'contacts')
+
+        pages_responce = await self.get_pages(action, filters=filters, version_api=version_api, *args, **kwargs)
+
+        if not pages_responce.status and not pages_responce.data:
+            return AmoCRMFuncResponce(status=False, detail=pages_responce.detail, data=DataFrame())
+
+        with self._measure_stage('dataframe', action):
+            frames = [self.parse_data_and_create_df(page, all_custom_fields=wide_custom_fields) for page in pages_responce.data]
+            frames = [frame for frame in frames if isinstance(frame, DataFrame)]
+            data_df = concat(frames, ignore_index=True) if frames else DataFrame()
+        if wide_custom_fields:
+            schema = (await self.get_custom_fields(action, version_api=version_api)).data
+            with self._measure_stage('dataframe', action): data_df = self.add_custom_fields_columns(data_df, schema)
+
+        if with_contacts and pages_responce.status:
+            from amocrm.v4.amoCRM_df import join_lead_contacts
+
+            lead_contacts = [item for page in pages_responce.data for item in get_lead_contacts(get_embedded_items(page.embedded))]
+            contacts_responce = await self.get_by_ids(AsyncAmoCRM.ACTION.CONTACTS, [contact_id for _, contact_id, _ in lead_contacts],
+                                                      version_api=version_api, max_concurrency=kwargs.get('max_concurrency', 5), as_df=True,
+                                                      validate=kwargs.get('validate'))
+            with self._measure_stage('dataframe', action): data_df = join_lead_contacts(data_df, lead_contacts, contacts_responce.data)
+            return AmoCRMFuncResponce(status=contacts_responce.status, detail=contacts_responce.detail, data=data_df,
+                                      errors=contacts_responce.errors)
+
+        return AmoCRMFuncResponce(status=pages_responce.status, detail=pages_responce.detail, data=data_df)
+
+    async def get_custom_fields(self, action: AsyncAmoCRM.ACTION, version_api: str='v4', refresh: bool=False) -> AmoCRMFuncResponce:
+        """ Get schema of custom fields of action (all pages). See AmoCRM.get_custom_fields. """
+        cached = self._custom_fields_schema.get(action)
+        if cached is not None and not refresh and time.time() < cached[0]: return AmoCRMFuncResponce(status=True, data=cached[1])
+
+        fields: list[CustomFieldSchema] = []
+        url = f"{self._base_url}/api/{version_api}/{action}/custom_fields?limit=250"
+
+        while url:
+            responce = await self._send_get_request(url)
+            isAllowed, message, code = self._check_responce_status_code(responce, is_print_info=responce.status_code != 204)
+            if code == 204: break
+            if not isAllowed: return AmoCRMFuncResponce(status=False, detail=message, data=None)
+
+            page = AmoResponceCustomFields.parse_obj(responce.json())
+            fields.extend(page.embedded.custom_fields)
+            url = str(page.links.next.href) if page.links.next else None
+
+        self._custom_fields_schema[action] = (time.time() + self._custom_fields_ttl, fields)
+        return AmoCRMFuncResponce(status=True, data=fields)
+
+    async def get_data(self, action: AsyncAmoCRM.ACTION, filters: str='', version_api: str='v4', compact: bool=False,
+                       with_contacts: bool=False, *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Get only data from action url on list format. See AmoCRM.get_data.
+        With 'get_all_data' pages are requested concurrently, limit is set by 'max_concurrency' (default 5).
+        With 'compact' entities are returned as compact records (LeadRecord, ContactRecord).
+        """
+        if with_contacts:
+            if action != AsyncAmoCRM.ACTION.LEADS: return AmoCRMFuncResponce(status=False, detail="Contacts are expanded only for leads!", data=None)
+            filters = add_filter_with(filters, 'contacts')
+
+        pages_responce = await self.get_pages(action, filters=filters, version_api=version_api, *args, **kwargs)
+
+        if not pages_responce.status and not pages_responce.data:
+            return AmoCRMFuncResponce(status=False, detail=pages_responce.detail, data=None)
+
+        data = []
+        err_msg = pages_responce.detail if not pages_responce.status else ""
+        lead_contacts: list[Tuple[int, int, Optional[bool]]] = []
+
+        factory = RecordFactory() if compact else None
+
+        for page in pages_responce.data:
+            if isinstance(page.embedded, DataContacts): entities = page.embedded.contacts
+            elif isinstance(page.embedded, DataLeads): entities = page.embedded.leads
+            else:
+                err_msg = "Data is not allow! Access type = [Contacts, Leads]"
+                continue
+
+            if with_contacts: lead_contacts.extend(get_lead_contacts(entities))
+            data.extend(map(factory.create, entities) if factory else entities)
+
+        if with_contacts and pages_responce.status:
+            contacts_responce = await self.get_by_ids(AsyncAmoCRM.ACTION.CONTACTS, [contact_id for _, contact_id, _ in lead_contacts],
+                                                      version_api=version_api, max_concurrency=kwargs.get('max_concurrency', 5), compact=compact,
+                                                      validate=kwargs.get('validate'))
+            data = AmoLeadsContacts.construct(leads=data, contacts=contacts_responce.data, lead_contacts=lead_contacts)
+            return AmoCRMFuncResponce(status=contacts_responce.status, detail=contacts_responce.detail, data=data, errors=contacts_responce.errors)
+
+        return AmoCRMFuncResponce(status=pages_responce.status, detail=err_msg, data=data)
+
+    # POST
+
+    async def post(self, action: AsyncAmoCRM.ACTION, data: list[Union[AmoRequestPostLeads, AmoRequestPostContact]], version_api: str='v4',
+            max_count: int=50, max_workers: int=1, *args, **kwargs) -> AmoCRMFuncResponce:
+        " Post data to amocrm. See AmoCRM.post. "
+
+        url = kwargs.get('url', None)
+        if not url: url = f"{self._base_url}/api/{version_api}/{action}"
+
+        if data == []:  return AmoCRMFuncResponce(status=False, detail='Data is empty!', data=None)
+        if self._debug: return AmoCRMFuncResponce(status=False, detail='AMOCRM | Debug mode is On!', data=None)
+
+        data = [dump_model(item) for item in data]
+        # request_id links items of responce with items of data
+        for index, item in enumerate(data):
+            if not item.get('request_id'): item['request_id'] = str(index)
+
+        if action == AsyncAmoCRM.ACTION.LEADS_COMPLEX: send_datas, responce_model = list(batch(data, max_count)), AmoResponcePostComplex
+        else: send_datas, responce_model = [data], AmoResponcePost
+        batches = await self._send_batches("POST", url, send_datas, responce_model, AmoResponcePostError, max_workers=max_workers)
+
+        if self._cache is not None: self._cache.invalidate(action)
+
+        return self._create_batches_func_responce(batches)
+
+    async def _send_batches(self, method: str, url: str, send_datas: list[list[dict]], responce_model: type[BaseModel],
+                            error_model: type[BaseModel], max_workers: int=1) -> list[AmoResponceBatch]:
+        " Send batches of data, no more than {max_workers} at the same time. See AmoCRM._send_batches. "
+        if self._debug: self._logger.info(f"{method} | Send url -> {url} | Count batches -> {len(send_datas)}")
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def send_batch(index: int) -> AmoResponceBatch:
+            async with semaphore:
+                try:
+                    body = dumps(send_datas[index])
+                    responce = await self._send_request(method, url, content=body, headers={ "Content-Type": "application/json" })
+                except httpx.HTTPError as e:
+                    return self._create_batch_result(index, send_datas[index], None, responce_model, error_model,
+                                                     detail=f"Error of connection -> {e!r}")
+            return self._create_batch_result(index, send_datas[index], responce, responce_model, error_model)
+
+        return list(await asyncio.gather(*(send_batch(index) for index in range(len(send_datas)))))
+
+    # PATCH
+
+    async def patch(self, action: AsyncAmoCRM.ACTION, data: list[Union[AmoRequestPatchLeads, AmoRequestPatchContact]], version_api: str='v4',
+            max_count: int=250, max_workers: int=1, *args, **kwargs) -> AmoCRMFuncResponce:
+        " Patch data to amocrm. See AmoCRM.patch. "
+
+        url = kwargs.get('url', None)
+        if not url: url = f"{self._base_url}/api/{version_api}/{action}"
+
+        if data == []:  return AmoCRMFuncResponce(status=False, detail='Data is empty!', data=None)
+        if self._debug: return AmoCRMFuncResponce(status=False, detail='AMOCRM | Debug mode is On!', data=None)
+
+        data = [dump_model(item) for item in data]
+
+        batches = await self._send_batches("PATCH", url, list(batch(data, max_count)), AmoResponcePatch, AmoResponcePatchError,
+                                           max_workers=max_workers)
+
+        if self._cache is not None: self._cache.invalidate(action)
+
+        return self._merge_patch_batches(batches)
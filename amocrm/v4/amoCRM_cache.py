@@ -0,0 +1,243 @@
+" File with cache of GET responces for AmoCRM connector "
+
+from __future__ import annotations
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+from amocrm.v4.models.amoCRM_M import CacheEntry, CacheStatistic
+
+import abc
+import time
+import sqlite3
+import threading
+
+from collections import OrderedDict
+
+
+# Actions, which change entities of several actions. Ex: POST to leads/complex creates leads, contacts and companies
+RELATED_ACTIONS: dict[str, tuple[str, ...]] = {
+    'leads/complex': ('leads', 'contacts', 'companies'),
+}
+
+
+def get_cache_action(url: str) -> str:
+    """ Get first part of action from url, entries of this action are invalidated together.
+    Ex: 'https://example.amocrm.ru/api/v4/leads/complex' -> 'leads'
+    """
+    parts = urlsplit(url).path.strip('/').split('/')
+    # Path: api/{version_api}/{action}
+    return parts[2] if len(parts) > 2 and parts[0] == 'api' else '/'.join(parts)
+
+
+class CacheBackend(abc.ABC):
+    " Storage of cache entries. Backend must be thread safe. "
+
+    @abc.abstractmethod
+    def get(self, url: str) -> Optional[CacheEntry]:
+        ...
+
+    @abc.abstractmethod
+    def set(self, entry: CacheEntry) -> None:
+        ...
+
+    @abc.abstractmethod
+    def delete_action(self, action: str) -> int:
+        " Delete entries of action. Return count of deleted entries. "
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """ In-memory LRU cache. If count of entries is more than {max_size}, least recently used entry is removed.
+
+        Usage:
+        >>> cache = ResponceCache(MemoryCacheBackend(max_size=1024), ttl=60)
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None: self._entries.move_to_end(url)
+            return entry
+
+    def set(self, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[entry.url] = entry
+            self._entries.move_to_end(entry.url)
+            while len(self._entries) > self.max_size: self._entries.popitem(last=False)
+
+    def delete_action(self, action: str) -> int:
+        with self._lock:
+            urls = [url for url, entry in self._entries.items() if entry.action == action]
+            for url in urls: del self._entries[url]
+            return len(urls)
+
+    def clear(self) -> None:
+        with self._lock: self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend(CacheBackend):
+    """ On-disk cache in SQLite file, entries are kept after restart. If count of entries is more than {max_size},
+    least recently used entries are removed.
+
+        Usage:
+        >>> cache = ResponceCache(DiskCacheBackend("amocrm_cache.db"), ttl=600)
+    """
+
+    def __init__(self, path_to_file: str = "amocrm_cache.db", max_size: int = 100000):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path_to_file, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS cache (
+                url TEXT PRIMARY KEY, action TEXT NOT NULL, content BLOB NOT NULL, etag TEXT, last_modified TEXT,
+                stored_at REAL NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS cache_action ON cache (action);
+            CREATE INDEX IF NOT EXISTS cache_used_at ON cache (used_at);
+        """)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT url, action, content, etag, last_modified, stored_at, expires_at FROM cache WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None: return None
+            self._connection.execute("UPDATE cache SET used_at = ? WHERE url = ?", (time.time(), url))
+        return CacheEntry(url=row[0], action=row[1], content=row[2], etag=row[3], last_modified=row[4], stored_at=row[5], expires_at=row[6])
+
+    def set(self, entry: CacheEntry) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.url, entry.action, entry.content, entry.etag, entry.last_modified, entry.stored_at, entry.expires_at, time.time())
+            )
+            self._connection.execute(
+                "DELETE FROM cache WHERE url IN (SELECT url FROM cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (self.max_size,)
+            )
+
+    def delete_action(self, action: str) -> int:
+        with self._lock, self._connection:
+            return self._connection.execute("DELETE FROM cache WHERE action = ?", (action,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._connection: self._connection.execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        with self._lock: return self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class ResponceCache:
+    """ Cache of success GET responces by url. Fresh responce (younger than TTL of action) is returned without request.
+    Stale responce is revalidated by server with If-None-Match (if server sent ETag) or If-Modified-Since
+    (if server sent Last-Modified), on 304 it is returned from cache. Entries of action are invalidated after POST and PATCH.
+
+        Usage:
+        >>> cache = ResponceCache(MemoryCacheBackend(), ttl=30, ttls={AmoCRM.ACTION.LEADS_CUSTOM_FIELDS: 3600})
+        >>> amocrm = AmoCRM(settings, cache=cache)
+        >>> amocrm.get(AmoCRM.ACTION.LEADS) # Request
+        >>> amocrm.get(AmoCRM.ACTION.LEADS) # From cache
+        >>> amocrm.get_cache_statistic()
+        CacheStatistic(count_hits=1, count_misses=1, count_revalidations=0, count_invalidations=0, size=1)
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: float = 60.0, ttls: Optional[dict[str, float]] = None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.ttls = ttls or {}
+
+        self._lock = threading.Lock()
+        self._count_hits = 0
+        self._count_misses = 0
+        self._count_revalidations = 0
+        self._count_invalidations = 0
+
+    def __str__(self):
+        return f"ResponceCache(backend={type(self.backend).__name__}, ttl={self.ttl}, ttls={self.ttls})"
+
+    def get_ttl(self, url: str) -> float:
+        " Get TTL of url: TTL of full action (Ex: leads/custom_fields), then TTL of first part of action (Ex: leads), then default. "
+        parts = urlsplit(url).path.strip('/').split('/')
+        action = '/'.join(parts[2:]) if len(parts) > 2 and parts[0] == 'api' else '/'.join(parts)
+        if action in self.ttls: return self.ttls[action]
+        return self.ttls.get(get_cache_action(url), self.ttl)
+
+    def lookup(self, url: str) -> Tuple[Optional[CacheEntry], bool]:
+        """ Find responce of url.
+
+        Returns:
+            Tuple[Optional[CacheEntry], bool]: Entry (None if it is not found) and is entry fresh.
+        """
+        entry = self.backend.get(url)
+        is_fresh = entry is not None and time.time() < entry.expires_at
+        with self._lock:
+            if is_fresh: self._count_hits += 1
+        return entry, is_fresh
+
+    def get_conditional_headers(self, entry: Optional[CacheEntry]) -> dict[str, str]:
+        " Headers for revalidation of stale entry. Empty if entry can't be revalidated. "
+        if entry is None: return {}
+        if entry.etag: return {"If-None-Match": entry.etag}
+        if entry.last_modified: return {"If-Modified-Since": entry.last_modified}
+        return {}
+
+    def store(self, url: str, content: bytes, headers: dict[str, str]) -> CacheEntry:
+        " Save success responce from network. "
+        now = time.time()
+        entry = CacheEntry(url=url, action=get_cache_action(url), content=content, etag=headers.get("ETag"),
+                           last_modified=headers.get("Last-Modified"), stored_at=now, expires_at=now + self.get_ttl(url))
+        self.backend.set(entry)
+        with self._lock: self._count_misses += 1
+        return entry
+
+    def miss(self) -> None:
+        " Count responce from network, which is not saved. "
+        with self._lock: self._count_misses += 1
+
+    def revalidate(self, entry: CacheEntry) -> CacheEntry:
+        " Entry is confirmed by server (304), it is fresh again. "
+        entry = entry.copy(update={'expires_at': time.time() + self.get_ttl(entry.url)})
+        self.backend.set(entry)
+        with self._lock:
+            self._count_hits += 1
+            self._count_revalidations += 1
+        return entry
+
+    def invalidate(self, action: str) -> int:
+        """ Remove entries of action. Entries are removed by first part of action and by related actions (RELATED_ACTIONS).
+        Ex: after POST to leads/complex all entries of leads, contacts and companies are removed.
+
+        Returns:
+            int: Count of removed entries.
+        """
+        action = action.strip('/')
+        actions = RELATED_ACTIONS.get(action, (action.split('/')[0],))
+        count = sum(self.backend.delete_action(cache_action) for cache_action in actions)
+        with self._lock: self._count_invalidations += count
+        return count
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def get_statistic(self) -> CacheStatistic:
+        " Get statistic of cache. "
+        with self._lock:
+            return CacheStatistic(count_hits=self._count_hits, count_misses=self._count_misses, count_revalidations=self._count_revalidations,
+                                  count_invalidations=self._count_invalidations, size=len(self.backend))
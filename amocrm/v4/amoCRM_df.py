@@ -0,0 +1,223 @@
+" File with creation of Dataframe from AmoCRM responce models. Module is imported on first use, pandas is optional "
+
+from __future__ import annotations
+from typing import Any, Optional, Tuple
+
+from amocrm.v4.models.amoCRM_M import AmoResponceGet, Contacts, CustomField, CustomFieldSchema, DataContacts, DataLeads, Leads
+
+import loguru
+
+from pandas import DataFrame, Series, concat, to_datetime, to_numeric
+
+
+# Columns of Dataframe in order. Nested fields 'links' and 'embedded' are replaced by flat columns
+LEADS_COLUMNS = ['id', 'name', 'price', 'responsible_user_id', 'group_id', 'status_id', 'pipeline_id', 'loss_reason_id',
+                 'created_by', 'updated_by', 'created_at', 'updated_at', 'closed_at', 'closest_task_at', 'is_deleted',
+                 'custom_fields_values', 'score', 'account_id', 'link', 'embedded_tags', 'embedded_companies', 'contact_id']
+
+CONTACTS_COLUMNS = ['id', 'name', 'first_name', 'last_name', 'responsible_user_id', 'group_id', 'created_by', 'updated_by',
+                    'created_at', 'updated_at', 'closest_task_at', 'is_deleted', 'custom_fields_values', 'account_id',
+                    'link', 'email', 'phone', 'embedded_tags', 'embedded_companies']
+
+
+# Types of custom fields for dtypes of wide columns
+NUMERIC_FIELD_TYPES = {'numeric', 'price', 'monetary'}
+DATE_FIELD_TYPES = {'date', 'date_time', 'birthday'}
+BOOL_FIELD_TYPES = {'checkbox'}
+# Values of checkbox are strings in models. Ex: 'True', '1'
+BOOL_VALUES = {'true': True, '1': True, 'false': False, '0': False, '': False}
+# Fields with several values, column has list of values
+MULTI_VALUE_FIELD_TYPES = {'multiselect', 'multitext', 'chained_list', 'items', 'category'}
+
+
+def _field_to_dict(field: CustomField) -> dict[str, Any]:
+    " Convert custom field to dict, same as field.dict(). "
+    return {
+        'field_id': field.field_id, 'field_name': field.field_name, 'field_code': field.field_code, 'field_type': field.field_type,
+        'values': [{'enum_id': value.enum_id, 'enum_code': value.enum_code, 'value': value.value} for value in field.values]
+    }
+
+
+def create_df_on_leads(data: DataLeads) -> DataFrame:
+    """ Create new Dataframe from data leads (AmoCrmResponce models).
+    Columns are filled in one pass over leads, Dataframe is created from columns.
+    Return:
+        - Dataframe()
+    """
+    leads: list[Leads] = data.leads
+    if not leads: return DataFrame()
+
+    columns: dict[str, list] = {column: [] for column in LEADS_COLUMNS}
+    plain_columns = [(column, columns[column].append) for column in LEADS_COLUMNS[:15] + ['score', 'account_id']]
+    custom_fields_values, link = columns['custom_fields_values'].append, columns['link'].append
+    embedded_tags, embedded_companies, contact_id = (columns['embedded_tags'].append, columns['embedded_companies'].append,
+                                                     columns['contact_id'].append)
+    has_contacts = False
+
+    for lead in leads:
+        values = lead.__dict__
+        for column, append in plain_columns: append(values[column])
+
+        if lead.custom_fields_values is None: custom_fields_values(None)
+        else:
+            fields_list = [_field_to_dict(field) for field in lead.custom_fields_values]
+            # Empty enum_id of first value is saved as None
+            for field in fields_list:
+                if not field['values'][0]['enum_id']: field['values'][0]['enum_id'] = None
+            custom_fields_values(fields_list)
+
+        link(str(lead.links.self.href))
+        embedded_tags([{'id': tag.id, 'name': tag.name} for tag in lead.embedded.tags])
+        embedded_companies([{'id': company.id, 'link': str(company.links.self.href)} for company in lead.embedded.companies])
+
+        if lead.embedded.contacts:
+            has_contacts = True
+            contact_id(lead.embedded.contacts[0].id)
+        else: contact_id(None)
+
+    # Column 'contact_id' is created only if some lead has contacts
+    if not has_contacts: del columns['contact_id']
+
+    return DataFrame(data=columns)
+
+
+def create_df_on_contacts(data: DataContacts, all_custom_fields: bool = False) -> DataFrame:
+    """ Create new Dataframe from data contacts (AmoCrmResponce models).
+    Columns are filled in one pass over contacts, Dataframe is created from columns.
+    First values of fields PHONE and EMAIL are in columns 'phone' and 'email', these fields are removed from
+    'custom_fields_values', if not {all_custom_fields} (wide columns cf_PHONE, cf_EMAIL are created from all fields).
+    Return:
+        - Dataframe()
+    """
+    contacts: list[Contacts] = data.contacts
+    if not contacts: return DataFrame()
+
+    columns: dict[str, list] = {column: [] for column in CONTACTS_COLUMNS}
+    plain_columns = [(column, columns[column].append) for column in CONTACTS_COLUMNS[:12] + ['account_id']]
+    custom_fields_values, link, email, phone = (columns['custom_fields_values'].append, columns['link'].append,
+                                                columns['email'].append, columns['phone'].append)
+    embedded_tags, embedded_companies = columns['embedded_tags'].append, columns['embedded_companies'].append
+
+    for contact in contacts:
+        values = contact.__dict__
+        for column, append in plain_columns: append(values[column])
+
+        contact_email = None
+        contact_phone = None
+        fields_list = []
+
+        if contact.custom_fields_values is None: fields_list.append({'values': []})
+        else:
+            for field in contact.custom_fields_values:
+                if field.field_code == 'EMAIL': contact_email = field.values[0].value
+                elif field.field_code == 'PHONE': contact_phone = field.values[0].value
+                if all_custom_fields or field.field_code not in ('EMAIL', 'PHONE'): fields_list.append(_field_to_dict(field))
+
+        custom_fields_values(fields_list)
+        link(str(contact.links.self.href))
+        email(contact_email)
+        phone(contact_phone)
+        embedded_tags([{'id': tag.id, 'name': tag.name} for tag in contact.embedded.tags])
+        embedded_companies([{'id': company.id, 'link': str(company.links.self.href)} for company in contact.embedded.companies])
+
+    return DataFrame(data=columns)
+
+
+def create_custom_fields_df(custom_fields_values: Series, schema: Optional[list[CustomFieldSchema]] = None,
+                            prefix: str = 'cf_') -> DataFrame:
+    """ Create wide Dataframe from column 'custom_fields_values', one column per custom field.
+    Name of column is {prefix} + code of field (if it is set) or id of field. Ex: cf_PHONE, cf_1245.
+
+    Columns have dtypes by type of field: numeric -> float, date -> datetime (UTC), checkbox -> boolean,
+    other -> string. Multi-value fields (multiselect, multitext, or field with several values in some row)
+    have list of values. Fields of {schema} are added even if they have no values, in order of schema.
+
+    Args:
+        custom_fields_values (Series): Column 'custom_fields_values' of Dataframe of leads or contacts.
+        schema (Optional[list[CustomFieldSchema]], optional): Schema of custom fields. If None, types are got from data.
+        prefix (str, optional): Prefix of names of columns. Defaults to 'cf_'.
+
+    Returns:
+        DataFrame: Wide columns with same index as {custom_fields_values}.
+    """
+    # Long format in one pass over nested values: one row per field of entity -> (row, field_id, values, first value)
+    rows, field_ids, values, first_values, data_info = [], [], [], [], {}
+    for row, fields in enumerate(custom_fields_values):
+        if not isinstance(fields, list): continue
+        for field in fields:
+            field_id = field.get('field_id')
+            if field_id is None: continue
+            rows.append(row)
+            field_ids.append(field_id)
+            field_values = [value['value'] for value in field['values']]
+            values.append(field_values)
+            first_values.append(field_values[0] if field_values else None)
+            if field_id not in data_info: data_info[field_id] = (field['field_code'], field['field_type'])
+
+    info = {field.id: (field.code, field.type) for field in schema or []}
+    for field_id, field_info in data_info.items(): info.setdefault(field_id, field_info)
+
+    multi_ids = {field_id for field_id, (_, field_type) in info.items() if field_type in MULTI_VALUE_FIELD_TYPES}
+    multi_ids.update(field_id for field_id, field_values in zip(field_ids, values) if len(field_values) > 1)
+
+    # Single-value fields have first value, multi-value fields have list of values
+    fields = DataFrame({'row': rows, 'field_id': field_ids, 'values': values, 'value': first_values}, dtype=object)
+    fields = fields.drop_duplicates(['row', 'field_id'])
+    fields['value'] = fields['values'].where(fields['field_id'].isin(multi_ids), fields['value'])
+    wide = fields.pivot(index='row', columns='field_id', values='value').reindex(index=range(len(custom_fields_values)), columns=list(info))
+
+    columns = {}
+    for field_id, (field_code, field_type) in info.items():
+        column = wide[field_id].set_axis(custom_fields_values.index)
+        if field_id in multi_ids: columns[field_id] = column.astype(object)
+        elif field_type in NUMERIC_FIELD_TYPES: columns[field_id] = to_numeric(column, errors='coerce')
+        elif field_type in DATE_FIELD_TYPES: columns[field_id] = to_datetime(to_numeric(column, errors='coerce'), unit='s', utc=True)
+        elif field_type in BOOL_FIELD_TYPES: columns[field_id] = column.astype('string').str.lower().map(BOOL_VALUES).astype('boolean')
+        else: columns[field_id] = column.astype('string')
+
+    return DataFrame(
+        {f"{prefix}{field_code or field_id}": columns[field_id] for field_id, (field_code, _) in info.items()},
+        index=custom_fields_values.index
+    )
+
+
+def add_custom_fields_columns(data_df: DataFrame, schema: Optional[list[CustomFieldSchema]] = None, prefix: str = 'cf_') -> DataFrame:
+    " Add wide columns of custom fields to Dataframe of leads or contacts. See 'create_custom_fields_df'. "
+    if 'custom_fields_values' not in data_df.columns: return data_df
+    return concat([data_df, create_custom_fields_df(data_df['custom_fields_values'], schema, prefix=prefix)], axis=1)
+
+
+def join_lead_contacts(leads_df: DataFrame, lead_contacts: list[Tuple[int, int, Optional[bool]]], contacts_df: DataFrame,
+                       prefix: str = 'contact_') -> DataFrame:
+    """ Join contacts to Dataframe of leads: one row per lead and contact, in order of leads and contacts of lead
+    (see 'get_lead_contacts'). Lead without contacts has one row with empty columns of contact. Column 'contact_id'
+    of first contact is replaced, columns of contacts have prefix. Ex: contact_id, contact_is_main, contact_name, contact_phone
+    """
+    if leads_df.empty: return leads_df
+
+    lead_ids, contact_ids, is_main = (list(column) for column in zip(*lead_contacts)) if lead_contacts else ([], [], [])
+    links_df = DataFrame({'id': Series(lead_ids, dtype='int64'), f'{prefix}id': Series(contact_ids, dtype='int64'),
+                          f'{prefix}is_main': Series(is_main, dtype='boolean')})
+
+    data_df = leads_df.drop(columns=['contact_id'], errors='ignore').merge(links_df, on='id', how='left')
+    # Id of contact is float after join with leads without contacts
+    data_df[f'{prefix}id'] = data_df[f'{prefix}id'].astype('Int64')
+    if contacts_df.empty: return data_df
+    return data_df.merge(contacts_df.add_prefix(prefix).astype({f'{prefix}id': 'Int64'}), on=f'{prefix}id', how='left')
+
+
+def parse_data_and_create_df(data: AmoResponceGet, logger: loguru.Logger, all_custom_fields: bool = False) -> Optional[DataFrame]:
+    """ Parse data from get function and create df. With {all_custom_fields} fields PHONE and EMAIL of contacts
+    are kept in 'custom_fields_values' (see 'create_df_on_contacts').
+
+    ::Return::
+        ~ Dataframe | None
+    """
+
+    if isinstance(data.embedded, DataLeads):
+        return create_df_on_leads(data.embedded)
+    elif isinstance(data.embedded, DataContacts):
+        return create_df_on_contacts(data.embedded, all_custom_fields)
+
+    logger.error(f"Data is not allowed type. type -> {type(data.embedded)}")
+    return None
@@ -1,14 +1,14 @@
 """ Main class FilterAmoCRM work with filter from amocrm """
 
 from __future__ import annotations
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
 
 import enum
 import json
-import pytz
 import loguru
 
 from datetime import datetime, timedelta
+from urllib.parse import quote
 
 
 class FilterConst:
@@ -18,11 +18,15 @@ class FilterConst:
         
     class TYPE(enum.Enum):
         LIMIT = 'limit' # max limit = 250
-        ORDER = 'order' # Ex: order[update_at]=desc/asc
+        ORDER = 'order' # Ex: order[updated_at]=desc/asc
+        ORDER_UPDATE_AT = 'order[updated_at]' # = asc/desc
+        ORDER_CREATE_AT = 'order[created_at]' # = asc/desc
+        PAGE = 'page' # number of page, from 1
         CREATE_AT_FROM = 'filter[created_at][from]' # = timestamp value. Ex: 15314
         CREATE_AT_TO = 'filter[created_at][to]' # = timestamp value. Ex: 15314
-        UPDATE_AT_FROM = 'filter[update_at][from]' # = timestamp value. Ex: 15314
-        UPDATE_AT_TO = 'filter[update_at][to]' # = timestamp value. Ex: 15314
+        UPDATE_AT_FROM = 'filter[updated_at][from]' # = timestamp value. Ex: 15314
+        UPDATE_AT_TO = 'filter[updated_at][to]' # = timestamp value. Ex: 15314
+        ID = 'filter[id][]' # = id of entity, can be repeated. Ex: filter[id][]=1&filter[id][]=2
         
     class TABLE(enum.Enum):
         CONTACTS = 'contacts'
@@ -35,6 +39,8 @@ class FilterAmoCRM(FilterConst):
         self.type = type
         self.filters = {}
         
+        import pytz
+        
         self._pytz_timezone_str = pytz_timezone
         self._pytz_timezone = pytz.timezone(pytz_timezone)
         
@@ -87,6 +93,111 @@ class FilterAmoCRM(FilterConst):
         return True
 
 
+    @staticmethod
+    def create_update_at_filter(updated_from: int, updated_to: Optional[int] = None, limit: int = 250, page: int = 1) -> str:
+        """ Create filter of entities changed from {updated_from}, entities are ordered by 'updated_at' (asc).
+
+        Args:
+            updated_from (int): Timestamp, entities with 'updated_at' >= this value.
+            updated_to (Optional[int], optional): Timestamp, entities with 'updated_at' <= this value. Defaults to None.
+            limit (int, optional): Count of entities on page, max 250. Defaults to 250.
+            page (int, optional): Number of page. Defaults to 1.
+
+        Returns:
+            str: Filter for 'get' functions of AmoCRM. Ex: 'limit=250&filter[updated_at][from]=1623170867&order[updated_at]=asc&page=1'
+        """
+        filters = f"{FilterAmoCRM.TYPE.LIMIT.value}={limit}&{FilterAmoCRM.TYPE.UPDATE_AT_FROM.value}={updated_from}"
+        if updated_to is not None: filters += f"&{FilterAmoCRM.TYPE.UPDATE_AT_TO.value}={updated_to}"
+        return f"{filters}&{FilterAmoCRM.TYPE.ORDER_UPDATE_AT.value}=asc&{FilterAmoCRM.TYPE.PAGE.value}={page}"
+
+    @staticmethod
+    def split_range(datetime_from: int, datetime_to: int, count: int, points: Optional[Sequence[int]] = None) -> list[Tuple[int, int]]:
+        """ Split range [datetime_from, datetime_to] to {count} windows. Windows have no gaps and no overlaps:
+        next window starts from end of previous window + 1 (bounds of filters are included).
+
+        Args:
+            datetime_from (int): Timestamp of start of range.
+            datetime_to (int): Timestamp of end of range.
+            count (int): Count of windows.
+            points (Optional[Sequence[int]], optional): Sorted timestamps of sample of entities (Ex: found by probing).
+                If set, windows have equal count of points, else windows have equal length. Defaults to None.
+
+        Returns:
+            list[Tuple[int, int]]: Windows (from, to). Count of windows is less than {count}, if range is too short
+            or many points have equal timestamp. Ex: [(0, 99), (100, 199), (200, 300)]
+        """
+        if datetime_to < datetime_from: return []
+        count = max(1, count)
+
+        if points:
+            points = [point for point in points if datetime_from <= point <= datetime_to]
+            bounds = [points[len(points) * number // count] for number in range(1, count)] if points else []
+        else:
+            bounds = [datetime_from + (datetime_to - datetime_from + 1) * number // count for number in range(1, count)]
+
+        starts = sorted({datetime_from, *(bound for bound in bounds if datetime_from < bound <= datetime_to)})
+        return [(start, end - 1) for start, end in zip(starts, starts[1:])] + [(starts[-1], datetime_to)]
+
+    @staticmethod
+    def create_window_filter(window: Tuple[int, int], field: str = 'created_at', limit: int = 250) -> str:
+        """ Create filter of entities in window.
+
+        Args:
+            window (Tuple[int, int]): Window (from, to), bounds are included.
+            field (str, optional): Field of window: 'created_at' or 'updated_at'. Defaults to 'created_at'.
+            limit (int, optional): Count of entities on page, max 250. Defaults to 250.
+
+        Returns:
+            str: Filter for 'get' functions of AmoCRM. Ex: 'limit=250&filter[created_at][from]=1623170867&filter[created_at][to]=1623257266'
+        """
+        if field == 'created_at': type_from, type_to = FilterAmoCRM.TYPE.CREATE_AT_FROM, FilterAmoCRM.TYPE.CREATE_AT_TO
+        elif field == 'updated_at': type_from, type_to = FilterAmoCRM.TYPE.UPDATE_AT_FROM, FilterAmoCRM.TYPE.UPDATE_AT_TO
+        else: raise ValueError(f"Field of window '{field}' is not allowed! Allowed fields: created_at, updated_at")
+
+        return f"{FilterAmoCRM.TYPE.LIMIT.value}={limit}&{type_from.value}={window[0]}&{type_to.value}={window[1]}"
+
+    @staticmethod
+    def create_id_filters(ids: Sequence[int], limit: int = 250, max_length: int = 2000, quoted: bool = False) -> list[str]:
+        """ Pack ids to filters by 'filter[id][]'. Each filter has at most {limit} ids (all entities are on one page)
+        and is not longer than {max_length} chars (long url is rejected by server). Length is counted as filter is sent
+        by http client: brackets are sent as is (httpx) or percent-encoded (requests with urllib3 2: 'filter%5Bid%5D%5B%5D').
+
+        Args:
+            ids (Sequence[int]): Ids of entities.
+            limit (int, optional): Max count of ids in filter, max 250. Defaults to 250.
+            max_length (int, optional): Max length of filter. Defaults to 2000.
+            quoted (bool, optional): Http client percent-encodes brackets of query. Defaults to False.
+
+        Returns:
+            list[str]: Filters in order of ids. Ex: ['limit=2&filter[id][]=1&filter[id][]=2', 'limit=1&filter[id][]=3']
+        """
+        filters, chunk, length = [], [], 0
+        reserved = len(f"{FilterAmoCRM.TYPE.LIMIT.value}={limit}")
+        # Length of '&filter[id][]=' or '&filter%5Bid%5D%5B%5D=' without id
+        id_length = len(quote(FilterAmoCRM.TYPE.ID.value) if quoted else FilterAmoCRM.TYPE.ID.value) + 2
+
+        for id in ids:
+            part = f"&{FilterAmoCRM.TYPE.ID.value}={id}"
+            part_length = id_length + len(str(id))
+            if chunk and (len(chunk) >= limit or reserved + length + part_length > max_length):
+                filters.append(f"{FilterAmoCRM.TYPE.LIMIT.value}={len(chunk)}{''.join(chunk)}")
+                chunk, length = [], 0
+            chunk.append(part)
+            length += part_length
+
+        if chunk: filters.append(f"{FilterAmoCRM.TYPE.LIMIT.value}={len(chunk)}{''.join(chunk)}")
+        return filters
+
+    def get_shard_filters(self, table: FilterAmoCRM.TABLE, count: int, points: Optional[Sequence[int]] = None) -> list[str]:
+        """ Split range of filter of table by 'created_at' to {count} filters, pages of filters can be requested in parallel.
+        See 'split_range'.
+
+        Returns:
+            list[str]: Filters of windows. Ex: ['limit=250&filter[created_at][from]=...&filter[created_at][to]=...', ...]
+        """
+        datetime_from, datetime_to = self.get_datetime_for_filter(self.type, table)
+        return [self.create_window_filter(window) for window in self.split_range(datetime_from, datetime_to, count, points)]
+
     def get_filters(self) -> dict[str, str]:
         """get filters on dict format
 
@@ -0,0 +1,117 @@
+" File with rate limiter for AmoCRM connector "
+
+from __future__ import annotations
+from typing import Optional
+
+from amocrm.v4.models.amoCRM_M import RateLimiterStatistic
+
+import time
+import asyncio
+import threading
+
+
+class RateLimiter:
+    """ Token bucket rate limiter. Bucket holds up to {burst} tokens and is refilled with {rate} tokens per second,
+    each request takes one token. Limiter is thread safe and can be shared by several connectors of one account.
+
+        Usage:
+        >>> limiter = RateLimiter(rate=7, burst=7)
+        >>> limiter.acquire() # Sleep, if limit is exceeded
+        0.0
+        >>> limiter.get_statistic()
+        RateLimiterStatistic(count_requests=1, count_waits=0, wait_time=0.0, max_wait_time=0.0)
+    """
+
+    def __init__(self, rate: float = 7.0, burst: int = 7):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Rate must be > 0 and burst must be >= 1! rate -> {rate} | burst -> {burst}")
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._count_requests = 0
+        self._count_waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def __str__(self):
+        return f"RateLimiter(rate={self.rate}, burst={self.burst})"
+
+    def reserve(self) -> float:
+        """ Take one token from bucket. If bucket is empty, token is taken in debt.
+
+        Returns:
+            float: Time in seconds to wait before send request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+
+            wait_time = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+            self._count_requests += 1
+            if wait_time > 0:
+                self._count_waits += 1
+                self._wait_time += wait_time
+                self._max_wait_time = max(self._max_wait_time, wait_time)
+
+            return wait_time
+
+    def acquire(self) -> float:
+        """ Take one token from bucket, sleep if limit is exceeded.
+
+        Returns:
+            float: Time in seconds of waiting.
+        """
+        wait_time = self.reserve()
+        if wait_time > 0: time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self) -> float:
+        """ Take one token from bucket, sleep without blocking event loop if limit is exceeded.
+
+        Returns:
+            float: Time in seconds of waiting.
+        """
+        wait_time = self.reserve()
+        if wait_time > 0: await asyncio.sleep(wait_time)
+        return wait_time
+
+    def get_statistic(self) -> RateLimiterStatistic:
+        " Get statistic of waiting on limiter. "
+        with self._lock:
+            return RateLimiterStatistic(
+                count_requests=self._count_requests,
+                count_waits=self._count_waits,
+                wait_time=self._wait_time,
+                max_wait_time=self._max_wait_time
+            )
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(account: str, rate: float = 7.0, burst: int = 7) -> RateLimiter:
+    """ Get rate limiter of account. Connectors of one account in one process share one limiter.
+    Limiter is created with {rate} and {burst} on first call, on next calls they are ignored.
+
+    Args:
+        account (str): Account name. Ex: domain of AmoCRM.
+        rate (float, optional): Count of requests per second. Defaults to 7.0.
+        burst (int, optional): Max count of requests without waiting. Defaults to 7.
+
+    Returns:
+        RateLimiter: Shared rate limiter of account.
+    """
+    with _rate_limiters_lock:
+        limiter: Optional[RateLimiter] = _rate_limiters.get(account)
+        if limiter is None:
+            limiter = _rate_limiters[account] = RateLimiter(rate=rate, burst=burst)
+        return limiter
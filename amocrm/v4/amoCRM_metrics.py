@@ -0,0 +1,211 @@
+" File with hooks of requests and metrics collector for AmoCRM connector "
+
+from __future__ import annotations
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from amocrm.v4.models.amoCRM_M import RequestEvent, ResponceEvent
+
+import bisect
+import threading
+
+
+# Buckets of histogram of latency, seconds (as default buckets of Prometheus client)
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def get_url_action(url: str) -> str:
+    """ Get action from url, ids are replaced by '{id}' (count of actions in metrics does not grow with count of entities).
+    Ex: 'https://example.amocrm.ru/api/v4/leads/123/notes?page=2' -> 'leads/{id}/notes'
+    """
+    parts = urlsplit(url).path.strip('/').split('/')
+    # Path: api/{version_api}/{action}
+    if len(parts) > 2 and parts[0] == 'api': parts = parts[2:]
+    return '/'.join('{id}' if part.isdigit() else part for part in parts)
+
+
+def get_body_size(kwargs: dict[str, Any]) -> int:
+    " Get size of body of request from arguments of http client (data for requests, content for httpx). "
+    body = kwargs.get('data', kwargs.get('content'))
+    if body is None: return 0
+    return len(body.encode() if isinstance(body, str) else body)
+
+
+class RequestHook:
+    """ Hook of requests of connector. Methods are called in thread (or task) of request, so they must be fast
+    and thread safe. Override only needed methods.
+
+        Usage:
+        >>> class SlowRequestHook(RequestHook):
+        >>>     def after_request(self, event: ResponceEvent) -> None:
+        >>>         if event.elapsed > 1: print(f"Slow request -> {event.url}")
+        >>>
+        >>> amocrm = AmoCRM(settings, hooks=[SlowRequestHook()])
+    """
+
+    def before_request(self, event: RequestEvent) -> None:
+        " Called before each attempt of request, after waiting on rate limiter. "
+
+    def after_request(self, event: ResponceEvent) -> None:
+        " Called after each attempt of request, with responce or with error of connection. "
+
+    def on_timing(self, stage: str, action: str, seconds: float) -> None:
+        " Called after stage of processing of data. Stages: parse (json to models), dataframe (models to Dataframe). "
+
+
+class _RequestMetrics:
+    " Metrics of requests of one action and method. "
+
+    __slots__ = ('count', 'codes', 'buckets', 'latency_sum', 'bytes_sent', 'bytes_received', 'count_retries', 'retry_wait',
+                 'count_throttles', 'throttle_wait')
+
+    def __init__(self):
+        self.count = 0
+        self.codes: dict[str, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1) # Last bucket is +Inf
+        self.latency_sum = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.count_retries = 0
+        self.retry_wait = 0.0
+        self.count_throttles = 0
+        self.throttle_wait = 0.0
+
+
+class MetricsCollector(RequestHook):
+    """ Built-in hook, which collects metrics of requests by action and method: count of requests by status code,
+    histogram of latency, bytes sent and received, retries and waiting on rate limiter; and time of stages of processing
+    (parse, dataframe) by action. Collector is thread safe and can be shared by several connectors.
+
+        Usage:
+        >>> metrics = MetricsCollector()
+        >>> amocrm = AmoCRM(settings, metrics=metrics)
+        >>> amocrm.get_data_df(AmoCRM.ACTION.LEADS, get_all_data=True, max_workers=5)
+        >>> metrics.to_dict()['requests']['leads']['GET']['codes']
+        {'200': 41, '204': 1}
+        >>> print(metrics.to_prometheus())
+        # TYPE amocrm_requests_total counter
+        amocrm_requests_total{action="leads",method="GET",code="200"} 41
+        ...
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: dict[tuple[str, str], _RequestMetrics] = {}
+        self._stages: dict[tuple[str, str], list[float]] = {} # (stage, action) -> [count, seconds]
+
+    def _get_request_metrics(self, action: str, method: str) -> _RequestMetrics:
+        metrics = self._requests.get((action, method))
+        if metrics is None: metrics = self._requests[(action, method)] = _RequestMetrics()
+        return metrics
+
+    def before_request(self, event: RequestEvent) -> None:
+        if not event.throttle_wait: return
+        with self._lock:
+            metrics = self._get_request_metrics(event.action, event.method)
+            metrics.count_throttles += 1
+            metrics.throttle_wait += event.throttle_wait
+
+    def after_request(self, event: ResponceEvent) -> None:
+        code = 'error' if event.status_code is None else str(event.status_code)
+        with self._lock:
+            metrics = self._get_request_metrics(event.action, event.method)
+            metrics.count += 1
+            metrics.codes[code] = metrics.codes.get(code, 0) + 1
+            metrics.buckets[bisect.bisect_left(LATENCY_BUCKETS, event.elapsed)] += 1
+            metrics.latency_sum += event.elapsed
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            if event.retry_delay is not None:
+                metrics.count_retries += 1
+                metrics.retry_wait += event.retry_delay
+
+    def on_timing(self, stage: str, action: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._stages.setdefault((stage, action), [0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+
+    def reset(self) -> None:
+        " Remove all collected metrics. "
+        with self._lock:
+            self._requests.clear()
+            self._stages.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        """ Get metrics in dict: {'requests': {action: {method: {...}}}, 'stages': {stage: {action: {...}}}}.
+        Buckets of latency are cumulative (count of requests with latency <= bound), as in Prometheus.
+        """
+        with self._lock:
+            requests: dict[str, dict[str, Any]] = {}
+            for (action, method), metrics in sorted(self._requests.items()):
+                requests.setdefault(action, {})[method] = {
+                    'count': metrics.count,
+                    'codes': dict(metrics.codes),
+                    'latency': {
+                        'count': metrics.count, 'sum': metrics.latency_sum,
+                        'buckets': dict(zip([*map(str, LATENCY_BUCKETS), '+Inf'], self._get_cumulative(metrics.buckets)))
+                    },
+                    'bytes_sent': metrics.bytes_sent,
+                    'bytes_received': metrics.bytes_received,
+                    'retries': {'count': metrics.count_retries, 'wait': metrics.retry_wait},
+                    'throttles': {'count': metrics.count_throttles, 'wait': metrics.throttle_wait}
+                }
+
+            stages: dict[str, dict[str, Any]] = {}
+            for (stage, action), (count, seconds) in sorted(self._stages.items()):
+                stages.setdefault(stage, {})[action] = {'count': count, 'seconds': seconds}
+
+        return {'requests': requests, 'stages': stages}
+
+    def to_prometheus(self, prefix: str = 'amocrm') -> str:
+        " Get metrics in text format of Prometheus. "
+        data = self.to_dict()
+        lines: list[str] = []
+
+        def add_metric(name: str, type_: str, help_: str, samples: list[tuple[str, dict[str, str], Any]]) -> None:
+            if not samples: return
+            lines.append(f"# HELP {prefix}_{name} {help_}")
+            lines.append(f"# TYPE {prefix}_{name} {type_}")
+            for suffix, labels, value in samples:
+                labels_text = ','.join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f"{prefix}_{name}{suffix}{{{labels_text}}} {value}")
+
+        items = [(action, method, metrics) for action, methods in data['requests'].items() for method, metrics in methods.items()]
+
+        add_metric('requests_total', 'counter', 'Count of requests (attempts) by status code.', [
+            ('', {'action': action, 'method': method, 'code': code}, count)
+            for action, method, metrics in items for code, count in metrics['codes'].items()
+        ])
+        latency_samples = []
+        for action, method, metrics in items:
+            labels = {'action': action, 'method': method}
+            latency_samples += [('_bucket', {**labels, 'le': bound}, count) for bound, count in metrics['latency']['buckets'].items()]
+            latency_samples += [('_sum', labels, metrics['latency']['sum']), ('_count', labels, metrics['latency']['count'])]
+        add_metric('request_duration_seconds', 'histogram', 'Latency of requests, seconds.', latency_samples)
+
+        for name, help_, get_value in (
+            ('request_bytes_sent_total', 'Size of bodies of requests, bytes.', lambda metrics: metrics['bytes_sent']),
+            ('request_bytes_received_total', 'Size of bodies of responces, bytes.', lambda metrics: metrics['bytes_received']),
+            ('retries_total', 'Count of retried requests.', lambda metrics: metrics['retries']['count']),
+            ('retry_wait_seconds_total', 'Waiting before retries, seconds.', lambda metrics: metrics['retries']['wait']),
+            ('throttles_total', 'Count of waitings on rate limiter.', lambda metrics: metrics['throttles']['count']),
+            ('throttle_wait_seconds_total', 'Waiting on rate limiter, seconds.', lambda metrics: metrics['throttles']['wait'])
+        ):
+            add_metric(name, 'counter', help_, [('', {'action': action, 'method': method}, get_value(metrics)) for action, method, metrics in items])
+
+        stage_items = [(stage, action, timing) for stage, actions in data['stages'].items() for action, timing in actions.items()]
+        add_metric('stage_seconds_total', 'counter', 'Time of stages of processing of data, seconds.',
+                   [('', {'stage': stage, 'action': action}, timing['seconds']) for stage, action, timing in stage_items])
+        add_metric('stage_calls_total', 'counter', 'Count of stages of processing of data.',
+                   [('', {'stage': stage, 'action': action}, timing['count']) for stage, action, timing in stage_items])
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    @staticmethod
+    def _get_cumulative(buckets: list[int]) -> list[int]:
+        result, total = [], 0
+        for count in buckets:
+            total += count
+            result.append(total)
+        return result
@@ -0,0 +1,151 @@
+" File with fast parse of AmoCRM responces without validation and fast serialization of requests "
+
+from __future__ import annotations
+from typing import Any, Callable, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+from pydantic.typing import NoneType
+
+import json
+
+try:
+    import orjson
+except ImportError: # pragma: no cover - orjson is optional
+    orjson = None
+
+
+Converter = Callable[[Any], Any]
+
+
+class _ModelPlan:
+    " Plan of construct of model: fields with keys in json, converters of values and defaults. "
+    __slots__ = ('fields', 'names', 'aliases', 'converters')
+
+    def __init__(self, model: type[BaseModel]):
+        self.fields: list[tuple[str, str, Optional[Converter], ModelField]] = [
+            (name, field.alias, _create_converter(field.outer_type_), field) for name, field in model.__fields__.items()
+        ]
+        self.names = frozenset(model.__fields__)
+        self.aliases = frozenset(field.alias for field in model.__fields__.values())
+        self.converters = [(name, alias, converter) for name, alias, converter, _ in self.fields]
+
+
+_model_plans: dict[type[BaseModel], _ModelPlan] = {}
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    " Decode json, orjson is used if it is installed. "
+    if orjson is not None: return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps(data: Any) -> bytes:
+    " Encode data to json bytes, orjson is used if it is installed. "
+    if orjson is not None: return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def dump_model(model: BaseModel) -> dict[str, Any]:
+    """ Convert model with nested models to dict with only set fields, same as model.dict(exclude_unset=True).
+    Fields are read from instance without copy of values, it is faster for big lists of request models.
+
+    Args:
+        model (BaseModel): Model. Ex: AmoRequestPostLeads.
+
+    Returns:
+        dict[str, Any]: Set fields of model, keys are names of fields.
+
+        Usage:
+        >>> dump_model(AmoRequestPatchLeads(id=1, price=100))
+        {'id': 1, 'price': 100}
+    """
+    fields_set = model.__fields_set__
+    return {name: _dump_value(value) for name, value in model.__dict__.items() if name in fields_set}
+
+
+def _dump_value(value: Any) -> Any:
+    " Convert nested models in value to dicts. "
+    if isinstance(value, BaseModel): return dump_model(value)
+    if isinstance(value, list): return [_dump_value(item) for item in value]
+    if isinstance(value, dict): return {key: _dump_value(item) for key, item in value.items()}
+    return value
+
+
+def construct_model(model: type[BaseModel], data: dict) -> BaseModel:
+    """ Create model with nested models from trusted data without validation. Values of scalar fields keep types of json
+    (Ex: HttpUrl -> str), except unions with str first, which are converted to str as by validation
+    (Ex: value of custom field 5 -> '5'). Missing fields get default values, unknown keys are ignored.
+
+    Args:
+        model (type[BaseModel]): Class of model.
+        data (dict): Data of model, keys are aliases of fields.
+
+    Returns:
+        BaseModel: Model, same as model.parse_obj(data) for valid data.
+
+        Usage:
+        >>> page = construct_model(AmoResponceGet, loads(responce.content))
+        >>> page.embedded.leads[0].links.self.href
+        'https://example.amocrm.ru/api/v4/leads/1'
+    """
+    plan = _model_plans.get(model)
+    if plan is None: plan = _model_plans[model] = _ModelPlan(model)
+
+    if data.keys() >= plan.aliases:
+        # All fields are set, most of responces of api
+        values = {name: value if converter is None or value is None else converter(value)
+                  for name, alias, converter in plan.converters for value in (data[alias],)}
+        fields_set = set(plan.names)
+    else:
+        values = {}
+        fields_set = set()
+        for name, alias, converter, field in plan.fields:
+            if alias in data:
+                value = data[alias]
+                values[name] = value if converter is None or value is None else converter(value)
+                fields_set.add(name)
+            else: values[name] = field.get_default()
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, '__dict__', values)
+    object.__setattr__(instance, '__fields_set__', fields_set)
+    return instance
+
+
+def _create_converter(type_: Any) -> Optional[Converter]:
+    " Create converter of value for type of field. None if value is kept as is. "
+    origin = get_origin(type_)
+
+    if origin is Union:
+        types = [arg for arg in get_args(type_) if arg is not NoneType]
+        if len(types) == 1: return _create_converter(types[0])
+        # Validation tries types in order, str accepts numbers and bool. Ex: Union[str, int]
+        if types[0] is str: return _to_str
+        models = [arg for arg in types if isinstance(arg, type) and issubclass(arg, BaseModel)]
+        if len(models) != len(types): return None
+        return lambda value: _construct_union(models, value)
+
+    if origin is list:
+        item_converter = _create_converter(get_args(type_)[0])
+        if item_converter is None: return None
+        return lambda value: [item_converter(item) for item in value]
+
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return lambda value: construct_model(type_, value) if isinstance(value, dict) else value
+
+    return None
+
+
+def _to_str(value: Any) -> Any:
+    " Convert number or bool to str, as validation of str field. "
+    return str(value) if isinstance(value, (int, float)) else value
+
+
+def _construct_union(models: list[type[BaseModel]], value: Any) -> Any:
+    " Choose first model of union, which has all required keys in data. Ex: DataLeads for {'leads': [...]} "
+    if not isinstance(value, dict): return value
+    for model in models:
+        if all(field.alias in value for field in model.__fields__.values() if field.required):
+            return construct_model(model, value)
+    return value
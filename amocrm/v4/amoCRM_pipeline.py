@@ -0,0 +1,227 @@
+" File with pipeline of export of AmoCRM pages: pages are requested in threads and parsed to Dataframe in process pool "
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from amocrm.v4.models.amoCRM_M import AmoCRMFuncResponce, AmoResponceGet
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_parse import construct_model, loads
+from amocrm.v4.amoCRM_utils import set_url_page
+
+import os
+import queue
+import loguru
+import multiprocessing
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+# Temporary column with number of page, rows of partial frames are sorted by it
+PAGE_COLUMN = '__page'
+# Timeout of waiting of queues of processes, after it processes are checked (dead process does not take tasks and send result)
+POLL_INTERVAL = 0.5
+
+
+def parse_page_to_df(content: bytes, validate: bool, all_custom_fields: bool = False) -> Optional[DataFrame]:
+    """ Parse content of page to Dataframe, as 'get_data_df' of AmoCRM.
+
+    ::Return::
+        ~ Dataframe | None (type of data is not allowed)
+    """
+    from amocrm.v4.amoCRM_df import parse_data_and_create_df
+
+    data = loads(content)
+    page = AmoResponceGet.parse_obj(data) if validate else construct_model(AmoResponceGet, data)
+    return parse_data_and_create_df(page, loguru.logger, all_custom_fields)
+
+
+def _parse_worker(tasks: multiprocessing.Queue, results: multiprocessing.Queue, validate: bool, all_custom_fields: bool) -> None:
+    """ Process of pool: parse pages from {tasks} until None and send one partial frame of all parsed pages to {results}.
+    After error pages are not parsed, but they are still taken from queue, so sender is not blocked.
+    """
+    from pandas import concat
+
+    frames: list[DataFrame] = []
+    error: Optional[str] = None
+
+    for number, content in iter(tasks.get, None):
+        if error is not None: continue
+        try:
+            data_df = parse_page_to_df(content, validate, all_custom_fields)
+        except Exception as e:
+            error = f"Page {number} is not parsed -> {e!r}"
+            continue
+        if data_df is None: error = f"Data is not allowed type. Page -> {number}"
+        elif not data_df.empty: frames.append(data_df.assign(**{PAGE_COLUMN: number}))
+
+    results.put((concat(frames, ignore_index=True) if frames else None, error))
+
+
+class ExportPipeline:
+    """ Pipeline of export to Dataframe for big accounts. Pages are requested by number in thread pool, content of pages
+    goes through bounded queue to process pool, where json is parsed to models and models to Dataframe. So network
+    and parsing work at the same time and parsing uses several cores. Each process builds one partial frame
+    of its pages, final frame is assembled from partial frames in order of pages and equals frame of 'get_data_df'.
+
+        Usage:
+        >>> pipeline = ExportPipeline(amocrm, max_processes=4, max_workers=5)
+        >>> pipeline.get_data_df(AmoCRM.ACTION.LEADS, filters='limit=250')
+        AmoCRMFuncResponce(status=True, detail='', data=Dataframe(*Data in dataframe*))
+    """
+
+    def __init__(self, amocrm: AmoCRM, max_processes: Optional[int] = None, max_workers: int = 5, queue_size: Optional[int] = None,
+                 logger: loguru.Logger = loguru.logger):
+        """
+        Args:
+            amocrm (AmoCRM): Connector, pages are requested through it (rate limiter, retries, cache).
+            max_processes (Optional[int], optional): Count of processes of parsing. Defaults to count of cores.
+            max_workers (int, optional): Max count of requests at the same time. Defaults to 5.
+            queue_size (Optional[int], optional): Max count of pages in queue to processes. Requests wait, if queue is full,
+                so memory does not grow, if parsing is slower than network. Defaults to 2 * max_processes.
+        """
+        self._amocrm = amocrm
+        self._max_processes = max_processes or os.cpu_count() or 1
+        self._max_workers = max_workers
+        self._queue_size = queue_size or 2 * self._max_processes
+        self._logger = logger
+
+    def get_data_df(self, action: AmoCRM.ACTION, filters: str = 'limit=250', version_api: str = 'v4', validate: Optional[bool] = None,
+                    wide_custom_fields: bool = False) -> AmoCRMFuncResponce:
+        """ Get all pages of action in Dataframe. Pages are requested from first page until empty page (204).
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            filters (str, optional): Filters of request. Defaults to 'limit=250'.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            validate (Optional[bool], optional): Validate pages. None -> 'validate_responces' of settings. Defaults to None.
+            wide_custom_fields (bool, optional): Add wide columns of custom fields, as in 'get_data_df'. Defaults to False.
+
+        Returns:
+            AmoCRMFuncResponce: data is Dataframe (rows of received pages, if request is not success).
+        """
+        if validate is None: validate = self._amocrm.validate_responces
+
+        context = multiprocessing.get_context()
+        tasks, results = context.Queue(maxsize=self._queue_size), context.Queue()
+        processes = [context.Process(target=_parse_worker, args=(tasks, results, validate, wide_custom_fields), daemon=True) for _ in range(self._max_processes)]
+        for process in processes: process.start()
+
+        try:
+            detail, count_pages = self._send_pages(self._amocrm.get_url(action, filters, version_api), tasks, processes)
+        finally:
+            for _ in processes:
+                if self._put_task(tasks, processes, None) is not None: break
+            partials, process_error = self._get_partials(results, processes)
+            for process in processes:
+                # Process can wait for task forever, if other process is dead
+                if process_error is not None and process.is_alive(): process.terminate()
+                process.join()
+
+        frames = [data_df for data_df, _ in partials if data_df is not None]
+        detail = detail or process_error or next((error for _, error in partials if error is not None), None)
+        data_df = self._assemble(frames)
+
+        if detail is not None: return AmoCRMFuncResponce(status=False, detail=detail, data=data_df)
+        if wide_custom_fields:
+            data_df = self._amocrm.add_custom_fields_columns(data_df, self._amocrm.get_custom_fields(action, version_api=version_api).data)
+
+        self._logger.info(f"Pipeline | {action} | Pages -> {count_pages} | Rows -> {len(data_df)} | Processes -> {len(processes)}")
+        return AmoCRMFuncResponce(status=True, data=data_df)
+
+    def _send_pages(self, url: str, tasks: multiprocessing.Queue, processes: list[multiprocessing.Process]) -> Tuple[Optional[str], int]:
+        """ Request pages by number in thread pool and put content of pages to {tasks} in order of pages. At most {max_workers}
+        requests are sent at the same time, new pages are not requested after empty page (204) or death of process.
+
+        Returns:
+            Tuple[Optional[str], int]: Error (None if success) and count of received pages.
+        """
+        def get_page(number: int) -> Tuple[int, Optional[bytes]]:
+            return self._amocrm.get_page_content(set_url_page(url, number))
+
+        futures: deque[Tuple[int, Future]] = deque()
+        number, count_pages, is_last = 1, 0, False
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while futures or not is_last:
+                while not is_last and len(futures) < self._max_workers:
+                    futures.append((number, executor.submit(get_page, number)))
+                    number += 1
+
+                page_number, future = futures.popleft()
+                code, content = future.result()
+                if code == 204:
+                    is_last = True
+                    continue
+                if content is None:
+                    for _, rest in futures: rest.cancel()
+                    return f"Incorrect request! code -> {code} Page -> {page_number}", count_pages
+
+                # Waits, if processes are busy
+                error = self._put_task(tasks, processes, (page_number, content))
+                if error is not None:
+                    for _, rest in futures: rest.cancel()
+                    return error, count_pages
+                count_pages += 1
+
+        return None, count_pages
+
+    @staticmethod
+    def _check_processes(processes: list[multiprocessing.Process]) -> Optional[str]:
+        " Get error, if process is dead (it is killed or failed before sending of result), else None. "
+        dead = next((process for process in processes if process.exitcode not in (None, 0)), None)
+        return None if dead is None else f"Process of parsing is dead! exitcode -> {dead.exitcode}"
+
+    @classmethod
+    def _put_task(cls, tasks: multiprocessing.Queue, processes: list[multiprocessing.Process], task: Optional[tuple]) -> Optional[str]:
+        " Put task to {tasks}. Wait, while queue is full and processes are alive. Returns error, if process is dead, else None. "
+        while True:
+            try:
+                tasks.put(task, timeout=POLL_INTERVAL)
+                return None
+            except queue.Full:
+                error = cls._check_processes(processes)
+                if error is not None: return error
+
+    @classmethod
+    def _get_partials(cls, results: multiprocessing.Queue, processes: list[multiprocessing.Process]) -> Tuple[list[tuple], Optional[str]]:
+        """ Get results of all processes. Wait, while processes are alive.
+
+        Returns:
+            Tuple[list[tuple], Optional[str]]: Received results (partial frame, error) and error, if process is dead, else None.
+        """
+        partials: list[tuple] = []
+        while len(partials) < len(processes):
+            try:
+                partials.append(results.get(timeout=POLL_INTERVAL))
+                continue
+            except queue.Empty:
+                error = cls._check_processes(processes)
+            if error is None and not any(process.is_alive() for process in processes):
+                # Finished process sends result before exit, so result is in queue or it is lost
+                try:
+                    partials.append(results.get(timeout=POLL_INTERVAL))
+                    continue
+                except queue.Empty:
+                    error = "Processes of parsing are finished without result!"
+            if error is not None: return partials, error
+        return partials, None
+
+    @staticmethod
+    def _assemble(frames: list[DataFrame]) -> DataFrame:
+        """ Assemble partial frames of processes to one frame in order of pages. Columns are in order of frame of 'get_data_df':
+        column 'contact_id' of leads is not in pages without contacts, so order of columns of partial frames can differ.
+        """
+        from pandas import DataFrame, concat
+        from amocrm.v4.amoCRM_df import CONTACTS_COLUMNS, LEADS_COLUMNS
+
+        if not frames: return DataFrame()
+
+        data_df = concat(frames, ignore_index=True)
+        data_df = data_df.sort_values(PAGE_COLUMN, kind='stable').drop(columns=PAGE_COLUMN).reset_index(drop=True)
+        known = LEADS_COLUMNS if 'status_id' in data_df.columns else CONTACTS_COLUMNS
+        return data_df[[column for column in known if column in data_df.columns]]
@@ -0,0 +1,79 @@
+" File with retry policy functions for AmoCRM connector "
+
+from __future__ import annotations
+from typing import Optional
+
+from amocrm.v4.models.amoCRM_M import RetryPolicy
+
+import random
+import datetime
+
+from email.utils import parsedate_to_datetime
+
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def is_retry_allowed(policy: RetryPolicy, method: str, attempt: int, status_code: Optional[int] = None, is_sent: bool = True) -> bool:
+    """ Check is request can be sent again.
+
+    Args:
+        policy (RetryPolicy): Retry policy.
+        method (str): Http method of request.
+        attempt (int): Number of attempt that is ended, first request is 1.
+        status_code (Optional[int], optional): Code of responce. None if request ended with error of connection. Defaults to None.
+        is_sent (bool, optional): Request could reach server. False for error of connect. Defaults to True.
+
+    Returns:
+        bool: Is retry allowed.
+    """
+    if attempt >= policy.max_attempts: return False
+    
+    if method.upper() in SAFE_METHODS or policy.retry_unsafe_methods:
+        return status_code is None or status_code in policy.status_codes
+    
+    # POST and PATCH are retried only if server surely did not process request
+    if status_code is None: return not is_sent
+    return status_code in policy.unsafe_status_codes
+
+
+def get_retry_delay(policy: RetryPolicy, attempt: int, retry_after: Optional[str] = None) -> float:
+    """ Get delay before next attempt. Exponential backoff with jitter or value of header Retry-After.
+
+    Args:
+        policy (RetryPolicy): Retry policy.
+        attempt (int): Number of attempt that is ended, first request is 1.
+        retry_after (Optional[str], optional): Value of header Retry-After. Defaults to None.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    if policy.respect_retry_after and retry_after:
+        retry_after_seconds = parse_retry_after(retry_after)
+        if retry_after_seconds is not None: return min(retry_after_seconds, policy.retry_after_max)
+
+    delay = min(policy.backoff_max, policy.backoff_factor * 2 ** (attempt - 1))
+    return delay - random.uniform(0, delay * policy.jitter)
+
+
+def parse_retry_after(retry_after: str) -> Optional[float]:
+    """ Parse header Retry-After. Header has delay in seconds or http date.
+
+    Args:
+        retry_after (str): Value of header. Ex: '120' or 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    Returns:
+        Optional[float]: Delay in seconds. None if value is not correct.
+    """
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_datetime = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_datetime.tzinfo is None: retry_datetime = retry_datetime.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_datetime - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
@@ -0,0 +1,322 @@
+" File with local SQLite store of AmoCRM leads and contacts "
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Union
+
+from amocrm.v4.models.amoCRM_M import AmoCRMFuncResponce, Contacts, CustomField, DataContacts, DataLeads, Leads
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_utils import batch, get_embedded_items
+
+import sqlite3
+import loguru
+import threading
+
+from contextlib import contextmanager
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+LEADS_COLUMNS = ('id', 'name', 'price', 'responsible_user_id', 'group_id', 'status_id', 'pipeline_id', 'loss_reason_id',
+                 'created_by', 'updated_by', 'created_at', 'updated_at', 'closed_at', 'closest_task_at', 'is_deleted', 'score',
+                 'account_id')
+
+CONTACTS_COLUMNS = ('id', 'name', 'first_name', 'last_name', 'responsible_user_id', 'group_id', 'created_by', 'updated_by',
+                    'created_at', 'updated_at', 'closest_task_at', 'is_deleted', 'account_id')
+
+# Tables of entities, name of action is name of table
+TABLES: dict[str, tuple[str, ...]] = {AmoCRM.ACTION.LEADS: LEADS_COLUMNS, AmoCRM.ACTION.CONTACTS: CONTACTS_COLUMNS}
+
+# Tables of nested data of entities, rows are linked with entity by (entity_type, entity_id)
+RELATED_TABLES = ('custom_fields_values', 'tags', 'companies', 'lead_contacts')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY, name TEXT, price INTEGER, responsible_user_id INTEGER, group_id INTEGER, status_id INTEGER,
+    pipeline_id INTEGER, loss_reason_id INTEGER, created_by INTEGER, updated_by INTEGER, created_at INTEGER, updated_at INTEGER,
+    closed_at INTEGER, closest_task_at INTEGER, is_deleted INTEGER, score INTEGER, account_id INTEGER, link TEXT
+);
+CREATE INDEX IF NOT EXISTS leads_updated_at ON leads (updated_at);
+CREATE INDEX IF NOT EXISTS leads_status_id ON leads (status_id);
+CREATE INDEX IF NOT EXISTS leads_pipeline_id ON leads (pipeline_id);
+CREATE INDEX IF NOT EXISTS leads_responsible_user_id ON leads (responsible_user_id);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY, name TEXT, first_name TEXT, last_name TEXT, responsible_user_id INTEGER, group_id INTEGER,
+    created_by INTEGER, updated_by INTEGER, created_at INTEGER, updated_at INTEGER, closest_task_at INTEGER, is_deleted INTEGER,
+    account_id INTEGER, link TEXT
+);
+CREATE INDEX IF NOT EXISTS contacts_updated_at ON contacts (updated_at);
+CREATE INDEX IF NOT EXISTS contacts_responsible_user_id ON contacts (responsible_user_id);
+
+CREATE TABLE IF NOT EXISTS custom_fields_values (
+    entity_type TEXT NOT NULL, entity_id INTEGER NOT NULL, field_id INTEGER NOT NULL, field_name TEXT, field_code TEXT,
+    field_type TEXT, value_index INTEGER NOT NULL, value TEXT, enum_id INTEGER, enum_code TEXT,
+    PRIMARY KEY (entity_type, entity_id, field_id, value_index)
+);
+CREATE INDEX IF NOT EXISTS custom_fields_values_field_id ON custom_fields_values (field_id);
+
+CREATE TABLE IF NOT EXISTS tags (
+    entity_type TEXT NOT NULL, entity_id INTEGER NOT NULL, tag_id INTEGER NOT NULL, tag_name TEXT,
+    PRIMARY KEY (entity_type, entity_id, tag_id)
+);
+CREATE INDEX IF NOT EXISTS tags_tag_id ON tags (tag_id);
+
+CREATE TABLE IF NOT EXISTS companies (
+    entity_type TEXT NOT NULL, entity_id INTEGER NOT NULL, company_id INTEGER NOT NULL, link TEXT,
+    PRIMARY KEY (entity_type, entity_id, company_id)
+);
+CREATE INDEX IF NOT EXISTS companies_company_id ON companies (company_id);
+
+CREATE TABLE IF NOT EXISTS lead_contacts (
+    entity_type TEXT NOT NULL, entity_id INTEGER NOT NULL, contact_id INTEGER NOT NULL, position INTEGER,
+    PRIMARY KEY (entity_type, entity_id, contact_id)
+);
+CREATE INDEX IF NOT EXISTS lead_contacts_contact_id ON lead_contacts (contact_id);
+
+-- Ids of read, count of ids is not limited by max count of parameters of query (999 in old versions of SQLite)
+CREATE TEMP TABLE IF NOT EXISTS selected_ids (id INTEGER PRIMARY KEY);
+"""
+
+
+class SQLiteStore:
+    """ Local mirror of leads and contacts in SQLite. Entities are upserted by id with custom fields, tags, companies
+    and contacts of leads. Filtered reads and Dataframes are answered locally, without requests to AmoCRM.
+
+        Usage:
+        >>> with SQLiteStore("amocrm.db") as store:
+        >>>     store.fill(amocrm, AmoCRM.ACTION.LEADS, max_workers=5) # Download all leads
+        >>>     store.read(AmoCRM.ACTION.LEADS, status_id=142, updated_from=1623170867)
+        [{'id': 12653276, 'name': 'Name', 'price': 0, ...}, ...]
+        >>>     store.read_df(AmoCRM.ACTION.LEADS, pipeline_id=5)
+        Dataframe(columns=[id, name, price, ...], data=[...])
+    """
+
+    def __init__(self, path_to_file: str = "amocrm.db", logger: loguru.Logger = loguru.logger):
+        self._path_to_file = path_to_file
+        self._logger = logger
+
+        # Connection is shared by threads, access is locked
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path_to_file, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> SQLiteStore:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __str__(self):
+        return f"SQLiteStore(path_to_file={self._path_to_file}, count={self.count()})"
+
+    def close(self) -> None:
+        " Close connection to database. "
+        self._connection.close()
+
+    # WRITE
+
+    def upsert(self, entities: Iterable[Union[Leads, Contacts]]) -> int:
+        """ Insert or update entities. Nested data of updated entities is replaced.
+
+        Args:
+            entities (Iterable[Union[Leads, Contacts]]): Leads and contacts. Ex: data of 'get_data' or 'IncrementalSync.sync'.
+
+        Returns:
+            int: Count of saved entities.
+        """
+        rows: dict[str, list[tuple]] = {table: [] for table in (*TABLES, *RELATED_TABLES)}
+        ids: dict[str, list[int]] = {table: [] for table in TABLES}
+
+        for entity in entities:
+            if isinstance(entity, Leads): table = AmoCRM.ACTION.LEADS
+            elif isinstance(entity, Contacts): table = AmoCRM.ACTION.CONTACTS
+            else: raise TypeError(f"Type of entity is not allowed! type -> {type(entity)}")
+
+            values = entity.__dict__
+            rows[table].append((*(values[column] for column in TABLES[table]), str(entity.links.self.href)))
+            ids[table].append(entity.id)
+
+            rows['custom_fields_values'].extend(self._create_custom_fields_rows(table, entity.id, entity.custom_fields_values))
+            rows['tags'].extend((table, entity.id, tag.id, tag.name) for tag in entity.embedded.tags)
+            rows['companies'].extend((table, entity.id, company.id, str(company.links.self.href)) for company in entity.embedded.companies)
+            if table == AmoCRM.ACTION.LEADS and entity.embedded.contacts:
+                rows['lead_contacts'].extend((table, entity.id, contact.id, position) for position, contact in enumerate(entity.embedded.contacts))
+
+        with self._lock, self._connection:
+            for table, columns in TABLES.items():
+                if not rows[table]: continue
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}, link) VALUES ({', '.join('?' * (len(columns) + 1))})", rows[table]
+                )
+                # Nested data is replaced, removed tags and fields are not kept
+                for ids_batch in batch(ids[table], 500):
+                    for related_table in RELATED_TABLES:
+                        self._connection.execute(
+                            f"DELETE FROM {related_table} WHERE entity_type = ? AND entity_id IN ({', '.join('?' * len(ids_batch))})",
+                            (table, *ids_batch)
+                        )
+
+            for related_table in RELATED_TABLES:
+                if not rows[related_table]: continue
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {related_table} VALUES ({', '.join('?' * len(rows[related_table][0]))})", rows[related_table]
+                )
+
+        return sum(len(table_ids) for table_ids in ids.values())
+
+    def _create_custom_fields_rows(self, table: str, entity_id: int, fields: Optional[list[CustomField]]) -> list[tuple]:
+        if not fields: return []
+        return [(table, entity_id, field.field_id, field.field_name, field.field_code, field.field_type, index,
+                 None if value.value is None else str(value.value), value.enum_id or None, value.enum_code)
+                for field in fields for index, value in enumerate(field.values)]
+
+    def delete(self, action: AmoCRM.ACTION, ids: list[int]) -> int:
+        " Delete entities with nested data. Return count of deleted entities. "
+        self._check_table(action)
+        count = 0
+        with self._lock, self._connection:
+            for ids_batch in batch(ids, 500):
+                placeholders = ', '.join('?' * len(ids_batch))
+                count += self._connection.execute(f"DELETE FROM {action} WHERE id IN ({placeholders})", ids_batch).rowcount
+                for related_table in RELATED_TABLES:
+                    self._connection.execute(f"DELETE FROM {related_table} WHERE entity_type = ? AND entity_id IN ({placeholders})",
+                                             (action, *ids_batch))
+        return count
+
+    def fill(self, amocrm: AmoCRM, action: AmoCRM.ACTION, filters: str = 'limit=250', version_api: str = 'v4',
+             max_workers: int = 1, *args, **kwargs) -> AmoCRMFuncResponce:
+        """ Download all pages of action and upsert entities page by page. With one worker only one page is kept in memory,
+        with {max_workers} > 1 at most 2 * {max_workers} pages are requested ahead of saved page (see 'iter_get_responces_parallel').
+
+        Args:
+            amocrm (AmoCRM): Connector.
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            filters (str, optional): Filters of request. Defaults to 'limit=250'.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            max_workers (int, optional): Pages are requested by number in thread pool, if > 1. Defaults to 1.
+
+        Returns:
+            AmoCRMFuncResponce: data is count of saved entities.
+        """
+        if max_workers > 1:
+            responces = amocrm.iter_get_responces_parallel(action, filters=filters, version_api=version_api, max_workers=max_workers, *args, **kwargs)
+        else: responces = amocrm.iter_get_responces(action, filters=filters, version_api=version_api, *args, **kwargs)
+
+        count = 0
+        for responce in responces:
+            if not responce.status: return AmoCRMFuncResponce(status=False, detail=responce.detail, data=count)
+            if isinstance(responce.data.embedded, (DataLeads, DataContacts)): count += self.upsert(get_embedded_items(responce.data.embedded))
+
+        self._logger.info(f"Store | {action} | Saved entities -> {count}")
+        return AmoCRMFuncResponce(status=True, data=count)
+
+    # READ
+
+    def read(self, action: AmoCRM.ACTION, ids: Optional[list[int]] = None, updated_from: Optional[int] = None,
+             updated_to: Optional[int] = None, limit: Optional[int] = None, **filters) -> list[dict[str, Any]]:
+        """ Read entities from store.
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            ids (Optional[list[int]], optional): Ids of entities. Defaults to None.
+            updated_from (Optional[int], optional): Entities with 'updated_at' >= this timestamp. Defaults to None.
+            updated_to (Optional[int], optional): Entities with 'updated_at' <= this timestamp. Defaults to None.
+            limit (Optional[int], optional): Max count of entities. Defaults to None.
+            filters: Equality of columns. Ex: status_id=142, pipeline_id=5, responsible_user_id=1.
+
+        Returns:
+            list[dict[str, Any]]: Rows of entities ordered by id.
+        """
+        query, params = self._create_query(action, ids, updated_from, updated_to, limit, filters)
+        with self._lock, self._connection, self._select_ids(ids):
+            cursor = self._connection.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def read_df(self, action: AmoCRM.ACTION, ids: Optional[list[int]] = None, updated_from: Optional[int] = None,
+                updated_to: Optional[int] = None, limit: Optional[int] = None, **filters) -> DataFrame:
+        " Read entities from store to Dataframe. See 'read'. "
+        from pandas import read_sql_query
+
+        query, params = self._create_query(action, ids, updated_from, updated_to, limit, filters)
+        with self._lock, self._connection, self._select_ids(ids):
+            return read_sql_query(query, self._connection, params=params)
+
+    def read_related_df(self, action: AmoCRM.ACTION, related_table: str, ids: Optional[list[int]] = None) -> DataFrame:
+        """ Read nested data of entities to Dataframe.
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            related_table (str): One of 'custom_fields_values', 'tags', 'companies', 'lead_contacts'.
+            ids (Optional[list[int]], optional): Ids of entities. Defaults to None (all entities).
+        """
+        from pandas import read_sql_query
+
+        self._check_table(action)
+        if related_table not in RELATED_TABLES:
+            raise ValueError(f"Table '{related_table}' is not found! Allowed tables -> {RELATED_TABLES}")
+
+        query = f"SELECT * FROM {related_table} WHERE entity_type = ?"
+        if ids is not None: query += " AND entity_id IN (SELECT id FROM selected_ids)"
+        with self._lock, self._connection, self._select_ids(ids):
+            return read_sql_query(f"{query} ORDER BY entity_id", self._connection, params=[action])
+
+    def count(self, action: Optional[AmoCRM.ACTION] = None) -> Union[int, dict[str, int]]:
+        " Count of entities of action, or dict of counts of all actions. "
+        if action is not None:
+            self._check_table(action)
+            with self._lock: return self._connection.execute(f"SELECT COUNT(*) FROM {action}").fetchone()[0]
+        return {table: self.count(table) for table in TABLES}
+
+    def get_max_updated_at(self, action: AmoCRM.ACTION) -> Optional[int]:
+        " Max 'updated_at' of entities in store. "
+        self._check_table(action)
+        with self._lock: return self._connection.execute(f"SELECT MAX(updated_at) FROM {action}").fetchone()[0]
+
+    def _create_query(self, action: AmoCRM.ACTION, ids: Optional[list[int]], updated_from: Optional[int], updated_to: Optional[int],
+                      limit: Optional[int], filters: dict[str, Any]) -> tuple[str, list[Any]]:
+        " Create SELECT query with parameters. Names of columns are checked, values are passed as parameters. "
+        columns = self._check_table(action)
+
+        conditions, params = [], []
+        for column, value in filters.items():
+            if column not in columns: raise ValueError(f"Column '{column}' is not found! Allowed columns -> {columns}")
+            conditions.append(f"{column} = ?")
+            params.append(value)
+        # Ids are in temporary table, see '_select_ids'
+        if ids is not None: conditions.append("id IN (SELECT id FROM selected_ids)")
+        if updated_from is not None:
+            conditions.append("updated_at >= ?")
+            params.append(updated_from)
+        if updated_to is not None:
+            conditions.append("updated_at <= ?")
+            params.append(updated_to)
+
+        query = f"SELECT * FROM {action}"
+        if conditions: query += f" WHERE {' AND '.join(conditions)}"
+        query += " ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return query, params
+
+    @contextmanager
+    def _select_ids(self, ids: Optional[list[int]]) -> Iterator[None]:
+        """ Put {ids} to temporary table 'selected_ids' for query of read, table is cleared after query.
+        Each row of insert has one parameter, so count of ids is not limited. Must be called with lock and in transaction.
+        """
+        if ids is None:
+            yield
+            return
+
+        self._connection.executemany("INSERT OR IGNORE INTO selected_ids VALUES (?)", ((id,) for id in ids))
+        try: yield
+        finally: self._connection.execute("DELETE FROM selected_ids")
+
+    def _check_table(self, action: AmoCRM.ACTION) -> tuple[str, ...]:
+        " Check action and get columns of its table. "
+        if action not in TABLES: raise ValueError(f"Action '{action}' is not allowed! Allowed actions -> {tuple(TABLES)}")
+        return TABLES[action]
@@ -0,0 +1,140 @@
+" File with incremental sync of AmoCRM entities by 'updated_at' "
+
+from __future__ import annotations
+from typing import Iterator, Optional, Union
+
+from pydantic.error_wrappers import ValidationError
+
+from amocrm.v4.models.amoCRM_M import AmoCRMFuncResponce, Contacts, Leads, SyncState, SyncWatermark
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_filter import FilterAmoCRM
+from amocrm.v4.amoCRM_utils import get_embedded_items
+
+import os
+import loguru
+
+
+class IncrementalSync:
+    """ Incremental sync of leads and contacts. Only entities changed since last sync are received.
+    Watermark (max 'updated_at' and ids of entities with this timestamp) is saved to file after each page,
+    so sync is continued after restart.
+
+    Pages are requested by 'updated_at' (asc) from watermark. Next page starts from last timestamp of previous page,
+    so entities changed during sync don't shift pages. Entities with equal timestamp on edges of pages are not lost
+    and are not received twice.
+
+        Usage:
+        >>> sync = IncrementalSync(amocrm, path_to_file="sync_state.json")
+        >>> sync.sync(AmoCRM.ACTION.LEADS)
+        AmoCRMFuncResponce(status=True, detail='', data=[(cls) Leads {id: 12653276, ... }, ...])
+
+        >>> # Process changes page by page, watermark is saved after page is processed
+        >>> for responce in sync.iter_changes(AmoCRM.ACTION.CONTACTS):
+        >>>     save(responce.data)
+    """
+
+    def __init__(self, amocrm: AmoCRM, path_to_file: str = "sync_state.json", logger: loguru.Logger = loguru.logger):
+        self._amocrm = amocrm
+        self._path_to_file = path_to_file
+        self._logger = logger
+
+        self._state = self.load_state()
+
+    def __str__(self):
+        return f"IncrementalSync(path_to_file={self._path_to_file}, watermarks={self._state.watermarks})"
+
+    def load_state(self) -> SyncState:
+        " Load state of sync from file. If file is not found or is not correct, sync starts from beginning. "
+        if not os.path.exists(self._path_to_file): return SyncState()
+        try:
+            return SyncState.parse_file(self._path_to_file)
+        except (OSError, ValueError, ValidationError) as e:
+            self._logger.error(f"State of sync is not loaded! Sync starts from beginning. error -> {e}")
+            return SyncState()
+
+    def save_state(self) -> bool:
+        " Save state of sync to file. File is replaced atomically, state is not broken if process is stopped. "
+        path_to_tmp_file = f"{self._path_to_file}.tmp"
+        try:
+            with open(path_to_tmp_file, "w", encoding="UTF-8") as file:
+                file.write(self._state.json())
+            os.replace(path_to_tmp_file, self._path_to_file)
+        except OSError as e:
+            self._logger.error(e)
+            return False
+        return True
+
+    def get_watermark(self, action: AmoCRM.ACTION) -> SyncWatermark:
+        " Get watermark of action. "
+        return self._state.watermarks.get(action, SyncWatermark())
+
+    def set_watermark(self, action: AmoCRM.ACTION, watermark: SyncWatermark) -> bool:
+        " Set watermark of action and save state. Ex: start sync from timestamp. "
+        self._state.watermarks[action] = watermark
+        return self.save_state()
+
+    def reset(self, action: Optional[AmoCRM.ACTION] = None) -> bool:
+        " Reset watermark of action or all watermarks, next sync receives all entities. "
+        if action is None: self._state.watermarks.clear()
+        else: self._state.watermarks.pop(action, None)
+        return self.save_state()
+
+    def iter_changes(self, action: AmoCRM.ACTION, version_api: str = 'v4', limit: int = 250,
+                     validate: Optional[bool] = None) -> Iterator[AmoCRMFuncResponce]:
+        """ Iterate over changes of entities since watermark, page by page. Watermark is saved when next page is requested,
+        so page is received again after restart, if it was not processed. Iteration ends after last page or after
+        first not success responce (it is yielded too).
+
+        Args:
+            action (AmoCRM.ACTION): Action AmoCRM. Ex: LEADS, CONTACTS.
+            version_api (str, optional): Version api amocrm. Defaults to 'v4'.
+            limit (int, optional): Count of entities on page, max 250. Defaults to 250.
+            validate (Optional[bool], optional): Validate responces. None -> 'validate_responces' of settings. Defaults to None.
+
+        Yields:
+            Iterator[AmoCRMFuncResponce]: data is list of new or changed entities of page.
+        """
+        watermark = self.get_watermark(action)
+        updated_at, ids, page = watermark.updated_at, set(watermark.ids), 1
+
+        while True:
+            filters = FilterAmoCRM.create_update_at_filter(updated_at, limit=limit, page=page)
+            # Changes are always requested from server, cache is not used
+            code, responce_page = self._amocrm.get_page(self._amocrm.get_url(action, filters, version_api), validate, use_cache=False)
+
+            if responce_page is None:
+                # Empty page (204) is end of changes
+                if code != 204: yield AmoCRMFuncResponce(status=False, detail=f"Incorrect request! code -> {code}", data=None)
+                return
+
+            entities: list[Union[Leads, Contacts]] = get_embedded_items(responce_page.embedded)
+            changes = [entity for entity in entities if entity.updated_at != updated_at or entity.id not in ids]
+
+            last_updated_at = max(entity.updated_at for entity in entities)
+            if last_updated_at == updated_at:
+                # All entities of page have timestamp of watermark, next page is requested by number
+                ids.update(entity.id for entity in entities)
+                page += 1
+            else:
+                updated_at, page = last_updated_at, 1
+                ids = {entity.id for entity in entities if entity.updated_at == last_updated_at}
+
+            yield AmoCRMFuncResponce(status=True, data=changes)
+
+            self.set_watermark(action, SyncWatermark(updated_at=updated_at, ids=sorted(ids)))
+            if len(entities) < limit or not responce_page.links.next: return
+
+    def sync(self, action: AmoCRM.ACTION, version_api: str = 'v4', limit: int = 250,
+             validate: Optional[bool] = None) -> AmoCRMFuncResponce:
+        """ Get all changes of entities since watermark.
+
+        Returns:
+            AmoCRMFuncResponce: data is list of new or changed entities. If request is not success, status is False
+                and data has changes received before error, watermark is saved for them.
+        """
+        data = []
+        for responce in self.iter_changes(action, version_api=version_api, limit=limit, validate=validate):
+            if not responce.status: return AmoCRMFuncResponce(status=False, detail=responce.detail, data=data)
+            data.extend(responce.data)
+        return AmoCRMFuncResponce(status=True, data=data)
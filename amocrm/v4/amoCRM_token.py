@@ -0,0 +1,53 @@
+" File with token manager for AmoCRM connector "
+
+from __future__ import annotations
+from typing import Optional
+
+import time
+import threading
+
+
+class TokenManager:
+    """ Keep access token, refresh token and time of expiry of access token. Thread safe.
+    Token is expiring {refresh_leeway} seconds before real expiry, so it is refreshed before requests start to fail.
+
+        Usage:
+        >>> manager = TokenManager(access_token="eyJ0eXAiOiJK...", refresh_token="twi8gZOd86...")
+        >>> manager.set_tokens("eyJ0eXAiOiJK...", "twi8gZOd86...", expires_in=86400)
+        >>> manager.is_valid()
+        True
+    """
+
+    def __init__(self, access_token: Optional[str] = None, refresh_token: Optional[str] = None, expires_at: Optional[int] = None,
+                 refresh_leeway: int = 300):
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.refresh_leeway = refresh_leeway
+
+        # Lock of refresh, only one thread refreshes tokens at the same time
+        self.lock = threading.RLock()
+
+    def __str__(self):
+        return f"TokenManager(expires_at={self.expires_at}, is_valid={self.is_valid()}, is_expired={self.is_expired()})"
+
+    def set_tokens(self, access_token: str, refresh_token: str, expires_in: Optional[int] = None, expires_at: Optional[int] = None) -> None:
+        """ Set new tokens.
+
+        Args:
+            access_token (str): Access token.
+            refresh_token (str): Refresh token.
+            expires_in (Optional[int], optional): Lifetime of access token, seconds. Defaults to None.
+            expires_at (Optional[int], optional): Timestamp of expiry of access token, used if {expires_in} is not set. Defaults to None.
+        """
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = int(time.time()) + expires_in if expires_in is not None else expires_at
+
+    def is_expired(self) -> bool:
+        " Access token is expired or will expire soon. False if time of expiry is unknown. "
+        return self.expires_at is not None and time.time() >= self.expires_at - self.refresh_leeway
+
+    def is_valid(self) -> bool:
+        " Access token is set and is not expired by known time of expiry. "
+        return bool(self.access_token) and self.expires_at is not None and not self.is_expired()
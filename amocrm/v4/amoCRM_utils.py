@@ -1,11 +1,10 @@
 " File with utils for AmoCRM connector "
 
 from __future__ import annotations
-from typing import Any, Iterable
-
+from typing import Any, Iterable, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 import json
-import pytz
 import datetime 
 import loguru
 
@@ -17,15 +16,22 @@ def save_tokens_to_file(access_token:str, refresh_token:str, *args, **kwargs) ->
         access_token (str): access token to amocrm
         refresh_token (str): refresh token to amocrm
 
+    Kwargs:
+        path_to_save_file (str): path to file. Defaults to "access_tokens.json".
+        expires_at (int): timestamp of expiry of access token.
+
     Returns:
         bool: Is success update or not
     """
+    import pytz
+    
     try:
         with open(kwargs.get("path_to_save_file", "access_tokens.json"), "w", encoding="UTF-8") as file:
             json.dump({
                 "time_update": str(datetime.datetime.now(pytz.timezone("Europe/Moscow"))),
                 "access_token": access_token,
-                "refresh_token": refresh_token
+                "refresh_token": refresh_token,
+                "expires_at": kwargs.get("expires_at")
             }, file)
     except OSError as e:
         loguru.logger.error(e)
@@ -48,4 +54,57 @@ def batch(iterable: Iterable, count_batch: int=50) -> list[Any]:
     
     l = len(iterable)
     for ndx in range(0, l, count_batch):
-        yield iterable[ndx:min(ndx + count_batch, l)]
\ No newline at end of file
+        yield iterable[ndx:min(ndx + count_batch, l)]
+
+def get_embedded_items(embedded: Any) -> list[Any]:
+    """ Get items from embedded model of responce. Embedded model has one field with list of items.
+
+    Args:
+        embedded (Any): Embedded model. Ex: DataLeads, DataContactsPatch.
+
+    Returns:
+        list[Any]: Items of embedded model. Ex: list[Leads]
+    """
+    if embedded is None: return []
+    return next(iter(embedded.__dict__.values()), None) or []
+
+def set_url_page(url: str, page: int) -> str:
+    """ Set number page in query of url. Other query params are saved.
+
+    Args:
+        url (str): Url of request to amocrm. Ex: https://test.amocrm.ru/api/v4/leads?limit=250
+        page (int): Number page.
+
+    Returns:
+        str: Url with query param page. Ex: https://test.amocrm.ru/api/v4/leads?limit=250&page=2
+    """
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'page']
+    query.append(('page', str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query, safe='[]')))
+
+def add_filter_with(filters: str, value: str) -> str:
+    """ Add value to parameter 'with' of filters, other parameters are not changed.
+
+    Args:
+        filters (str): Filters of request. Ex: limit=250&with=catalog_elements
+        value (str): Value of 'with'. Ex: contacts
+
+    Returns:
+        str: Filters with value in 'with'. Ex: limit=250&with=catalog_elements,contacts
+    """
+    params = filters.split('&') if filters else []
+    for number, param in enumerate(params):
+        key, _, values = param.partition('=')
+        if key != 'with': continue
+        if value not in values.split(','): params[number] = f"with={values},{value}" if values else f"with={value}"
+        return '&'.join(params)
+    return '&'.join([*params, f"with={value}"])
+
+def get_lead_contacts(leads: Iterable[Any]) -> list[Tuple[int, int, Optional[bool]]]:
+    """ Get links of leads and contacts from embedded contacts of leads (filter 'with=contacts').
+
+    Returns:
+        list[Tuple[int, int, Optional[bool]]]: (lead id, contact id, is main contact) in order of leads and contacts of lead.
+    """
+    return [(lead.id, contact.id, contact.is_main) for lead in leads for contact in lead.embedded.contacts or []]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from enum import Enum
 
-from typing import Any, Optional, Union
+from typing import Any, Optional, Tuple, Union
 from pydantic import BaseModel, HttpUrl
 from pydantic.networks import EmailStr
 
@@ -13,7 +13,7 @@ class NavHref(BaseModel):
 
 class RequestLinks(BaseModel):
     self: NavHref
-    next: NavHref
+    next: Optional[NavHref] # Last page don't have next link
     
 class Links(BaseModel):
     self: NavHref
@@ -37,6 +37,7 @@ class Companies(BaseModel):
 
 class ContactsShort(BaseModel):
     id: int
+    is_main: Optional[bool] # Main contact of lead
 
 class Embedded(BaseModel):
     tags: list[Tags]
@@ -156,6 +157,20 @@ class EmbeddedLeads(BaseModel):
 class EmbeddedContact(BaseModel):
     tags: list[Tags]
 
+class CustomFieldEnum(BaseModel):
+    id: int
+    value: str
+    sort: Optional[int]
+
+class CustomFieldSchema(BaseModel):
+    id: int
+    name: str
+    type: str # Ex: text, numeric, checkbox, select, multiselect, multitext, date, date_time
+    code: Optional[str]
+    sort: Optional[int]
+    is_api_only: Optional[bool]
+    enums: Optional[list[CustomFieldEnum]]
+
 ## ---- DATA MODEL END ----
 
 # ------------------------------
@@ -168,6 +183,9 @@ class DataLeads(BaseModel):
 class DataContacts(BaseModel):
     contacts: list[Contacts]
 
+class DataCustomFields(BaseModel):
+    custom_fields: list[CustomFieldSchema]
+
 ## ---- DATA MODEL LIST END ----
 
 # ------------------------------
@@ -221,6 +239,15 @@ class LeadsPost(BaseModel):
 class DataLeadsPost(BaseModel):
     leads: list[LeadsPost]
 
+# ~ POST LEADS COMPLEX
+
+class LeadsComplexPost(BaseModel):
+    id: int # Id of lead
+    contact_id: Optional[int]
+    company_id: Optional[int]
+    request_id: list[str] # request_id of sent lead
+    merged: bool = False # Lead is merged with existing lead (duplicate control)
+
 # ~ POST CONTACTS
 
 class AmoRequestPostContact(BaseModel):
@@ -373,6 +400,9 @@ class AmoResponcePost(BaseModel):
             'embedded': '_embedded'
         }
 
+class AmoResponcePostComplex(BaseModel):
+    __root__: list[LeadsComplexPost] # Responce of 'leads/complex' is array of added leads
+    
 class AmoResponcePatch(BaseModel):
     links: Links
     embedded: Union[DataContactsPatch, DataLeadsPatch] 
@@ -383,6 +413,18 @@ class AmoResponcePatch(BaseModel):
             'embedded': '_embedded'
         }
 
+class AmoResponceCustomFields(BaseModel):
+    page: int
+    links: RequestLinks
+    embedded: DataCustomFields
+    
+    class Config:
+        fields = {
+            'page': '_page',
+            'links': '_links',
+            'embedded': '_embedded'
+        }
+
 ### ---- MAIN MODEL END ----
 
 # ------------------------------
@@ -397,14 +439,29 @@ class ModeSaveToken(BaseModel):
     mode: ModeSaveTokenEnum = ModeSaveTokenEnum.LOCAL_FILE
     path_to_file: Optional[str]
 
+class RetryPolicy(BaseModel):
+    max_attempts: int = 5 # Count of attempts with first request. 1 -> without retry
+    status_codes: list[int] = [429, 500, 502, 503, 504] # Codes for retry of safe methods (GET)
+    unsafe_status_codes: list[int] = [429] # Codes for retry of POST and PATCH, request was not processed by server
+    retry_unsafe_methods: bool = False # Retry POST and PATCH same as GET
+    backoff_factor: float = 0.5 # Delay before attempt N = backoff_factor * 2 ** (N - 1), seconds
+    backoff_max: float = 30.0 # Max delay, seconds
+    jitter: float = 0.5 # Random part of delay, 0 -> without jitter, 1 -> delay from 0 to full delay
+    respect_retry_after: bool = True # Use header Retry-After of responce as delay
+    retry_after_max: float = 120.0 # Max delay from header Retry-After, seconds
+    timeout: Optional[float] = 30.0 # Timeout of one request, seconds. None -> without timeout
+
 class AmoCRMInit(BaseModel):
     debug: bool = True
     connect_email: EmailStr
     connect_domain: str
+    base_url: Optional[str] # Url of server instead of https://{connect_domain}.amocrm.ru. Ex: local server of benchmarks
     connect_id: str
     connect_secret_key: str
     refresh_token: Optional[str]
     access_token: Optional[str]
+    token_expires_at: Optional[int] # Timestamp of expiry of access token. If set, account is not checked on init
+    token_refresh_leeway: int = 300 # Token is refreshed this count of seconds before expiry
     redirect_uri: HttpUrl
     init_code: Optional[str]
     
@@ -414,6 +471,17 @@ class AmoCRMInit(BaseModel):
     }
     check_auth_in_init: bool = True
     attempts_conn: int = 5
+    
+    pool_connections: int = 10 # Count of cached connection pools (one pool per host)
+    pool_maxsize: int = 10 # Max count of keep-alive connections in pool
+    
+    rate_limit: Optional[float] = 7.0 # Max count of requests per second to account. None -> without limit
+    rate_burst: int = 7 # Max count of requests without waiting
+    
+    retry_policy: RetryPolicy = RetryPolicy()
+    
+    validate_responces: bool = True # Validate GET responces. False -> models are built from trusted json without validation
+    custom_fields_ttl: float = 3600.0 # Lifetime of cached schema of custom fields, seconds
 
 ## ---- INIT MODEL END ----
 
@@ -451,7 +519,97 @@ class AmoCRMFuncResponce(BaseModel):
     status: bool
     detail: str = "Success"
     data: Any
+    errors: list[Any] = [] # Failed parts of request. Ex: failed batches of POST, not found ids of 'get_by_ids'
+
+class AmoResponceBatch(BaseModel):
+    index: int # Number of batch in order of data
+    request_ids: list[Optional[str]] # request_id of sent items, in order of items
+    ids: list[int] = [] # id of sent items, if they have id. Ex: PATCH
+    failed_ids: list[int] = [] # id of sent items, which are not in success responce
+    failed_request_ids: list[str] = [] # request_id of sent items without id, which are not in success responce. Ex: POST
+    request_items: dict[str, Any] = {} # request_id of sent item -> item of success responce. Ex: LeadsPost, LeadsComplexPost
+    is_success: bool
+    detail: str = "Success"
+    data: Any # Responce model of batch. Ex: AmoResponcePost, AmoResponcePostError or None if responce is not parsed
+
+class AmoLeadsContacts(BaseModel):
+    leads: list[Any] # Leads or LeadRecord
+    contacts: list[Any] # Contacts or ContactRecord, each contact once
+    lead_contacts: list[Tuple[int, int, Optional[bool]]] # (lead id, contact id, is main contact), all contacts of leads
 
 ## ---- FUNC RESPONCE MODEL ----
 
+# ------------------------------
+
+## ---- STATISTIC MODEL ----
+
+class RateLimiterStatistic(BaseModel):
+    count_requests: int
+    count_waits: int
+    wait_time: float # Sum of waiting, seconds
+    max_wait_time: float # Seconds
+
+class CacheStatistic(BaseModel):
+    count_hits: int # Responces from cache, with revalidated responces
+    count_misses: int # Responces from network
+    count_revalidations: int # Stale responces confirmed by server (304)
+    count_invalidations: int # Removed responces after POST and PATCH
+    size: int # Count of responces in cache
+
+## ---- STATISTIC MODEL END ----
+
+# ------------------------------
+
+## ---- CACHE MODEL ----
+
+class CacheEntry(BaseModel):
+    url: str
+    action: str # First part of action, used for invalidation. Ex: leads for leads/complex
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float # Timestamp
+    expires_at: float # Timestamp, after it responce is revalidated or requested again
+
+## ---- CACHE MODEL END ----
+
+# ------------------------------
+
+## ---- SYNC MODEL ----
+
+class SyncWatermark(BaseModel):
+    updated_at: int = 0 # Max 'updated_at' of received entities, next sync starts from this timestamp
+    ids: list[int] = [] # Ids of received entities with 'updated_at' equal to watermark, they are skipped on next sync
+
+class SyncState(BaseModel):
+    watermarks: dict[str, SyncWatermark] = {} # Key is action. Ex: leads, contacts
+
+## ---- SYNC MODEL END ----
+
+# ------------------------------
+
+## ---- METRICS MODEL ----
+
+class RequestEvent(BaseModel):
+    method: str
+    url: str
+    action: str # Action of url without ids. Ex: leads, leads/custom_fields, oauth2/access_token
+    attempt: int # Number of attempt, > 1 on retry
+    throttle_wait: float # Waiting on rate limiter before request, seconds
+    bytes_sent: int # Size of body
+
+class ResponceEvent(BaseModel):
+    method: str
+    url: str
+    action: str
+    attempt: int
+    status_code: Optional[int] # None on error of connection
+    error: Optional[str] # Error of connection
+    elapsed: float # Time of request, seconds
+    bytes_sent: int
+    bytes_received: int # Size of body of responce
+    retry_delay: Optional[float] # Waiting before next attempt, seconds. None, if request is not retried
+
+## ---- METRICS MODEL END ----
+
 # ------------------------------
\ No newline at end of file
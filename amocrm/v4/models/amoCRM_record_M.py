@@ -0,0 +1,199 @@
+" Compact records of read results. Records use slots, links are flat strings, repeated strings are interned "
+
+from __future__ import annotations
+from typing import Any, Optional, Union
+
+from sys import intern
+
+from amocrm.v4.models.amoCRM_M import Contacts, CustomField, Leads
+
+
+def _intern(value: Any) -> Any:
+    " Intern string, other values are returned as is. "
+    return intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    " Base of records. Record is compared and printed by fields, it has no __dict__. "
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args): object.__setattr__(self, name, value)
+        for name, value in kwargs.items(): object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        if type(other) is not type(self): return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def dict(self) -> dict[str, Any]:
+        " Convert record with nested records to dict. "
+        return {name: _record_to_value(getattr(self, name)) for name in self.__slots__}
+
+
+def _record_to_value(value: Any) -> Any:
+    if isinstance(value, Record): return value.dict()
+    if isinstance(value, tuple): return [_record_to_value(item) for item in value]
+    return value
+
+
+## ---- SUB RECORD ----
+
+class TagRecord(Record):
+    __slots__ = ('id', 'name')
+    id: int
+    name: str
+
+class CompanyRecord(Record):
+    __slots__ = ('id', 'link')
+    id: int
+    link: str
+
+class CustomFieldValueRecord(Record):
+    __slots__ = ('value', 'enum_id', 'enum_code')
+    value: Union[str, int]
+    enum_id: Optional[int]
+    enum_code: Optional[str]
+
+class CustomFieldRecord(Record):
+    __slots__ = ('field_id', 'field_name', 'field_code', 'field_type', 'values')
+    field_id: int
+    field_name: str
+    field_code: Optional[str]
+    field_type: str
+    values: tuple[CustomFieldValueRecord, ...]
+
+## ---- SUB RECORD END ----
+
+# ------------------------------
+
+## ---- DATA RECORD ----
+
+class LeadRecord(Record):
+    __slots__ = ('id', 'name', 'price', 'responsible_user_id', 'group_id', 'status_id', 'pipeline_id', 'loss_reason_id',
+                 'created_by', 'updated_by', 'created_at', 'updated_at', 'closed_at', 'closest_task_at', 'is_deleted',
+                 'custom_fields_values', 'score', 'account_id', 'link', 'tags', 'companies', 'contact_ids')
+    id: int
+    name: str
+    price: int
+    responsible_user_id: int
+    group_id: int
+    status_id: int
+    pipeline_id: int
+    loss_reason_id: Optional[int]
+    created_by: int
+    updated_by: int
+    created_at: int
+    updated_at: int
+    closed_at: Optional[int]
+    closest_task_at: Optional[int]
+    is_deleted: bool
+    custom_fields_values: Optional[tuple[CustomFieldRecord, ...]]
+    score: Optional[int]
+    account_id: int
+    link: str
+    tags: tuple[TagRecord, ...]
+    companies: tuple[CompanyRecord, ...]
+    contact_ids: tuple[int, ...]
+
+class ContactRecord(Record):
+    __slots__ = ('id', 'name', 'first_name', 'last_name', 'responsible_user_id', 'group_id', 'created_by', 'updated_by',
+                 'created_at', 'updated_at', 'closest_task_at', 'is_deleted', 'custom_fields_values', 'account_id',
+                 'link', 'tags', 'companies')
+    id: int
+    name: str
+    first_name: str
+    last_name: Optional[str]
+    responsible_user_id: int
+    group_id: int
+    created_by: int
+    updated_by: int
+    created_at: int
+    updated_at: int
+    closest_task_at: Optional[int]
+    is_deleted: bool
+    custom_fields_values: Optional[tuple[CustomFieldRecord, ...]]
+    account_id: int
+    link: str
+    tags: tuple[TagRecord, ...]
+    companies: tuple[CompanyRecord, ...]
+
+## ---- DATA RECORD END ----
+
+# ------------------------------
+
+## ---- CREATE RECORD ----
+
+class RecordFactory:
+    """ Create records from models of responces. Equal tags and companies of one factory are one object.
+
+        Usage:
+        >>> factory = RecordFactory()
+        >>> factory.create(lead)
+        LeadRecord(id=12653276, name='Name', price=0, ..., link='https://example.amocrm.ru/api/v4/leads/12653276', ...)
+    """
+
+    def __init__(self):
+        self._tags: dict[tuple[int, str], TagRecord] = {}
+        self._companies: dict[tuple[int, str], CompanyRecord] = {}
+
+    def create(self, entity: Union[Leads, Contacts]) -> Union[LeadRecord, ContactRecord]:
+        " Create record from Leads or Contacts. "
+        if isinstance(entity, Leads): return self.create_lead(entity)
+        if isinstance(entity, Contacts): return self.create_contact(entity)
+        raise TypeError(f"Type of entity is not allowed! type -> {type(entity)}")
+
+    def create_lead(self, lead: Leads) -> LeadRecord:
+        embedded = lead.embedded
+        return LeadRecord(
+            lead.id, lead.name, lead.price, lead.responsible_user_id, lead.group_id, lead.status_id, lead.pipeline_id,
+            lead.loss_reason_id, lead.created_by, lead.updated_by, lead.created_at, lead.updated_at, lead.closed_at,
+            lead.closest_task_at, lead.is_deleted, self._create_custom_fields(lead.custom_fields_values), lead.score,
+            lead.account_id, str(lead.links.self.href), self._create_tags(embedded.tags), self._create_companies(embedded.companies),
+            tuple(contact.id for contact in embedded.contacts) if embedded.contacts else ()
+        )
+
+    def create_contact(self, contact: Contacts) -> ContactRecord:
+        embedded = contact.embedded
+        return ContactRecord(
+            contact.id, contact.name, contact.first_name, contact.last_name, contact.responsible_user_id, contact.group_id,
+            contact.created_by, contact.updated_by, contact.created_at, contact.updated_at, contact.closest_task_at,
+            contact.is_deleted, self._create_custom_fields(contact.custom_fields_values), contact.account_id,
+            str(contact.links.self.href), self._create_tags(embedded.tags), self._create_companies(embedded.companies)
+        )
+
+    def _create_custom_fields(self, fields: Optional[list[CustomField]]) -> Optional[tuple[CustomFieldRecord, ...]]:
+        if fields is None: return None
+        return tuple(
+            CustomFieldRecord(
+                field.field_id, _intern(field.field_name), _intern(field.field_code), _intern(field.field_type),
+                tuple(CustomFieldValueRecord(_intern(value.value), value.enum_id, _intern(value.enum_code)) for value in field.values)
+            ) for field in fields
+        )
+
+    def _create_tags(self, tags: list) -> tuple[TagRecord, ...]:
+        if not tags: return ()
+        records = []
+        for tag in tags:
+            record = self._tags.get((tag.id, tag.name))
+            if record is None: record = self._tags[(tag.id, tag.name)] = TagRecord(tag.id, intern(tag.name))
+            records.append(record)
+        return tuple(records)
+
+    def _create_companies(self, companies: list) -> tuple[CompanyRecord, ...]:
+        if not companies: return ()
+        records = []
+        for company in companies:
+            link = str(company.links.self.href)
+            record = self._companies.get((company.id, link))
+            if record is None: record = self._companies[(company.id, link)] = CompanyRecord(company.id, link)
+            records.append(record)
+        return tuple(records)
+
+## ---- CREATE RECORD END ----
@@ -0,0 +1,174 @@
+""" Benchmark of main paths of connector against local fake AmoCRM server: get_data, get_data_df, post, patch.
+Reports throughput, latency percentiles of requests and peak memory. Results can be saved to json and compared
+with results of other version.
+
+    Usage:
+    >>> python -m benchmarks.bench_connector --leads 20000 --latency 0.02 --json before.json
+    >>> python -m benchmarks.bench_connector --leads 20000 --latency 0.02 --compare before.json
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Optional
+
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from benchmarks.fake_server import FakeAmoCRMServer
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_pipeline import ExportPipeline
+from amocrm.v4.models.amoCRM_M import AmoCRMFuncResponce, AmoCRMInit, AmoRequestPatchLeads, AmoRequestPostLeads, ContactsOptional, EmbeddedLeads
+
+from requests import Response
+
+
+class TimedAmoCRM(AmoCRM):
+    " Connector with time of each request (with retries). "
+
+    def __init__(self, *args, **kwargs):
+        self.latencies: list[float] = []
+        super().__init__(*args, **kwargs)
+
+    def _send_request(self, method: str, url: str, **kwargs) -> Response:
+        start = time.perf_counter()
+        try:
+            return super()._send_request(method, url, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def create_settings(base_url: str, path_to_tokens: str, rate_limit: Optional[float]) -> AmoCRMInit:
+    " Settings of connector to fake server. Token is not expired, so connector does not check account. "
+    return AmoCRMInit(
+        connect_email="benchmark@example.com", connect_domain="benchmark", base_url=base_url, connect_id="id",
+        connect_secret_key="secret", redirect_uri="https://example.com", access_token="access", refresh_token="refresh",
+        token_expires_at=int(time.time()) + 86400, check_auth_in_init=False, debug=False, rate_limit=rate_limit,
+        mode_save_token={"mode": "local_file", "path_to_file": path_to_tokens}
+    )
+
+
+def get_percentile(values: list[float], percent: float) -> float:
+    " Get percentile of values (nearest rank). "
+    if not values: return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))]
+
+
+def create_scenarios(count_leads: int, count_contacts: int, count_post: int) -> dict[str, tuple[Callable[[AmoCRM], AmoCRMFuncResponce], int]]:
+    " Scenarios: name -> (function, count of entities). "
+    post_leads = [AmoRequestPostLeads(name=f"Lead {number}", price=number, request_id=str(number)) for number in range(count_post)]
+    post_complex = [AmoRequestPostLeads(name=f"Lead {number}", request_id=str(number),
+                                        embedded=EmbeddedLeads(contacts=[ContactsOptional(first_name=f"Contact {number}")]))
+                    for number in range(count_post)]
+    patch_leads = [AmoRequestPatchLeads(id=number + 1, price=number) for number in range(count_post)]
+
+    return {
+        "get_data leads": (lambda amocrm: amocrm.get_data(AmoCRM.ACTION.LEADS, "limit=250", get_all_data=True), count_leads),
+        "get_data leads workers=5": (
+            lambda amocrm: amocrm.get_data(AmoCRM.ACTION.LEADS, "limit=250", get_all_data=True, max_workers=5), count_leads),
+        "get_data leads validate=False": (
+            lambda amocrm: amocrm.get_data(AmoCRM.ACTION.LEADS, "limit=250", get_all_data=True, max_workers=5, validate=False), count_leads),
+        "get_data_df leads workers=5": (
+            lambda amocrm: amocrm.get_data_df(AmoCRM.ACTION.LEADS, "limit=250", get_all_data=True, max_workers=5), count_leads),
+        "get_data_df leads pipeline p=4": (
+            lambda amocrm: ExportPipeline(amocrm, max_processes=4, max_workers=5).get_data_df(AmoCRM.ACTION.LEADS), count_leads),
+        "get_data_df contacts": (lambda amocrm: amocrm.get_data_df(AmoCRM.ACTION.CONTACTS, "limit=250", get_all_data=True), count_contacts),
+        "post leads": (lambda amocrm: amocrm.post(AmoCRM.ACTION.LEADS, post_leads), count_post),
+        "post leads/complex": (lambda amocrm: amocrm.post(AmoCRM.ACTION.LEADS_COMPLEX, post_complex), count_post),
+        "post leads/complex workers=4": (lambda amocrm: amocrm.post(AmoCRM.ACTION.LEADS_COMPLEX, post_complex, max_workers=4), count_post),
+        "patch leads workers=4": (lambda amocrm: amocrm.patch(AmoCRM.ACTION.LEADS, patch_leads, max_workers=4), count_post),
+    }
+
+
+def run_scenario(func: Callable[[AmoCRM], AmoCRMFuncResponce], count: int, settings: AmoCRMInit, measure_memory: bool) -> dict[str, Any]:
+    """ Run scenario on new connector. First run is warm-up (pages are generated and cached by server), peak memory
+    is measured on it by tracemalloc. Time is measured on second run without tracemalloc (it slows down code).
+    """
+    peak_mib = 0.0
+    amocrm = TimedAmoCRM(settings)
+    gc.collect()
+    if measure_memory: tracemalloc.start()
+    responce = func(amocrm)
+    if measure_memory:
+        peak_mib = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    amocrm.close()
+    del responce
+
+    amocrm = TimedAmoCRM(settings)
+    gc.collect()
+    start = time.perf_counter()
+    responce = func(amocrm)
+    seconds = time.perf_counter() - start
+    amocrm.close()
+    status = responce.status
+    del responce
+
+    result = {
+        "status": status, "seconds": seconds, "entities_per_s": count / seconds, "requests": len(amocrm.latencies),
+        "p50_ms": get_percentile(amocrm.latencies, 50) * 1000, "p95_ms": get_percentile(amocrm.latencies, 95) * 1000,
+        "p99_ms": get_percentile(amocrm.latencies, 99) * 1000, "peak_mib": peak_mib
+    }
+    return result
+
+
+def print_results(results: dict[str, dict[str, float]], base: Optional[dict[str, dict[str, float]]] = None) -> None:
+    " Print table of results. With {base} throughput and memory are compared with base results. "
+    print(f"{'scenario':<31} {'time s':>8} {'entity/s':>10} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak MiB':>9}")
+    for name, result in results.items():
+        line = (f"{name:<31} {result['seconds']:8.2f} {result['entities_per_s']:10.0f} {result['requests']:8.0f} {result['p50_ms']:8.1f} "
+                f"{result['p95_ms']:8.1f} {result['p99_ms']:8.1f} {result['peak_mib']:9.1f}")
+        if not result['status']: line += " | FAILED"
+        if base and name in base:
+            line += f" | throughput x{result['entities_per_s'] / base[name]['entities_per_s']:.2f}"
+            if result['peak_mib'] and base[name]['peak_mib']: line += f", memory x{result['peak_mib'] / base[name]['peak_mib']:.2f}"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=10000, help="Count of leads on server")
+    parser.add_argument("--contacts", type=int, default=5000, help="Count of contacts on server")
+    parser.add_argument("--post", type=int, default=1000, help="Count of entities in POST and PATCH")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean latency of server, seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Part of requests with 429 responce")
+    parser.add_argument("--rate-error", type=float, default=0.0, help="Part of requests with 5xx responce")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Rate limit of connector, requests per second")
+    parser.add_argument("--scenario", action="append", help="Run only this scenario (can be repeated)")
+    parser.add_argument("--skip-memory", action="store_true", help="Do not measure peak memory")
+    parser.add_argument("--json", help="Save results to json file")
+    parser.add_argument("--compare", help="Compare with results from json file")
+    args = parser.parse_args()
+
+    scenarios = create_scenarios(args.leads, args.contacts, args.post)
+    names = args.scenario or list(scenarios)
+    results: dict[str, dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory() as directory, \
+         FakeAmoCRMServer(args.leads, args.contacts, latency=args.latency, rate_429=args.rate_429, rate_error=args.rate_error) as server:
+        settings = create_settings(server.base_url, os.path.join(directory, "tokens.json"), args.rate_limit)
+        for name in names:
+            func, count = scenarios[name]
+            results[name] = run_scenario(func, count, settings, measure_memory=not args.skip_memory)
+        print(f"server {server.base_url} | leads {args.leads} | contacts {args.contacts} | latency {args.latency} s "
+              f"| 429 {args.rate_429:.1%} | errors {args.rate_error:.1%} | responces {server.get_stats()}")
+
+    base = None
+    if args.compare:
+        with open(args.compare, encoding="UTF-8") as file: base = json.load(file)["results"]
+    print_results(results, base)
+
+    if args.json:
+        with open(args.json, "w", encoding="UTF-8") as file:
+            json.dump({"settings": vars(args), "results": results}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
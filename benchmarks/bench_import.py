@@ -0,0 +1,64 @@
+" Benchmark of import time of AmoCRM connector. Exit code is 1, if heavy modules are imported or time is over limit. "
+
+from __future__ import annotations
+
+import sys
+import argparse
+import statistics
+import subprocess
+
+
+MODULE = "amocrm.v4.amoCRM"
+
+# Modules which must be loaded only on first use of Dataframe or filters
+LAZY_MODULES = ("pandas", "numpy", "pytz", "amocrm.v4.amoCRM_df")
+
+
+def measure_import_time(module: str) -> float:
+    """ Import module in new interpreter with '-X importtime' and get cumulative time of import.
+
+    Args:
+        module (str): Name of module.
+
+    Returns:
+        float: Time of import, milliseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        # Line format: "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.replace("import time:", "").split("|")]
+        if len(parts) == 3 and parts[2] == module: return int(parts[1]) / 1000
+    raise RuntimeError(f"Module '{module}' is not found in output of importtime!")
+
+
+def get_loaded_lazy_modules(module: str) -> list[str]:
+    " Get lazy modules, which are loaded after import of module. "
+    code = f"import sys, {module}; print(','.join(name for name in {LAZY_MODULES!r} if name in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=7, help="Count of measurements")
+    parser.add_argument("--max-ms", type=float, default=None, help="Max median time of import, milliseconds")
+    args = parser.parse_args()
+
+    times = [measure_import_time(MODULE) for _ in range(args.repeat)]
+    median = statistics.median(times)
+    loaded = get_loaded_lazy_modules(MODULE)
+
+    print(f"import {MODULE}: median {median:.1f} ms | min {min(times):.1f} ms | max {max(times):.1f} ms")
+    print(f"lazy modules loaded on import: {loaded or 'none'}")
+
+    if loaded:
+        print(f"FAIL: modules {loaded} must not be loaded on import of {MODULE}")
+        return 1
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median time of import {median:.1f} ms > {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+""" Benchmark of memory of read results: models of 'get_data' vs compact records ('get_data(compact=True)').
+Check of streaming export: peak memory of iteration over pages in thread pool ('iter_get_responces_parallel',
+'ArrowExport.iter_batches') must not grow with count of pages. Exit code is 1, if it grows.
+
+    Usage:
+    >>> python -m benchmarks.bench_memory --count 25000 --stream-count 5000
+"""
+
+from __future__ import annotations
+from typing import Iterator
+
+import os
+import gc
+import sys
+import argparse
+import tempfile
+import tracemalloc
+
+from benchmarks.bench_connector import create_settings
+from benchmarks.bench_parse import create_page
+from benchmarks.fake_server import FakeAmoCRMServer
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_parse import loads
+from amocrm.v4.models.amoCRM_M import AmoResponceGet
+from amocrm.v4.models.amoCRM_record_M import RecordFactory
+
+
+def load_entities(table: str, count: int, compact: bool, page_size: int = 250) -> list:
+    " Parse pages with {count} entities and keep entities, same as 'get_data' does. "
+    entities = []
+    factory = RecordFactory() if compact else None
+    content = create_page(table, page_size)
+    for _ in range(count // page_size):
+        page = AmoResponceGet.parse_obj(loads(content))
+        items = getattr(page.embedded, table)
+        entities.extend(map(factory.create, items) if factory else items)
+    return entities
+
+
+def measure(table: str, count: int, compact: bool) -> float:
+    " Get memory of kept entities, bytes per entity. "
+    gc.collect()
+    tracemalloc.start()
+    entities = load_entities(table, count, compact)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(entities)
+
+
+def iter_stream(amocrm: AmoCRM, mode: str, max_workers: int) -> Iterator:
+    " Iterate over all pages of leads in thread pool, pages are not kept. "
+    if mode == "arrow":
+        from amocrm.v4.amoCRM_arrow import ArrowExport
+        return ArrowExport(amocrm).iter_batches(AmoCRM.ACTION.LEADS, filters="limit=250", max_workers=max_workers)
+    return amocrm.iter_get_responces_parallel(AmoCRM.ACTION.LEADS, filters="limit=250", max_workers=max_workers)
+
+
+def measure_stream(count: int, mode: str, max_workers: int) -> float:
+    " Get peak memory of iteration over pages of {count} leads, bytes. "
+    with tempfile.TemporaryDirectory() as directory, FakeAmoCRMServer(count_leads=count, count_contacts=0) as server:
+        with AmoCRM(create_settings(server.base_url, os.path.join(directory, "tokens.json"), rate_limit=None)) as amocrm:
+            # First page is received before tracing: imports and one-off allocations of first call are not counted
+            responces = iter_stream(amocrm, mode, max_workers)
+            if not next(responces).status: raise RuntimeError("First page is not received")
+            gc.collect()
+            tracemalloc.start()
+            for responce in responces:
+                if not responce.status: raise RuntimeError(responce.detail)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return peak
+
+
+def check_stream(count: int, max_workers: int, max_ratio: float) -> bool:
+    """ Compare peak memory of streaming of {count} and 4 * {count} leads. Memory is bounded by window of pages,
+    so ratio of peaks is about 1. If all pages are kept, ratio is about 4.
+    """
+    modes = ["pages"]
+    try:
+        import pyarrow # noqa: F401
+        modes.append("arrow")
+    except ImportError:
+        print("arrow    : pyarrow is not installed, check is skipped")
+
+    is_success = True
+    for mode in modes:
+        small, big = measure_stream(count, mode, max_workers), measure_stream(4 * count, mode, max_workers)
+        ratio = big / small
+        is_success &= ratio <= max_ratio
+        print(f"{mode:<8} x{max_workers} workers: peak {small / 2 ** 20:6.1f} MiB ({count} leads) -> {big / 2 ** 20:6.1f} MiB "
+              f"({4 * count} leads) | x{ratio:.2f} | {'OK' if ratio <= max_ratio else f'FAIL (> x{max_ratio})'}")
+    return is_success
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=25000, help="Count of entities")
+    parser.add_argument("--stream-count", type=int, default=5000, help="Count of leads of check of streaming, 0 -> no check")
+    parser.add_argument("--max-workers", type=int, default=4, help="Count of threads of check of streaming")
+    parser.add_argument("--max-ratio", type=float, default=2.0, help="Max ratio of peaks of streaming of 4 * N and N leads")
+    args = parser.parse_args()
+
+    for table in ("leads", "contacts"):
+        models = measure(table, args.count, compact=False)
+        records = measure(table, args.count, compact=True)
+        print(f"{table:<8} x{args.count}: models {models:7.0f} B/entity | records {records:6.0f} B/entity | x{models / records:.1f} less "
+              f"| 1M entities: {models * 1e6 / 2 ** 30:.2f} GiB -> {records * 1e6 / 2 ** 30:.2f} GiB")
+
+    if args.stream_count and not check_stream(args.stream_count, args.max_workers, args.max_ratio): return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+" Benchmark of parse of GET page: validation of models vs fast path without validation (validate=False). "
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import argparse
+
+from amocrm.v4.amoCRM_parse import construct_model, loads, orjson
+from amocrm.v4.models.amoCRM_M import AmoResponceGet
+
+
+def create_lead(index: int) -> dict:
+    " Create lead in format of AmoCRM api. "
+    return {
+        "id": index, "name": f"Lead {index}", "price": index * 10, "responsible_user_id": 1, "group_id": 0, "status_id": 142,
+        "pipeline_id": 5, "loss_reason_id": None, "created_by": 1, "updated_by": 1, "created_at": 1623170867 + index,
+        "updated_at": 1623170867 + index, "closed_at": None, "closest_task_at": None, "is_deleted": False,
+        "custom_fields_values": [{"field_id": 7, "field_name": "Source", "field_code": None, "field_type": "select",
+                                  "values": [{"value": "site", "enum_id": 11, "enum_code": None}]}],
+        "score": None, "account_id": 1, "_links": {"self": {"href": f"https://example.amocrm.ru/api/v4/leads/{index}"}},
+        "_embedded": {"tags": [{"id": 1, "name": "tag"}], "companies": [],
+                      "contacts": [{"id": 100 + index, "is_main": True}]}
+    }
+
+
+def create_contact(index: int) -> dict:
+    " Create contact in format of AmoCRM api. "
+    return {
+        "id": index, "name": f"Contact {index}", "first_name": "Name", "last_name": None, "responsible_user_id": 1, "group_id": 0,
+        "created_by": 1, "updated_by": 1, "created_at": 1623170867 + index, "updated_at": 1623170867 + index,
+        "closest_task_at": None, "is_deleted": False,
+        "custom_fields_values": [{"field_id": 1, "field_name": "Email", "field_code": "EMAIL", "field_type": "multitext",
+                                  "values": [{"value": f"mail{index}@example.com", "enum_id": 3, "enum_code": "WORK"}]}],
+        "account_id": 1, "_links": {"self": {"href": f"https://example.amocrm.ru/api/v4/contacts/{index}"}},
+        "_embedded": {"tags": [], "companies": [{"id": 5, "_links": {"self": {"href": "https://example.amocrm.ru/api/v4/companies/5"}}}]}
+    }
+
+
+def create_page(table: str, size: int) -> bytes:
+    " Create body of GET responce with {size} entities. "
+    create_entity = create_lead if table == "leads" else create_contact
+    return json.dumps({
+        "_page": 1, "_links": {"self": {"href": f"https://example.amocrm.ru/api/v4/{table}?page=1&limit={size}"},
+                               "next": {"href": f"https://example.amocrm.ru/api/v4/{table}?page=2&limit={size}"}},
+        "_embedded": {table: [create_entity(index) for index in range(1, size + 1)]}
+    }).encode()
+
+
+def measure(func, content: bytes, repeat: int) -> float:
+    " Get best time of function call from {repeat} calls, milliseconds. "
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=250, help="Count of entities on page")
+    parser.add_argument("--repeat", type=int, default=30, help="Count of measurements")
+    args = parser.parse_args()
+
+    print(f"json parser of fast path: {'orjson' if orjson is not None else 'json'}")
+    for table in ("leads", "contacts"):
+        content = create_page(table, args.size)
+        validated = measure(lambda body: AmoResponceGet.parse_obj(json.loads(body)), content, args.repeat)
+        fast = measure(lambda body: construct_model(AmoResponceGet, loads(body)), content, args.repeat)
+        print(f"{table:<8} page of {args.size}: validate {validated:7.2f} ms | validate=False {fast:6.2f} ms | x{validated / fast:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+""" Local fake AmoCRM server for benchmarks. Server runs in separate process, so its memory and CPU are not measured
+with connector. Leads and contacts are generated by index with fixed seed, pages are same on each run.
+
+Endpoints:
+    GET   /api/v4/leads, /api/v4/contacts (limit, page, filter[id][], filter[created_at], filter[updated_at]; 204 after last page)
+    GET   /api/v4/leads/custom_fields, /api/v4/contacts/custom_fields, /api/v4/account
+    POST  /api/v4/leads, /api/v4/contacts, /api/v4/leads/complex
+    PATCH /api/v4/leads, /api/v4/contacts
+    POST  /oauth2/access_token
+    GET   /_stats (count of requests by code)
+    POST  /_faults (scripted faults of next requests, clears log of requests), GET /_requests (log of requests)
+
+    Usage:
+    >>> with FakeAmoCRMServer(count_leads=50000, latency=0.05, rate_429=0.01) as server:
+    >>>     amocrm = AmoCRM(AmoCRMInit(..., base_url=server.base_url))
+"""
+
+from __future__ import annotations
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import json
+import socket
+import time
+import random
+import threading
+import multiprocessing
+
+from functools import lru_cache
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Start of dates of entities: 5 years before 2021-06-08
+START_TIMESTAMP = 1623170867 - 5 * 365 * 86400
+END_TIMESTAMP = 1623170867
+
+STATUSES = (142, 143, 30000001, 30000002, 30000003)
+TAGS = ("vip", "site", "call", "repeat", "partner", "promo")
+
+LEADS_CUSTOM_FIELDS = [
+    {"id": 101, "name": "Source", "type": "select", "code": None, "sort": 1,
+     "enums": [{"id": 1001, "value": "site", "sort": 1}, {"id": 1002, "value": "call", "sort": 2}, {"id": 1003, "value": "ads", "sort": 3}]},
+    {"id": 102, "name": "Budget", "type": "numeric", "code": "BUDGET", "sort": 2},
+    {"id": 103, "name": "Deadline", "type": "date", "code": None, "sort": 3},
+    {"id": 104, "name": "Paid", "type": "checkbox", "code": None, "sort": 4},
+    {"id": 105, "name": "Products", "type": "multiselect", "code": None, "sort": 5,
+     "enums": [{"id": 1051, "value": "A", "sort": 1}, {"id": 1052, "value": "B", "sort": 2}, {"id": 1053, "value": "C", "sort": 3}]},
+    {"id": 106, "name": "Comment", "type": "textarea", "code": None, "sort": 6},
+]
+
+CONTACTS_CUSTOM_FIELDS = [
+    {"id": 1, "name": "Phone", "type": "multitext", "code": "PHONE", "sort": 1},
+    {"id": 2, "name": "Email", "type": "multitext", "code": "EMAIL", "sort": 2},
+    {"id": 3, "name": "Position", "type": "text", "code": "POSITION", "sort": 3},
+]
+
+
+def get_created_at(index: int, count: int) -> int:
+    " Date of creation of entity. Density of entities grows to end of range, as in real accounts. "
+    return START_TIMESTAMP + int((END_TIMESTAMP - START_TIMESTAMP) * (index / (count + 1)) ** 0.5)
+
+
+def create_lead(index: int, count: int, base_url: str) -> dict[str, Any]:
+    " Create lead in format of AmoCRM api. "
+    rand = random.Random(index)
+    created_at = get_created_at(index, count)
+    custom_fields = []
+    if rand.random() < 0.8:
+        enum = rand.choice(LEADS_CUSTOM_FIELDS[0]["enums"])
+        custom_fields.append({"field_id": 101, "field_name": "Source", "field_code": None, "field_type": "select",
+                              "values": [{"value": enum["value"], "enum_id": enum["id"]}]})
+    if rand.random() < 0.6:
+        custom_fields.append({"field_id": 102, "field_name": "Budget", "field_code": "BUDGET", "field_type": "numeric",
+                              "values": [{"value": str(rand.randint(1, 1000) * 100)}]})
+    if rand.random() < 0.3:
+        custom_fields.append({"field_id": 103, "field_name": "Deadline", "field_code": None, "field_type": "date",
+                              "values": [{"value": created_at + rand.randint(1, 90) * 86400}]})
+    if rand.random() < 0.5:
+        custom_fields.append({"field_id": 104, "field_name": "Paid", "field_code": None, "field_type": "checkbox",
+                              "values": [{"value": rand.random() < 0.5}]})
+    if rand.random() < 0.4:
+        enums = rand.sample(LEADS_CUSTOM_FIELDS[4]["enums"], rand.randint(1, 3))
+        custom_fields.append({"field_id": 105, "field_name": "Products", "field_code": None, "field_type": "multiselect",
+                              "values": [{"value": enum["value"], "enum_id": enum["id"]} for enum in enums]})
+    if rand.random() < 0.2:
+        custom_fields.append({"field_id": 106, "field_name": "Comment", "field_code": None, "field_type": "textarea",
+                              "values": [{"value": "Call back after lunch. " * rand.randint(1, 5)}]})
+
+    status_id = rand.choice(STATUSES)
+    return {
+        "id": index, "name": f"Lead #{index}", "price": rand.randint(0, 500) * 1000, "responsible_user_id": rand.randint(1, 20),
+        "group_id": 0, "status_id": status_id, "pipeline_id": rand.randint(1, 3),
+        "loss_reason_id": rand.randint(1, 5) if status_id == 143 else None, "created_by": rand.randint(0, 20),
+        "updated_by": rand.randint(0, 20), "created_at": created_at, "updated_at": created_at + rand.randint(0, 30 * 86400),
+        "closed_at": created_at + 86400 if status_id in (142, 143) else None,
+        "closest_task_at": created_at + 3600 if rand.random() < 0.3 else None, "is_deleted": False,
+        "custom_fields_values": custom_fields or None, "score": None, "account_id": 1,
+        "_links": {"self": {"href": f"{base_url}/api/v4/leads/{index}"}},
+        "_embedded": {
+            "tags": [{"id": TAGS.index(tag) + 1, "name": tag} for tag in rand.sample(TAGS, rand.randint(0, 3))],
+            "companies": [{"id": company_id, "_links": {"self": {"href": f"{base_url}/api/v4/companies/{company_id}"}}}
+                          for company_id in rand.sample(range(1, 500), rand.random() < 0.3)],
+            "contacts": [{"id": rand.randint(1, count), "is_main": number == 0} for number in range(rand.randint(0, 3))]
+        }
+    }
+
+
+def create_contact(index: int, count: int, base_url: str) -> dict[str, Any]:
+    " Create contact in format of AmoCRM api. "
+    rand = random.Random(-index)
+    created_at = get_created_at(index, count)
+    custom_fields = [{"field_id": 1, "field_name": "Phone", "field_code": "PHONE", "field_type": "multitext",
+                      "values": [{"value": f"+7900{rand.randint(1000000, 9999999)}", "enum_id": 1, "enum_code": "WORK"}
+                                 for _ in range(rand.randint(1, 2))]}]
+    if rand.random() < 0.7:
+        custom_fields.append({"field_id": 2, "field_name": "Email", "field_code": "EMAIL", "field_type": "multitext",
+                              "values": [{"value": f"contact{index}@example.com", "enum_id": 3, "enum_code": "WORK"}]})
+    if rand.random() < 0.3:
+        custom_fields.append({"field_id": 3, "field_name": "Position", "field_code": "POSITION", "field_type": "text",
+                              "values": [{"value": rand.choice(("CEO", "Manager", "Engineer"))}]})
+    return {
+        "id": index, "name": f"Contact {index}", "first_name": "Contact", "last_name": str(index) if rand.random() < 0.5 else None,
+        "responsible_user_id": rand.randint(1, 20), "group_id": 0, "created_by": rand.randint(0, 20), "updated_by": rand.randint(0, 20),
+        "created_at": created_at, "updated_at": created_at + rand.randint(0, 30 * 86400),
+        "closest_task_at": None, "is_deleted": False, "custom_fields_values": custom_fields, "account_id": 1,
+        "_links": {"self": {"href": f"{base_url}/api/v4/contacts/{index}"}},
+        "_embedded": {"tags": [{"id": 1, "name": "vip"}] if rand.random() < 0.1 else [], "companies": []}
+    }
+
+
+class FakeAmoCRMHandler(BaseHTTPRequestHandler):
+    " Handler of requests. Settings of server are in server.settings. "
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, without it small responces wait for delayed ACK of client
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, code: int, body: Optional[bytes] = None, headers: Optional[dict[str, str]] = None) -> None:
+        self.server.stats[code] += 1
+        self.send_response(code)
+        self.send_header("Content-Type", "application/hal+json")
+        self.send_header("Content-Length", str(len(body or b"")))
+        for name, value in (headers or {}).items(): self.send_header(name, value)
+        self.end_headers()
+        if body: self.wfile.write(body)
+
+    def _read_body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _inject(self, items: Optional[list[dict[str, Any]]] = None) -> bool:
+        """ Latency and faults of api requests. Return True, if responce is sent (or connection is closed).
+        Scripted fault of request is applied before random faults, fault with only delay does not stop request.
+        """
+        self.server.log_request(self.command, self.path, self.headers.get("Authorization"))
+        ids = {item.get("id") for item in items or [] if isinstance(item, dict)}
+        fault = self.server.pop_fault(self.command, urlsplit(self.path).path, ids)
+        if fault is not None:
+            if fault.get("drop"):
+                # Request is received, but connection is closed without responce
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return True
+            if "code" in fault:
+                self._send(fault["code"], json.dumps({"status": fault["code"]}).encode(), fault.get("headers"))
+                return True
+            time.sleep(fault.get("delay", 0.0))
+
+        settings = self.server.settings
+        if settings["latency"]: time.sleep(max(0.0, random.gauss(settings["latency"], settings["latency"] * settings["jitter"])))
+        if random.random() < settings["rate_429"]:
+            self._send(429, b'{"title": "Too Many Requests", "status": 429}', {"Retry-After": str(settings["retry_after"])})
+            return True
+        if random.random() < settings["rate_error"]:
+            self._send(random.choice((500, 502, 503)), b'{"title": "Internal Server Error"}')
+            return True
+        return False
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/_stats": return self._send(200, json.dumps({str(code): count for code, count in self.server.stats.items()}).encode())
+        if url.path == "/_requests": return self._send(200, json.dumps(list(self.server.requests)).encode())
+        if self._inject(): return
+
+        parts = url.path.strip("/").split("/")
+        if parts[-1] == "account": return self._send(200, b'{"id": 1, "name": "Benchmark"}')
+        if parts[-1] == "custom_fields":
+            fields = LEADS_CUSTOM_FIELDS if parts[-2] == "leads" else CONTACTS_CUSTOM_FIELDS
+            body = {"_page": 1, "_links": {"self": {"href": f"{self.server.base_url}{url.path}"}}, "_embedded": {"custom_fields": fields}}
+            return self._send(200, json.dumps(body).encode())
+        if parts[-1] not in ("leads", "contacts"): return self._send(404, b'{"title": "Not Found"}')
+
+        query = parse_qs(url.query)
+        limit = min(int(query.get("limit", ["50"])[0]), 250)
+        page = int(query.get("page", ["1"])[0])
+        body = self.server.get_page(parts[-1], url.query, limit, page)
+        if body is None: return self._send(204)
+        self._send(200, body)
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        items = self._read_body()
+        if url.path == "/_faults":
+            self.server.set_faults(items)
+            return self._send(200, b'{}')
+        if url.path.startswith("/oauth2"):
+            self.server.log_request(self.command, self.path, self.headers.get("Authorization"))
+            body = {"token_type": "Bearer", "expires_in": 86400, "access_token": f"access{random.randint(1, 10 ** 9)}", "refresh_token": "refresh"}
+            return self._send(200, json.dumps(body).encode())
+        if self._inject(items): return
+        self._send_saved(url.path, items, is_patch=False)
+
+    def do_PATCH(self) -> None:
+        url = urlsplit(self.path)
+        items = self._read_body()
+        if self._inject(items): return
+        self._send_saved(url.path, items, is_patch=True)
+
+    def _send_saved(self, path: str, items: list[dict[str, Any]], is_patch: bool) -> None:
+        " Answer of POST and PATCH: ids of saved entities. Complex leads are answered by array, as api of AmoCRM. "
+        table = path.split("/api/v4/")[-1].split("/")[0]
+        if table not in ("leads", "contacts"): return self._send(404, b'{"title": "Not Found"}')
+        now = int(time.time())
+        saved = []
+        for number, item in enumerate(items):
+            entity_id = item["id"] if is_patch else 10 ** 7 + random.randint(1, 10 ** 7)
+            if path.endswith("/complex"):
+                embedded = item.get("_embedded") or {}
+                saved.append({"id": entity_id, "contact_id": 10 ** 7 + random.randint(1, 10 ** 7) if embedded.get("contacts") else None,
+                              "company_id": 10 ** 7 + random.randint(1, 10 ** 7) if embedded.get("companies") else None,
+                              "request_id": [item.get("request_id", str(number))], "merged": False})
+                continue
+            entity = {"id": entity_id, "request_id": item.get("request_id", str(number)),
+                      "_links": {"self": {"href": f"{self.server.base_url}/api/v4/{table}/{entity_id}"}}}
+            if is_patch: entity["updated_at"] = now
+            saved.append(entity)
+        if path.endswith("/complex"): return self._send(200, json.dumps(saved).encode())
+        body = {"_links": {"self": {"href": f"{self.server.base_url}{path}"}}, "_embedded": {table: saved}}
+        self._send(200, json.dumps(body).encode())
+
+
+class FakeAmoCRMHTTPServer(ThreadingHTTPServer):
+    " Http server with generated data. "
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], settings: dict[str, Any]):
+        super().__init__(address, FakeAmoCRMHandler)
+        self.settings = settings
+        self.stats: Counter[int] = Counter()
+        self.base_url = f"http://{address[0]}:{self.server_address[1]}"
+        self.get_page = lru_cache(maxsize=settings["cache_pages"])(self._create_page)
+        self.get_ids = lru_cache(maxsize=64)(self._get_ids)
+
+        self.requests: list[dict[str, Any]] = []
+        self._faults: deque[dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+
+    def set_faults(self, faults: list[dict[str, Any]]) -> None:
+        " Replace scripted faults and clear log of requests. "
+        with self._lock:
+            self._faults = deque(faults)
+            self.requests.clear()
+
+    def pop_fault(self, method: str, path: str, ids: Optional[set[int]] = None) -> Optional[dict[str, Any]]:
+        """ Get first scripted fault of request: method, start of path and id of entity in body of fault are matched,
+        if they are set.
+        """
+        with self._lock:
+            for fault in self._faults:
+                if fault.get("method", method) == method and path.startswith(fault.get("path", "")) \
+                        and fault.get("id") in (ids or set()) | {None}:
+                    self._faults.remove(fault)
+                    return fault
+        return None
+
+    def log_request(self, method: str, path: str, authorization: Optional[str]) -> None:
+        with self._lock: self.requests.append({"method": method, "path": path, "authorization": authorization})
+
+    def _get_ids(self, table: str, query_string: str) -> list[int]:
+        " Ids of entities by filters of query (without page). "
+        query = parse_qs(query_string)
+        count = self.settings["count_leads"] if table == "leads" else self.settings["count_contacts"]
+        create = create_lead if table == "leads" else create_contact
+        ids = [int(value) for value in query.get("filter[id][]", [])] or range(1, count + 1)
+        ids = [entity_id for entity_id in ids if 1 <= entity_id <= count]
+
+        for field in ("created_at", "updated_at"):
+            date_from, date_to = query.get(f"filter[{field}][from]"), query.get(f"filter[{field}][to]")
+            if not date_from and not date_to: continue
+            date_from, date_to = int(date_from[0]) if date_from else 0, int(date_to[0]) if date_to else 2 ** 62
+            if field == "created_at":
+                ids = [entity_id for entity_id in ids if date_from <= get_created_at(entity_id, count) <= date_to]
+            else:
+                ids = [entity_id for entity_id in ids if date_from <= create(entity_id, count, "")["updated_at"] <= date_to]
+        if "order[updated_at]" in query:
+            ids = sorted(ids, key=lambda entity_id: (create(entity_id, count, "")["updated_at"], entity_id),
+                         reverse=query["order[updated_at]"][0] == "desc")
+        return ids
+
+    def _create_page(self, table: str, query_string: str, limit: int, page: int) -> Optional[bytes]:
+        " Body of page, None if page is empty. Pages are cached by query. "
+        count = self.settings["count_leads"] if table == "leads" else self.settings["count_contacts"]
+        create = create_lead if table == "leads" else create_contact
+        other_query = "&".join(part for part in query_string.split("&") if part and not part.startswith("page="))
+        ids = self.get_ids(table, other_query)
+        page_ids = ids[(page - 1) * limit: page * limit]
+        if not page_ids: return None
+
+        url = f"{self.base_url}/api/v4/{table}"
+        links = {"self": {"href": f"{url}?{other_query}&page={page}"}}
+        if page * limit < len(ids): links["next"] = {"href": f"{url}?{other_query}&page={page + 1}"}
+        body = {"_page": page, "_links": links, "_embedded": {table: [create(entity_id, count, self.base_url) for entity_id in page_ids]}}
+        return json.dumps(body).encode()
+
+
+def serve(settings: dict[str, Any], queue: multiprocessing.Queue) -> None:
+    " Run server in process, port is sent to {queue}. "
+    random.seed(settings["seed"])
+    server = FakeAmoCRMHTTPServer(("127.0.0.1", settings["port"]), settings)
+    queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class FakeAmoCRMServer:
+    """ Fake AmoCRM server in separate process.
+
+    Args:
+        count_leads (int, optional): Count of leads. Defaults to 10000.
+        count_contacts (int, optional): Count of contacts. Defaults to 5000.
+        latency (float, optional): Mean latency of api requests, seconds. Defaults to 0.
+        jitter (float, optional): Deviation of latency, part of latency. Defaults to 0.2.
+        rate_429 (float, optional): Part of api requests with 429 responce. Defaults to 0.
+        rate_error (float, optional): Part of api requests with 500, 502 or 503 responce. Defaults to 0.
+        retry_after (float, optional): Value of header Retry-After of 429 responce, seconds. Defaults to 0.1.
+        cache_pages (int, optional): Count of pages cached by server. Defaults to 4096.
+        seed (int, optional): Seed of random of faults. Defaults to 1.
+        port (int, optional): Port of server, 0 -> free port. Defaults to 0.
+    """
+
+    def __init__(self, count_leads: int = 10000, count_contacts: int = 5000, latency: float = 0.0, jitter: float = 0.2,
+                 rate_429: float = 0.0, rate_error: float = 0.0, retry_after: float = 0.1, cache_pages: int = 4096,
+                 seed: int = 1, port: int = 0):
+        self.settings = {
+            "count_leads": count_leads, "count_contacts": count_contacts, "latency": latency, "jitter": jitter, "rate_429": rate_429,
+            "rate_error": rate_error, "retry_after": retry_after, "cache_pages": cache_pages, "seed": seed, "port": port
+        }
+        self.base_url: Optional[str] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    def __enter__(self) -> FakeAmoCRMServer:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> str:
+        " Start server process. Return base url. Ex: http://127.0.0.1:53411 "
+        queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=serve, args=(self.settings, queue), daemon=True)
+        self._process.start()
+        self.base_url = f"http://127.0.0.1:{queue.get(timeout=30)}"
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def get_stats(self) -> dict[str, int]:
+        " Count of responces of server by code. "
+        import requests
+        return requests.get(f"{self.base_url}/_stats").json()
+
+    def set_faults(self, faults: list[dict[str, Any]]) -> None:
+        """ Set scripted faults of next api requests, log of requests is cleared. Each fault is applied to one request
+        with same method and path, which starts with path of fault, and with entity of id of fault in body (method, path
+        and id are optional). Fault is responce with code, closed connection (drop) or delay of responce.
+        Ex: [{"method": "GET", "code": 429, "headers": {"Retry-After": "1"}}, {"method": "POST", "path": "/api/v4/leads", "drop": True},
+             {"method": "PATCH", "id": 5, "delay": 0.2}]
+        """
+        import requests
+        requests.post(f"{self.base_url}/_faults", json=faults).raise_for_status()
+
+    def get_requests(self) -> list[dict[str, Any]]:
+        " Log of api and auth requests after last 'set_faults': method, path and header Authorization. "
+        import requests
+        return requests.get(f"{self.base_url}/_requests").json()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run fake AmoCRM server")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--leads", type=int, default=10000)
+    parser.add_argument("--contacts", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-error", type=float, default=0.0)
+    args = parser.parse_args()
+
+    settings = FakeAmoCRMServer(args.leads, args.contacts, args.latency, rate_429=args.rate_429, rate_error=args.rate_error,
+                                port=args.port).settings
+    random.seed(settings["seed"])
+    server = FakeAmoCRMHTTPServer(("127.0.0.1", args.port), settings)
+    print(f"Fake AmoCRM server -> {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,40 @@
+" Fixtures of tests: local fake AmoCRM server and settings of connectors to it "
+
+from __future__ import annotations
+from typing import Callable
+
+import time
+import pytest
+
+from benchmarks.fake_server import FakeAmoCRMServer
+
+from amocrm.v4.models.amoCRM_M import AmoCRMInit
+
+
+@pytest.fixture(scope="session")
+def server() -> FakeAmoCRMServer:
+    " Fake server with 600 leads and 600 contacts (ids of contacts of leads are from 1 to count of leads). "
+    with FakeAmoCRMServer(count_leads=600, count_contacts=600) as server:
+        yield server
+
+
+@pytest.fixture
+def create_settings(server: FakeAmoCRMServer, tmp_path) -> Callable[..., AmoCRMInit]:
+    " Settings of connector to fake server. Token is not expired, so connector does not check account. Rate limiter is off. "
+    def create(**kwargs) -> AmoCRMInit:
+        settings = dict(
+            connect_email="test@example.com", connect_domain="test", base_url=server.base_url, connect_id="id",
+            connect_secret_key="secret", redirect_uri="https://example.com", access_token="access", refresh_token="refresh",
+            token_expires_at=int(time.time()) + 86400, check_auth_in_init=False, debug=False, rate_limit=None,
+            mode_save_token={"mode": "local_file", "path_to_file": str(tmp_path / "tokens.json")}
+        )
+        settings.update(kwargs)
+        return AmoCRMInit(**settings)
+    return create
+
+
+@pytest.fixture
+def set_faults(server: FakeAmoCRMServer) -> Callable[[list[dict]], None]:
+    " Set scripted faults of next requests of fake server (see 'FakeAmoCRMServer.set_faults'), they are removed after test. "
+    yield server.set_faults
+    server.set_faults([])
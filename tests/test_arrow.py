@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from benchmarks.bench_parse import create_page
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_arrow import ArrowExport, create_record_batch
+from amocrm.v4.amoCRM_parse import construct_model, loads
+from amocrm.v4.models.amoCRM_M import AmoResponceGet
+
+from tests.test_pages import CountHook
+
+
+def test_batches_with_workers_are_requested_in_bounded_window(create_settings):
+    hook = CountHook()
+    requests_before_batch = []
+
+    with AmoCRM(create_settings(), hooks=[hook]) as amocrm:
+        for responce in ArrowExport(amocrm).iter_batches(AmoCRM.ACTION.LEADS, filters="limit=10", max_workers=2):
+            assert responce.status
+            requests_before_batch.append(hook.count)
+
+    # 60 pages: first page, probing of last page and window of 2 * max_workers pages
+    assert len(requests_before_batch) == 60
+    assert requests_before_batch[1] <= 1 + 12 + 2 * 2 + 1
+
+
+def test_parquet_with_workers_equals_sequential(create_settings, tmp_path):
+    import pyarrow.parquet as pq
+
+    with AmoCRM(create_settings()) as amocrm:
+        export = ArrowExport(amocrm)
+        assert export.to_parquet(str(tmp_path / "sequential.parquet"), AmoCRM.ACTION.LEADS, filters="limit=50").data == 600
+        assert export.to_parquet(str(tmp_path / "parallel.parquet"), AmoCRM.ACTION.LEADS, filters="limit=50", max_workers=3,
+                                 row_group_size=100).data == 600
+
+    assert pq.read_table(tmp_path / "parallel.parquet").equals(pq.read_table(tmp_path / "sequential.parquet"))
+
+
+def test_empty_value_of_custom_field_is_null():
+    data = loads(create_page("leads", 2))
+    values = data["_embedded"]["leads"][0]["custom_fields_values"][0]["values"]
+    values[0]["value"] = None
+    values.append({"value": 5, "enum_id": None, "enum_code": None})
+
+    record_batch = create_record_batch(construct_model(AmoResponceGet, data))
+    field = record_batch.column("custom_fields_values")[0].as_py()[0]
+    assert [value["value"] for value in field["values"]] == [None, "5"]
+
+
+def test_parquet_tmp_file_is_removed_after_error(create_settings, tmp_path, monkeypatch):
+    import amocrm.v4.amoCRM_arrow as amoCRM_arrow
+
+    path_to_file = tmp_path / "leads.parquet"
+    path_to_file.write_bytes(b"old file")
+    calls = []
+
+    def create_record_batch_with_error(data):
+        calls.append(data)
+        if len(calls) == 3: raise RuntimeError("Error of conversion")
+        return create_record_batch(data)
+
+    monkeypatch.setattr(amoCRM_arrow, "create_record_batch", create_record_batch_with_error)
+    with AmoCRM(create_settings()) as amocrm:
+        with pytest.raises(RuntimeError, match="Error of conversion"):
+            ArrowExport(amocrm).to_parquet(str(path_to_file), AmoCRM.ACTION.LEADS, filters="limit=50", row_group_size=50)
+
+    assert [path.name for path in tmp_path.iterdir()] == ["leads.parquet"]
+    assert path_to_file.read_bytes() == b"old file"
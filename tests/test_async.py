@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import pytest
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_async import AsyncAmoCRM
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+def test_async_client_does_not_inherit_sync_methods():
+    assert not issubclass(AsyncAmoCRM, AmoCRM)
+    for name in ("get_data_sharded", "get_shard_points", "iter_get_responces_parallel", "__enter__"):
+        assert not hasattr(AsyncAmoCRM, name)
+
+
+def test_iter_pages_and_entities(create_settings):
+    async def main():
+        async with AsyncAmoCRM(create_settings()) as amocrm:
+            pages = await collect(amocrm.iter_pages(AsyncAmoCRM.ACTION.LEADS, filters="limit=250"))
+            leads = await collect(amocrm.iter_entities(AsyncAmoCRM.ACTION.LEADS, filters="limit=250"))
+            return pages, leads
+
+    pages, leads = run(main())
+    assert [page.page for page in pages] == [1, 2, 3]
+    assert [lead.id for lead in leads] == list(range(1, 601))
+
+
+def test_iter_get_responces_first_page(create_settings):
+    async def main():
+        async with AsyncAmoCRM(create_settings()) as amocrm:
+            return await collect(amocrm.iter_get_responces(AsyncAmoCRM.ACTION.CONTACTS, filters="limit=100", get_all_data=False))
+
+    responces = run(main())
+    assert len(responces) == 1 and responces[0].status
+
+
+def test_get_by_ids_equals_sync(create_settings):
+    ids = [5, 3, 1000, 3, 250, 1]
+
+    async def main():
+        async with AsyncAmoCRM(create_settings()) as amocrm:
+            return await amocrm.get_by_ids(AsyncAmoCRM.ACTION.LEADS, ids, max_url_length=300)
+
+    responce = run(main())
+    with AmoCRM(create_settings()) as amocrm:
+        sync_responce = amocrm.get_by_ids(AmoCRM.ACTION.LEADS, ids, max_url_length=300)
+
+    assert responce.status and responce.errors == [1000]
+    assert [lead.id for lead in responce.data] == [5, 3, 250, 1]
+    assert responce.data == sync_responce.data
+
+
+@pytest.mark.parametrize("as_df", [False, True])
+def test_with_contacts_equals_sync(create_settings, as_df):
+    from pandas.testing import assert_frame_equal
+
+    async def main():
+        async with AsyncAmoCRM(create_settings()) as amocrm:
+            if as_df: return await amocrm.get_data_df(AsyncAmoCRM.ACTION.LEADS, filters="limit=250", get_all_data=True, with_contacts=True)
+            return await amocrm.get_data(AsyncAmoCRM.ACTION.LEADS, filters="limit=250", get_all_data=True, with_contacts=True)
+
+    responce = run(main())
+    with AmoCRM(create_settings()) as amocrm:
+        get_data = amocrm.get_data_df if as_df else amocrm.get_data
+        sync_responce = get_data(AmoCRM.ACTION.LEADS, filters="limit=250", get_all_data=True, with_contacts=True)
+
+    assert responce.status and responce.errors == sync_responce.errors
+    if as_df:
+        assert 'contact_name' in responce.data.columns
+        assert_frame_equal(responce.data, sync_responce.data)
+    else:
+        assert responce.data.lead_contacts and responce.data.lead_contacts == sync_responce.data.lead_contacts
+        assert responce.data.contacts == sync_responce.data.contacts
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_cache import CacheBackend, DiskCacheBackend, MemoryCacheBackend, ResponceCache
+from amocrm.v4.models.amoCRM_M import AmoRequestPostLeads
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+    class PartialBackend(CacheBackend):
+        def get(self, url):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+
+
+@pytest.mark.parametrize("create_backend", [MemoryCacheBackend, lambda: DiskCacheBackend(":memory:")])
+def test_complex_invalidates_leads_and_contacts(create_backend):
+    cache = ResponceCache(create_backend(), ttl=60)
+    for action in ('leads', 'contacts', 'leads/custom_fields', 'users'):
+        cache.store(f"https://example.amocrm.ru/api/v4/{action}?page=1", b'{}', {})
+
+    assert cache.invalidate(AmoCRM.ACTION.LEADS_COMPLEX) == 3
+    assert len(cache.backend) == 1
+    assert cache.lookup("https://example.amocrm.ru/api/v4/users?page=1")[1]
+
+    cache.store("https://example.amocrm.ru/api/v4/contacts?page=1", b'{}', {})
+    assert cache.invalidate(AmoCRM.ACTION.LEADS) == 0
+    assert cache.invalidate(AmoCRM.ACTION.CONTACTS) == 1
+
+
+def test_post_complex_invalidates_cached_contacts(create_settings):
+    cache = ResponceCache(ttl=60)
+    with AmoCRM(create_settings(), cache=cache) as amocrm:
+        assert amocrm.get(AmoCRM.ACTION.CONTACTS, filters="limit=10").status
+        assert amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10").status
+        assert len(cache.backend) == 2
+
+        assert amocrm.post(AmoCRM.ACTION.LEADS_COMPLEX, [AmoRequestPostLeads(name="Lead")]).status
+        assert len(cache.backend) == 0
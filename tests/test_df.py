@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from amocrm.v4.amoCRM import AmoCRM
+
+
+def test_wide_columns_of_contacts_have_phone_and_email(create_settings):
+    with AmoCRM(create_settings()) as amocrm:
+        plain = amocrm.get_data_df(AmoCRM.ACTION.CONTACTS, filters="limit=250", get_all_data=True)
+        wide = amocrm.get_data_df(AmoCRM.ACTION.CONTACTS, filters="limit=250", get_all_data=True, wide_custom_fields=True)
+
+    assert plain.status and wide.status and len(wide.data) == 600
+    # Without wide columns frame is not changed: PHONE and EMAIL are only in columns 'phone' and 'email'
+    assert all(field.get('field_code') not in ('PHONE', 'EMAIL') for fields in plain.data['custom_fields_values'] for field in fields)
+    assert wide.data['phone'].equals(plain.data['phone']) and wide.data['email'].equals(plain.data['email'])
+
+    data_df = wide.data
+    assert data_df['cf_PHONE'].notna().all()
+    assert data_df['cf_PHONE'].map(lambda values: values[0]).equals(data_df['phone'])
+    assert data_df['cf_EMAIL'].notna().equals(data_df['email'].notna())
+    assert data_df['cf_EMAIL'].dropna().map(lambda values: values[0]).equals(data_df['email'].dropna())
+
+
+def test_wide_columns_of_contacts_in_pipeline(create_settings):
+    from pandas.testing import assert_frame_equal
+    from amocrm.v4.amoCRM_pipeline import ExportPipeline
+
+    with AmoCRM(create_settings()) as amocrm:
+        responce = ExportPipeline(amocrm, max_processes=2).get_data_df(AmoCRM.ACTION.CONTACTS, filters="limit=100", wide_custom_fields=True)
+        expected = amocrm.get_data_df(AmoCRM.ACTION.CONTACTS, filters="limit=100", get_all_data=True, wide_custom_fields=True)
+
+    assert responce.status and responce.data['cf_PHONE'].notna().all()
+    assert_frame_equal(responce.data, expected.data)
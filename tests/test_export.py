@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import time
+import pytest
+
+import amocrm.v4.amoCRM_pipeline as amoCRM_pipeline
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_pipeline import ExportPipeline
+from amocrm.v4.amoCRM_sync import IncrementalSync
+
+
+def test_public_page_methods(create_settings):
+    with AmoCRM(create_settings()) as amocrm:
+        url = amocrm.get_url(AmoCRM.ACTION.LEADS, "limit=250&page=3", version_api="v4")
+        code, page = amocrm.get_page(url)
+        empty_code, content = amocrm.get_page_content(amocrm.get_url(AmoCRM.ACTION.LEADS, "limit=250&page=4"))
+
+    assert url == f"{amocrm.base_url}/api/v4/leads?limit=250&page=3"
+    assert code == 200 and len(page.embedded.leads) == 100
+    assert empty_code == 204 and content is None
+
+
+def test_incremental_sync(create_settings, tmp_path):
+    with AmoCRM(create_settings()) as amocrm:
+        sync = IncrementalSync(amocrm, path_to_file=str(tmp_path / "sync_state.json"))
+        first = sync.sync(AmoCRM.ACTION.CONTACTS, limit=100)
+        second = sync.sync(AmoCRM.ACTION.CONTACTS, limit=100)
+
+    assert first.status and sorted(contact.id for contact in first.data) == list(range(1, 601))
+    assert second.status and second.data == []
+
+
+def test_export_pipeline_equals_get_data_df(create_settings):
+    from pandas.testing import assert_frame_equal
+
+    with AmoCRM(create_settings()) as amocrm:
+        responce = ExportPipeline(amocrm, max_processes=2, max_workers=3).get_data_df(AmoCRM.ACTION.LEADS, filters="limit=100")
+        expected = amocrm.get_data_df(AmoCRM.ACTION.LEADS, filters="limit=100", get_all_data=True)
+
+    assert responce.status
+    assert_frame_equal(responce.data, expected.data)
+
+
+def _dead_worker(tasks, results, validate, all_custom_fields):
+    " Process is killed before sending of result. "
+    os._exit(3)
+
+
+def _dead_after_page_worker(tasks, results, validate, all_custom_fields):
+    " Process is killed after first page, other processes wait for tasks. "
+    tasks.get()
+    os._exit(3)
+
+
+def _silent_worker(tasks, results, validate, all_custom_fields):
+    " Process takes all tasks, but does not send result. "
+    for _ in iter(tasks.get, None): pass
+
+
+@pytest.mark.parametrize("worker, detail", [
+    (_dead_worker, "Process of parsing is dead! exitcode -> 3"),
+    (_dead_after_page_worker, "Process of parsing is dead! exitcode -> 3"),
+    (_silent_worker, "Processes of parsing are finished without result!"),
+])
+def test_export_pipeline_is_not_blocked_by_dead_process(create_settings, monkeypatch, worker, detail):
+    monkeypatch.setattr(amoCRM_pipeline, "_parse_worker", worker)
+    monkeypatch.setattr(amoCRM_pipeline, "POLL_INTERVAL", 0.05)
+
+    start = time.monotonic()
+    with AmoCRM(create_settings()) as amocrm:
+        pipeline = ExportPipeline(amocrm, max_processes=2, max_workers=2, queue_size=1)
+        responce = pipeline.get_data_df(AmoCRM.ACTION.LEADS, filters="limit=50")
+
+    assert not responce.status and responce.detail == detail
+    assert time.monotonic() - start < 10
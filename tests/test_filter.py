@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from urllib.parse import parse_qs
+
+from benchmarks.fake_server import START_TIMESTAMP, END_TIMESTAMP, get_created_at
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_async import AsyncAmoCRM
+from amocrm.v4.amoCRM_filter import FilterAmoCRM
+
+
+def test_id_filters_are_limited_by_length_of_sent_filter():
+    ids = list(range(1000, 1100))
+    literal = FilterAmoCRM.create_id_filters(ids, max_length=300)
+    quoted = FilterAmoCRM.create_id_filters(ids, max_length=300, quoted=True)
+
+    for filters, part_length in ((literal, len("&filter[id][]=1000")), (quoted, len("&filter%5Bid%5D%5B%5D=1000"))):
+        assert [int(part.split("=")[1]) for filter_ in filters for part in filter_.split("&")[1:]] == ids
+        counts = [filter_.count("&") for filter_ in filters]
+        # Each filter (except last) is full: next id does not fit in max length
+        assert all(len(f"limit={count}") + count * part_length <= 300 < len(f"limit={count}") + (count + 1) * part_length
+                   for count in counts[:-1])
+    assert len(literal) < len(quoted)
+
+    assert FilterAmoCRM.create_id_filters(range(1, 601), max_length=10 ** 6) == [
+        f"limit={len(chunk)}" + "".join(f"&filter[id][]={id}" for id in chunk) for chunk in (range(1, 251), range(251, 501), range(501, 601))
+    ]
+
+
+@pytest.mark.parametrize("is_async", [False, True])
+def test_urls_of_get_by_ids_are_not_longer_than_max_length(create_settings, server, set_faults, is_async):
+    set_faults([])
+    ids = list(range(600, 0, -1))
+
+    if is_async:
+        async def main():
+            async with AsyncAmoCRM(create_settings()) as amocrm: return await amocrm.get_by_ids(AsyncAmoCRM.ACTION.LEADS, ids, max_url_length=500)
+        responce = asyncio.run(main())
+    else:
+        with AmoCRM(create_settings()) as amocrm: responce = amocrm.get_by_ids(AmoCRM.ACTION.LEADS, ids, max_url_length=500)
+
+    assert responce.status and [lead.id for lead in responce.data] == ids
+    lengths = [len(server.base_url + request["path"]) for request in server.get_requests()]
+    # Filters (except last, which is shortest or not) are full: url is close to max length
+    assert max(lengths) <= 500 and sorted(lengths)[1] > 500 - len("&page=100") - len("&filter%5Bid%5D%5B%5D=600")
+
+
+def assert_windows_cover_range(windows, datetime_from, datetime_to):
+    " Windows are ordered, have no gaps and no overlaps (bounds are included) and cover range. "
+    assert windows[0][0] == datetime_from and windows[-1][1] == datetime_to
+    assert all(start <= end for start, end in windows)
+    assert all(next_start == end + 1 for (_, end), (next_start, _) in zip(windows, windows[1:]))
+
+
+def get_window(filter_):
+    query = parse_qs(filter_)
+    return int(query["filter[created_at][from]"][0]), int(query["filter[created_at][to]"][0])
+
+
+@pytest.mark.parametrize("datetime_from, datetime_to, count", [(0, 99, 4), (0, 100, 3), (10, 12, 5), (7, 7, 3), (0, 10 ** 9, 7)])
+def test_windows_of_range_have_no_gaps_and_overlaps(datetime_from, datetime_to, count):
+    windows = FilterAmoCRM.split_range(datetime_from, datetime_to, count)
+
+    assert_windows_cover_range(windows, datetime_from, datetime_to)
+    assert len(windows) == min(count, datetime_to - datetime_from + 1)
+    assert FilterAmoCRM.split_range(0, 99, 4) == [(0, 24), (25, 49), (50, 74), (75, 99)]
+    assert FilterAmoCRM.split_range(10, 9, 4) == []
+
+
+def test_windows_by_points_split_points_equally():
+    points = [get_created_at(index, 600) for index in range(1, 601)]
+    windows = FilterAmoCRM.split_range(START_TIMESTAMP, END_TIMESTAMP, 6, points)
+
+    assert_windows_cover_range(windows, START_TIMESTAMP, END_TIMESTAMP)
+    # Bounds of windows are points: entity on bound is in one window only
+    counts = [sum(start <= point <= end for point in points) for start, end in windows]
+    assert sum(counts) == len(points) and max(counts) - min(counts) <= 1
+    # Points with equal timestamp can not be split
+    assert FilterAmoCRM.split_range(0, 100, 4, [50] * 10) == [(0, 49), (50, 100)]
+
+
+def test_window_filter():
+    assert FilterAmoCRM.create_window_filter((1, 2)) == "limit=250&filter[created_at][from]=1&filter[created_at][to]=2"
+    assert FilterAmoCRM.create_window_filter((1, 2), "updated_at", 50) == "limit=50&filter[updated_at][from]=1&filter[updated_at][to]=2"
+    with pytest.raises(ValueError):
+        FilterAmoCRM.create_window_filter((1, 2), "closed_at")
+
+
+def test_shard_filters_cover_range_of_filter():
+    filter_amocrm = FilterAmoCRM(FilterAmoCRM.ACTIONS.LAST_DAY)
+    filters = filter_amocrm.get_shard_filters(FilterAmoCRM.TABLE.LEADS, 5)
+    datetime_from, datetime_to = get_window(filters[0])[0], get_window(filters[-1])[1]
+
+    assert len(filters) == 5 and all(filter_.startswith("limit=250&") for filter_ in filters)
+    assert_windows_cover_range([get_window(filter_) for filter_ in filters], datetime_from, datetime_to)
+    assert datetime_to - datetime_from in range(86400 - 5, 86400 + 5)
+
+
+@pytest.mark.parametrize("probe", [False, True])
+def test_sharded_data_is_equal_to_data(create_settings, set_faults, probe):
+    set_faults([])
+    with AmoCRM(create_settings()) as amocrm:
+        data = amocrm.get_data(AmoCRM.ACTION.LEADS, get_all_data=True)
+        sharded = amocrm.get_data_sharded(AmoCRM.ACTION.LEADS, START_TIMESTAMP, END_TIMESTAMP, count_shards=7, max_workers=3, probe=probe)
+
+    assert data.status and sharded.status and len(data.data) == 600
+    assert [lead.dict() for lead in sharded.data] == [lead.dict() for lead in data.data]
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+import sys
+import subprocess
+
+
+def test_modules_do_not_import_pandas():
+    modules = ["amocrm.v4.amoCRM", "amocrm.v4.amoCRM_async", "amocrm.v4.amoCRM_pipeline", "amocrm.v4.amoCRM_store", "amocrm.v4.amoCRM_sync"]
+    code = f"import sys; import {', '.join(modules)}; assert 'pandas' not in sys.modules, 'pandas is imported'"
+    subprocess.run([sys.executable, "-c", code], check=True)
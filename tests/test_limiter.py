@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import uuid
+import asyncio
+
+import pytest
+
+from types import SimpleNamespace
+
+import amocrm.v4.amoCRM_limiter as amoCRM_limiter
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_limiter import RateLimiter, get_rate_limiter
+from amocrm.v4.models.amoCRM_M import AmoCRMInit
+
+
+class FakeClock:
+    " Clock of limiter: sleep moves time forward without waiting. "
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    " Clock of limiter module, clock of other modules is not changed. "
+    clock = FakeClock()
+    monkeypatch.setattr(amoCRM_limiter, "time", SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    monkeypatch.setattr(amoCRM_limiter, "asyncio", SimpleNamespace(sleep=clock.async_sleep))
+    return clock
+
+
+def test_burst_and_spacing_of_requests(clock):
+    limiter = RateLimiter(rate=2.0, burst=3)
+
+    times = []
+    for _ in range(6):
+        limiter.acquire()
+        times.append(clock.now)
+
+    # Burst without waiting, then one request per 1 / rate seconds
+    assert times == [0.0, 0.0, 0.0, 0.5, 1.0, 1.5]
+    assert limiter.get_statistic().dict() == {'count_requests': 6, 'count_waits': 3, 'wait_time': 1.5, 'max_wait_time': 0.5}
+
+    # Bucket is refilled up to burst after pause
+    clock.now += 60
+    assert [limiter.acquire() for _ in range(4)] == [0.0, 0.0, 0.0, 0.5]
+
+
+def test_tokens_are_reserved_in_debt(clock):
+    limiter = RateLimiter(rate=4.0, burst=1)
+
+    # Threads reserve tokens at the same time: each next request waits longer
+    assert [limiter.reserve() for _ in range(4)] == [0.0, 0.25, 0.5, 0.75]
+    assert clock.sleeps == []
+
+
+def test_acquire_async(clock):
+    limiter = RateLimiter(rate=5.0, burst=1)
+
+    async def main():
+        return [await limiter.acquire_async() for _ in range(3)]
+
+    assert asyncio.run(main()) == [0.0, 0.2, 0.2]
+    assert clock.now == pytest.approx(0.4)
+
+
+def test_wrong_settings():
+    with pytest.raises(ValueError): RateLimiter(rate=0)
+    with pytest.raises(ValueError): RateLimiter(burst=0)
+
+
+def test_connectors_of_domain_share_limiter(create_settings, clock):
+    domain = f"shared-{uuid.uuid4().hex}"
+    first = AmoCRM(create_settings(connect_domain=domain, rate_limit=2.0, rate_burst=2))
+    second = AmoCRM(create_settings(connect_domain=domain, rate_limit=100.0, rate_burst=100))
+    other = AmoCRM(create_settings(connect_domain=f"other-{uuid.uuid4().hex}", rate_limit=2.0, rate_burst=2))
+
+    with first, second, other:
+        for amocrm in (first, second, first, other):
+            assert amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10").status
+
+        # Limiter is created by first connector, settings of second connector are ignored
+        assert first.get_rate_limiter_statistic() == second.get_rate_limiter_statistic()
+        assert first.get_rate_limiter_statistic().dict() == {'count_requests': 3, 'count_waits': 1, 'wait_time': 0.5, 'max_wait_time': 0.5}
+        assert other.get_rate_limiter_statistic().count_requests == 1
+    assert get_rate_limiter(domain) is get_rate_limiter(domain, rate=1000.0)
+    assert get_rate_limiter(domain).rate == 2.0
+
+
+def test_limiter_is_on_by_default(create_settings):
+    settings = create_settings(connect_domain=f"default-{uuid.uuid4().hex}").dict(exclude={"rate_limit", "rate_burst"})
+
+    with AmoCRM(AmoCRMInit(**settings)) as amocrm:
+        assert amocrm.get_rate_limiter_statistic() is not None
+    limiter = get_rate_limiter(settings["connect_domain"])
+    assert (limiter.rate, limiter.burst) == (7.0, 7)
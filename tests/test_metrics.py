@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_metrics import LATENCY_BUCKETS, MetricsCollector, RequestHook, get_url_action
+from amocrm.v4.models.amoCRM_M import RequestEvent, ResponceEvent, RetryPolicy
+
+
+class RecordHook(RequestHook):
+    def __init__(self):
+        self.before: list[RequestEvent] = []
+        self.after: list[ResponceEvent] = []
+        self.stages: list[tuple[str, str]] = []
+
+    def before_request(self, event: RequestEvent) -> None:
+        self.before.append(event)
+
+    def after_request(self, event: ResponceEvent) -> None:
+        self.after.append(event)
+
+    def on_timing(self, stage: str, action: str, seconds: float) -> None:
+        self.stages.append((stage, action))
+
+
+def test_get_url_action():
+    assert get_url_action("https://example.amocrm.ru/api/v4/leads/123/notes?page=2") == "leads/{id}/notes"
+    assert get_url_action("https://example.amocrm.ru/api/v4/leads/custom_fields") == "leads/custom_fields"
+    assert get_url_action("https://example.amocrm.ru/oauth2/access_token") == "oauth2/access_token"
+
+
+def test_metrics_of_requests(create_settings, set_faults):
+    metrics, hook = MetricsCollector(), RecordHook()
+    set_faults([{"method": "GET", "code": 503}])
+
+    with AmoCRM(create_settings(retry_policy=RetryPolicy(backoff_factor=0.01, jitter=0.0)), metrics=metrics, hooks=[hook]) as amocrm:
+        responce = amocrm.get_data(AmoCRM.ACTION.LEADS, filters="limit=250", get_all_data=True)
+    assert responce.status and len(responce.data) == 600
+
+    # Hook: each attempt, 503 is retried
+    assert [(event.action, event.attempt) for event in hook.before] == [("leads", 1), ("leads", 2), ("leads", 1), ("leads", 1)]
+    assert [event.status_code for event in hook.after] == [503, 200, 200, 200]
+    assert [event.retry_delay for event in hook.after] == [0.01, None, None, None]
+    assert hook.stages == [("parse", "leads")] * 3
+
+    data = metrics.to_dict()
+    assert list(data["requests"]) == ["leads"] and list(data["requests"]["leads"]) == ["GET"]
+    leads = data["requests"]["leads"]["GET"]
+    assert leads["count"] == 4 and leads["codes"] == {"503": 1, "200": 3}
+    assert leads["bytes_sent"] == 0 and leads["bytes_received"] == sum(event.bytes_received for event in hook.after) > 0
+    assert leads["retries"] == {"count": 1, "wait": 0.01}
+    assert leads["throttles"] == {"count": 0, "wait": 0.0}
+
+    buckets = leads["latency"]["buckets"]
+    assert list(buckets) == [*map(str, LATENCY_BUCKETS), "+Inf"]
+    assert list(buckets.values()) == sorted(buckets.values()) and buckets["+Inf"] == leads["latency"]["count"] == 4
+    assert abs(leads["latency"]["sum"] - sum(event.elapsed for event in hook.after)) < 1e-9
+    assert data["stages"] == {"parse": {"leads": {"count": 3, "seconds": data["stages"]["parse"]["leads"]["seconds"]}}}
+
+    assert 'amocrm_requests_total{action="leads",method="GET",code="503"} 1\n' in metrics.to_prometheus()
+    metrics.reset()
+    assert metrics.to_dict() == {"requests": {}, "stages": {}} and metrics.to_prometheus() == ""
+
+
+def test_prometheus_format():
+    metrics = MetricsCollector()
+    url = "https://example.amocrm.ru/api/v4/leads?page=1"
+    metrics.before_request(RequestEvent(method="GET", url=url, action="leads", attempt=1, throttle_wait=0.25, bytes_sent=0))
+    metrics.after_request(ResponceEvent(method="GET", url=url, action="leads", attempt=1, status_code=429, error=None, elapsed=0.02,
+                                        bytes_sent=0, bytes_received=10, retry_delay=1.5))
+    metrics.before_request(RequestEvent(method="GET", url=url, action="leads", attempt=2, throttle_wait=0.0, bytes_sent=0))
+    metrics.after_request(ResponceEvent(method="GET", url=url, action="leads", attempt=2, status_code=None, error="Timeout", elapsed=30.0,
+                                        bytes_sent=0, bytes_received=0, retry_delay=None))
+    metrics.on_timing("parse", "leads", 0.5)
+
+    assert metrics.to_prometheus(prefix="crm") == """\
+# HELP crm_requests_total Count of requests (attempts) by status code.
+# TYPE crm_requests_total counter
+crm_requests_total{action="leads",method="GET",code="429"} 1
+crm_requests_total{action="leads",method="GET",code="error"} 1
+# HELP crm_request_duration_seconds Latency of requests, seconds.
+# TYPE crm_request_duration_seconds histogram
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="0.005"} 0
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="0.01"} 0
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="0.025"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="0.05"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="0.1"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="0.25"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="0.5"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="1.0"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="2.5"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="5.0"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="10.0"} 1
+crm_request_duration_seconds_bucket{action="leads",method="GET",le="+Inf"} 2
+crm_request_duration_seconds_sum{action="leads",method="GET"} 30.02
+crm_request_duration_seconds_count{action="leads",method="GET"} 2
+# HELP crm_request_bytes_sent_total Size of bodies of requests, bytes.
+# TYPE crm_request_bytes_sent_total counter
+crm_request_bytes_sent_total{action="leads",method="GET"} 0
+# HELP crm_request_bytes_received_total Size of bodies of responces, bytes.
+# TYPE crm_request_bytes_received_total counter
+crm_request_bytes_received_total{action="leads",method="GET"} 10
+# HELP crm_retries_total Count of retried requests.
+# TYPE crm_retries_total counter
+crm_retries_total{action="leads",method="GET"} 1
+# HELP crm_retry_wait_seconds_total Waiting before retries, seconds.
+# TYPE crm_retry_wait_seconds_total counter
+crm_retry_wait_seconds_total{action="leads",method="GET"} 1.5
+# HELP crm_throttles_total Count of waitings on rate limiter.
+# TYPE crm_throttles_total counter
+crm_throttles_total{action="leads",method="GET"} 1
+# HELP crm_throttle_wait_seconds_total Waiting on rate limiter, seconds.
+# TYPE crm_throttle_wait_seconds_total counter
+crm_throttle_wait_seconds_total{action="leads",method="GET"} 0.25
+# HELP crm_stage_seconds_total Time of stages of processing of data, seconds.
+# TYPE crm_stage_seconds_total counter
+crm_stage_seconds_total{stage="parse",action="leads"} 0.5
+# HELP crm_stage_calls_total Count of stages of processing of data.
+# TYPE crm_stage_calls_total counter
+crm_stage_calls_total{stage="parse",action="leads"} 1
+"""
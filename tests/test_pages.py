@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import itertools
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_metrics import RequestHook
+from amocrm.v4.models.amoCRM_M import RequestEvent
+
+
+class CountHook(RequestHook):
+    def __init__(self):
+        self.count = 0
+
+    def before_request(self, event: RequestEvent) -> None:
+        self.count += 1
+
+
+def test_parallel_pages_equal_sequential(create_settings):
+    with AmoCRM(create_settings()) as amocrm:
+        sequential = [responce.data for responce in amocrm.iter_get_responces(AmoCRM.ACTION.LEADS, filters="limit=50")]
+        parallel = [responce.data for responce in amocrm.iter_get_responces_parallel(AmoCRM.ACTION.LEADS, filters="limit=50", max_workers=3)]
+
+    assert [page.page for page in parallel] == list(range(1, 13))
+    assert parallel == sequential
+
+
+def test_parallel_pages_are_requested_in_bounded_window(create_settings):
+    hook = CountHook()
+    with AmoCRM(create_settings(), hooks=[hook]) as amocrm:
+        responces = amocrm.iter_get_responces_parallel(AmoCRM.ACTION.LEADS, filters="limit=10", max_workers=2)
+        received = list(itertools.islice(responces, 5))
+        # First page, probing of last page (60 pages: 2, 3, 5, 9, 17, 33, 65 and binary search) and window of 2 * max_workers pages
+        assert all(responce.status for responce in received)
+        assert hook.count <= 1 + 12 + 5 + 2 * 2
+        responces.close()
+
+        assert len(list(amocrm.iter_get_responces_parallel(AmoCRM.ACTION.LEADS, filters="limit=10", max_workers=2))) == 60
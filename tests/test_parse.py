@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_parse import construct_model
+from amocrm.v4.models.amoCRM_M import CustomField
+
+
+def test_construct_model_converts_values_of_custom_fields():
+    data = {"field_id": 1, "field_name": "Paid", "field_code": None, "field_type": "checkbox", "values": [{"value": True}, {"value": 5}]}
+
+    assert construct_model(CustomField, data) == CustomField.parse_obj(data)
+    assert [value.value for value in construct_model(CustomField, data).values] == ['True', '5']
+
+
+@pytest.mark.parametrize("action", [AmoCRM.ACTION.LEADS, AmoCRM.ACTION.CONTACTS])
+def test_frames_without_validation_equal_validated(create_settings, action):
+    from pandas.testing import assert_frame_equal
+
+    with AmoCRM(create_settings()) as amocrm:
+        validated = amocrm.get_data_df(action, filters="limit=250", get_all_data=True, wide_custom_fields=True, validate=True)
+        constructed = amocrm.get_data_df(action, filters="limit=250", get_all_data=True, wide_custom_fields=True, validate=False)
+
+    assert validated.status and constructed.status and len(validated.data) == 600
+    assert_frame_equal(constructed.data, validated.data)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import asyncio
+
+from requests import Response
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_async import AsyncAmoCRM
+from amocrm.v4.models.amoCRM_M import AmoRequestPatchLeads, AmoRequestPostLeads, AmoResponcePostComplex, AmoResponcePostError, LeadsComplexPost
+
+
+def create_complex_leads(count: int) -> list[AmoRequestPostLeads]:
+    return [AmoRequestPostLeads(name=f"Lead {number}", price=number) for number in range(count)]
+
+
+def test_post_complex_links_items_by_request_id(create_settings):
+    with AmoCRM(create_settings()) as amocrm:
+        responce = amocrm.post(AmoCRM.ACTION.LEADS_COMPLEX, create_complex_leads(120), max_count=50, max_workers=3)
+
+    assert responce.status and responce.errors == [] and responce.detail == 'Success'
+    assert [len(batch_result.__root__) for batch_result in responce.data] == [50, 50, 20]
+    assert all(isinstance(batch_result, AmoResponcePostComplex) for batch_result in responce.data)
+    item = responce.data[1].__root__[0]
+    assert isinstance(item, LeadsComplexPost) and item.request_id == ["50"]
+
+
+def test_async_post_complex(create_settings):
+    async def main():
+        async with AsyncAmoCRM(create_settings()) as amocrm:
+            return await amocrm.post(AsyncAmoCRM.ACTION.LEADS_COMPLEX, create_complex_leads(60), max_count=50, max_workers=2)
+
+    responce = asyncio.run(main())
+    assert responce.status and responce.errors == []
+    assert sum(len(batch_result.__root__) for batch_result in responce.data) == 60
+
+
+def test_complex_batch_result_marks_missing_request_ids(create_settings):
+    responce = Response()
+    responce.status_code = 200
+    responce._content = json.dumps([{"id": 1, "contact_id": 2, "company_id": None, "request_id": ["0"], "merged": False}]).encode()
+
+    with AmoCRM(create_settings()) as amocrm:
+        send_data = [{"name": "Lead 0", "request_id": "0"}, {"name": "Lead 1", "request_id": "1"}]
+        result = amocrm._create_batch_result(0, send_data, responce, AmoResponcePostComplex, AmoResponcePostError)
+
+    assert result.is_success and result.failed_request_ids == ["1"]
+    assert result.request_items["0"].id == 1
+
+
+def test_patch_chunks_are_merged_in_order_of_data(create_settings, set_faults):
+    # First chunk is answered last, third chunk is rejected
+    set_faults([{"method": "PATCH", "id": 1, "delay": 0.3}, {"method": "PATCH", "id": 7, "code": 400}])
+    data = [AmoRequestPatchLeads(id=id, name=f"Lead {id}") for id in range(1, 11)]
+
+    with AmoCRM(create_settings()) as amocrm:
+        responce = amocrm.patch(AmoCRM.ACTION.LEADS, data, max_count=3, max_workers=4)
+
+    assert responce.status and responce.detail == "Some part of the data was not sent! Count failed ids -> 3"
+    assert [item.id for item in responce.data.embedded.leads] == [1, 2, 3, 4, 5, 6, 10]
+    assert [(error.index, error.is_success, error.failed_ids) for error in responce.errors] == [(2, False, [7, 8, 9])]
+
+
+def test_patch_is_failed_if_all_chunks_are_rejected(create_settings, set_faults):
+    set_faults([{"method": "PATCH", "code": 400}, {"method": "PATCH", "code": 400}])
+    data = [AmoRequestPatchLeads(id=id, name=f"Lead {id}") for id in range(1, 5)]
+
+    with AmoCRM(create_settings()) as amocrm:
+        responce = amocrm.patch(AmoCRM.ACTION.LEADS, data, max_count=2, max_workers=2)
+
+    assert not responce.status and responce.detail.startswith("Data was not sent!")
+    assert [(error.index, error.failed_ids) for error in responce.errors] == [(0, [1, 2]), (1, [3, 4])]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from collections import defaultdict
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_async import AsyncAmoCRM
+from amocrm.v4.models.amoCRM_M import Leads
+from amocrm.v4.models.amoCRM_record_M import ContactRecord, LeadRecord, RecordFactory
+
+
+def to_record_dict(entity) -> dict:
+    " Dict of record by dict of model: links are flat strings, embedded entities are tags, companies and ids of contacts. "
+    data = entity.dict()
+    links, embedded = data.pop("links"), data.pop("embedded")
+    data["link"] = str(links["self"]["href"])
+    data["tags"] = embedded["tags"] or []
+    data["companies"] = [{"id": company["id"], "link": str(company["links"]["self"]["href"])} for company in embedded["companies"] or []]
+    if isinstance(entity, Leads): data["contact_ids"] = [contact["id"] for contact in embedded["contacts"] or []]
+    return data
+
+
+def get_data(create_settings, action, compact: bool, is_async: bool):
+    if is_async:
+        async def main():
+            async with AsyncAmoCRM(create_settings()) as amocrm: return await amocrm.get_data(action, get_all_data=True, compact=compact)
+        return asyncio.run(main())
+    with AmoCRM(create_settings()) as amocrm: return amocrm.get_data(action, get_all_data=True, compact=compact)
+
+
+@pytest.mark.parametrize("is_async", [False, True])
+@pytest.mark.parametrize("action, record_type", [(AmoCRM.ACTION.LEADS, LeadRecord), (AmoCRM.ACTION.CONTACTS, ContactRecord)])
+def test_records_are_equal_to_models(create_settings, set_faults, action, record_type, is_async):
+    set_faults([])
+    models = get_data(create_settings, action, compact=False, is_async=is_async)
+    records = get_data(create_settings, action, compact=True, is_async=is_async)
+
+    assert models.status and records.status and len(records.data) == 600
+    assert all(type(record) is record_type and not hasattr(record, "__dict__") for record in records.data)
+    assert [record.dict() for record in records.data] == [to_record_dict(model) for model in models.data]
+
+
+def test_contact_ids_of_lead_records(create_settings, set_faults):
+    set_faults([])
+    models = get_data(create_settings, AmoCRM.ACTION.LEADS, compact=False, is_async=False).data
+    records = get_data(create_settings, AmoCRM.ACTION.LEADS, compact=True, is_async=False).data
+
+    assert [record.contact_ids for record in records] == [tuple(contact.id for contact in model.embedded.contacts) for model in models]
+    assert any(len(record.contact_ids) > 1 for record in records) and any(not record.contact_ids for record in records)
+
+
+def test_tags_and_companies_are_shared_between_records(create_settings, set_faults):
+    set_faults([])
+    records = get_data(create_settings, AmoCRM.ACTION.LEADS, compact=True, is_async=False).data
+
+    for field in ("tags", "companies"):
+        objects = defaultdict(set)
+        for item in (item for record in records for item in getattr(record, field)): objects[item].add(id(item))
+        # Equal items are one object, many records have equal items
+        assert objects and all(len(ids) == 1 for ids in objects.values())
+        assert sum(len(getattr(record, field)) for record in records) > len(objects)
+
+    names = {id(field.field_name) for record in records for field in record.custom_fields_values or ()}
+    assert len(names) == len({field.field_name for record in records for field in record.custom_fields_values or ()})
+
+
+def test_factory_creates_new_objects_for_new_factory(create_settings, set_faults):
+    set_faults([])
+    with AmoCRM(create_settings()) as amocrm: models = amocrm.get_data(AmoCRM.ACTION.LEADS).data
+    lead = next(model for model in models if model.embedded.tags)
+
+    first, second = RecordFactory().create(lead), RecordFactory().create(lead)
+    assert first == second and hash(first) == hash(second)
+    assert first.tags[0] is not second.tags[0]
+    with pytest.raises(TypeError):
+        RecordFactory().create(lead.embedded)
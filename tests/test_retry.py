@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_metrics import RequestHook
+from amocrm.v4.amoCRM_retry import get_retry_delay, is_retry_allowed, parse_retry_after
+from amocrm.v4.models.amoCRM_M import AmoRequestPostLeads, ResponceEvent, RetryPolicy
+
+
+# Backoff without jitter: 0.01, 0.02, 0.04, ...
+FAST_POLICY = RetryPolicy(backoff_factor=0.01, jitter=0.0)
+
+
+class AttemptsHook(RequestHook):
+    def __init__(self):
+        self.events: list[ResponceEvent] = []
+
+    def after_request(self, event: ResponceEvent) -> None:
+        self.events.append(event)
+
+
+def get_methods(server) -> list[str]:
+    return [request["method"] for request in server.get_requests()]
+
+
+def test_get_is_retried_on_429_5xx_and_dropped_connection(create_settings, server, set_faults):
+    hook = AttemptsHook()
+    set_faults([{"method": "GET", "code": 429, "headers": {"Retry-After": "0.05"}}, {"method": "GET", "code": 503},
+                {"method": "GET", "drop": True}])
+
+    with AmoCRM(create_settings(retry_policy=FAST_POLICY), hooks=[hook]) as amocrm:
+        responce = amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10")
+
+    assert responce.status and len(responce.data.embedded.leads) == 10
+    assert get_methods(server) == ["GET"] * 4
+    assert [event.status_code for event in hook.events] == [429, 503, None, 200]
+    # Delay of 429 is Retry-After, other delays are exponential backoff
+    assert [event.retry_delay for event in hook.events] == [0.05, 0.02, 0.04, None]
+
+
+def test_get_is_not_retried_after_max_attempts(create_settings, server, set_faults):
+    set_faults([{"method": "GET", "code": 500}] * 5)
+
+    with AmoCRM(create_settings(retry_policy=FAST_POLICY.copy(update={"max_attempts": 3}))) as amocrm:
+        responce = amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10")
+
+    assert not responce.status
+    assert get_methods(server) == ["GET"] * 3
+
+
+def test_post_is_retried_only_on_429(create_settings, server, set_faults):
+    with AmoCRM(create_settings(retry_policy=FAST_POLICY)) as amocrm:
+        set_faults([{"method": "POST", "code": 429, "headers": {"Retry-After": "0"}}])
+        assert amocrm.post(AmoCRM.ACTION.LEADS, [AmoRequestPostLeads(name="Lead")]).status
+        assert get_methods(server) == ["POST"] * 2
+
+        set_faults([{"method": "POST", "code": 500}])
+        responce = amocrm.post(AmoCRM.ACTION.LEADS, [AmoRequestPostLeads(name="Lead")])
+        assert not responce.status and not responce.errors[0].is_success
+        assert get_methods(server) == ["POST"]
+
+
+def test_failed_post_is_not_replayed(create_settings, server, set_faults):
+    hook = AttemptsHook()
+    set_faults([{"method": "POST", "drop": True}])
+
+    with AmoCRM(create_settings(retry_policy=FAST_POLICY), hooks=[hook]) as amocrm:
+        responce = amocrm.post(AmoCRM.ACTION.LEADS, [AmoRequestPostLeads(name="Lead")])
+
+    # Server received request and closed connection: request could be processed, so it is not sent again
+    assert not responce.status and "Error of connection" in responce.errors[0].detail
+    assert get_methods(server) == ["POST"]
+    assert len(hook.events) == 1 and hook.events[0].error is not None and hook.events[0].retry_delay is None
+
+
+def test_is_retry_allowed():
+    policy = RetryPolicy(max_attempts=3)
+
+    assert is_retry_allowed(policy, "GET", 1, status_code=503)
+    assert is_retry_allowed(policy, "GET", 1)
+    assert not is_retry_allowed(policy, "GET", 1, status_code=400)
+    assert not is_retry_allowed(policy, "GET", 3, status_code=503)
+
+    assert is_retry_allowed(policy, "POST", 1, status_code=429)
+    assert not is_retry_allowed(policy, "PATCH", 1, status_code=503)
+    # Error of connection: unsafe request is sent again only if it did not reach server (connect timeout)
+    assert not is_retry_allowed(policy, "POST", 1, is_sent=True)
+    assert is_retry_allowed(policy, "POST", 1, is_sent=False)
+    assert is_retry_allowed(policy.copy(update={"retry_unsafe_methods": True}), "PATCH", 1, status_code=503)
+
+
+def test_get_retry_delay():
+    policy = RetryPolicy(backoff_factor=0.5, backoff_max=3.0, jitter=0.0, retry_after_max=10.0)
+
+    assert [get_retry_delay(policy, attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    assert get_retry_delay(policy, 1, retry_after="4") == 4.0
+    assert get_retry_delay(policy, 1, retry_after="120") == 10.0
+    assert get_retry_delay(policy, 2, retry_after="soon") == 1.0
+    assert get_retry_delay(policy.copy(update={"respect_retry_after": False}), 1, retry_after="4") == 0.5
+
+    delays = [get_retry_delay(policy.copy(update={"jitter": 0.5}), 2) for _ in range(100)]
+    assert all(0.5 <= delay <= 1.0 for delay in delays)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("not a date") is None
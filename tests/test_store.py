@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sqlite3
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.amoCRM_store import SQLiteStore
+
+from tests.test_pages import CountHook
+
+
+def test_fill_with_workers_equals_sequential_fill(create_settings, tmp_path):
+    with AmoCRM(create_settings()) as amocrm:
+        with SQLiteStore(str(tmp_path / "sequential.db")) as sequential, SQLiteStore(str(tmp_path / "parallel.db")) as parallel:
+            assert sequential.fill(amocrm, AmoCRM.ACTION.LEADS, filters="limit=50").data == 600
+            assert parallel.fill(amocrm, AmoCRM.ACTION.LEADS, filters="limit=50", max_workers=3).data == 600
+            assert parallel.read(AmoCRM.ACTION.LEADS) == sequential.read(AmoCRM.ACTION.LEADS)
+
+
+def test_fill_with_workers_saves_pages_before_all_pages_are_requested(create_settings, tmp_path):
+    hook = CountHook()
+    requests_before_upsert = []
+
+    class CheckedStore(SQLiteStore):
+        def upsert(self, entities):
+            requests_before_upsert.append(hook.count)
+            return super().upsert(entities)
+
+    with AmoCRM(create_settings(), hooks=[hook]) as amocrm, CheckedStore(str(tmp_path / "store.db")) as store:
+        assert store.fill(amocrm, AmoCRM.ACTION.LEADS, filters="limit=10", max_workers=2).data == 600
+
+    # 60 pages: first page, probing of last page and window of 2 * max_workers pages
+    assert len(requests_before_upsert) == 60
+    assert requests_before_upsert[1] <= 1 + 12 + 2 * 2 + 1
+
+
+def test_read_many_ids(create_settings, tmp_path):
+    with AmoCRM(create_settings()) as amocrm, SQLiteStore(str(tmp_path / "store.db")) as store:
+        assert store.fill(amocrm, AmoCRM.ACTION.LEADS).data == 600
+
+        # Max count of parameters of query of old SQLite, ids of other entities are not found
+        store._connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        ids = list(range(600, 0, -1)) + list(range(1000, 3000))
+        assert [row['id'] for row in store.read(AmoCRM.ACTION.LEADS, ids=ids)] == list(range(1, 601))
+        assert [row['id'] for row in store.read(AmoCRM.ACTION.LEADS, ids=ids, limit=5, status_id=142)] == \
+            [row['id'] for row in store.read(AmoCRM.ACTION.LEADS, status_id=142)][:5]
+        assert store.read_df(AmoCRM.ACTION.LEADS, ids=ids)['id'].tolist() == list(range(1, 601))
+        assert set(store.read_related_df(AmoCRM.ACTION.LEADS, "custom_fields_values", ids=ids)['entity_id']) == \
+            set(store.read_related_df(AmoCRM.ACTION.LEADS, "custom_fields_values")['entity_id'])
+        assert store.read(AmoCRM.ACTION.LEADS, ids=[]) == []
+
+        # Ids of previous read are not used
+        assert len(store.read(AmoCRM.ACTION.LEADS)) == 600
+        assert [row['id'] for row in store.read(AmoCRM.ACTION.LEADS, ids=[5, 3])] == [3, 5]
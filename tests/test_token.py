@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+
+from amocrm.v4.amoCRM import AmoCRM
+from amocrm.v4.models.amoCRM_M import AmoRequestPostLeads
+
+
+def get_requests(server) -> list[tuple[str, str]]:
+    return [(request["method"], request["path"].split("?")[0]) for request in server.get_requests()]
+
+
+def test_token_is_refreshed_before_expiry(create_settings, server, set_faults):
+    set_faults([])
+    # Token expires in 1 minute, it is in leeway of refresh (5 minutes)
+    with AmoCRM(create_settings(token_expires_at=int(time.time()) + 60)) as amocrm:
+        assert amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10").status
+        new_access_token = amocrm.access_token
+        assert amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10").status
+
+    requests = server.get_requests()
+    assert get_requests(server) == [("POST", "/oauth2/access_token"), ("GET", "/api/v4/leads"), ("GET", "/api/v4/leads")]
+    assert new_access_token != "access"
+    assert [request["authorization"] for request in requests[1:]] == [f"Bearer {new_access_token}"] * 2
+
+
+def test_request_is_sent_again_once_after_401(create_settings, server, set_faults):
+    set_faults([{"method": "POST", "path": "/api/v4/leads", "code": 401}])
+
+    with AmoCRM(create_settings()) as amocrm:
+        responce = amocrm.post(AmoCRM.ACTION.LEADS, [AmoRequestPostLeads(name="Lead")])
+        new_access_token = amocrm.access_token
+
+    requests = server.get_requests()
+    assert responce.status
+    # One refresh and one replay of write
+    assert get_requests(server) == [("POST", "/api/v4/leads"), ("POST", "/oauth2/access_token"), ("POST", "/api/v4/leads")]
+    assert requests[0]["authorization"] == "Bearer access" and requests[2]["authorization"] == f"Bearer {new_access_token}"
+
+
+def test_second_401_is_not_retried(create_settings, server, set_faults):
+    set_faults([{"method": "GET", "code": 401}] * 5)
+
+    with AmoCRM(create_settings()) as amocrm:
+        responce = amocrm.get(AmoCRM.ACTION.LEADS, filters="limit=10")
+
+    assert not responce.status
+    assert get_requests(server) == [("GET", "/api/v4/leads"), ("POST", "/oauth2/access_token"), ("GET", "/api/v4/leads")]
+